@@ -2,12 +2,36 @@
 Backend module: Storage, CRUD, Search, and Sort operations.
 """
 
-from .storage import init_files, load_csv, save_csv, create_backups
-from .validators import validate_student, validate_program, validate_college
+from .storage import (
+    init_files, load_csv, save_csv, save_tables, append_csv, log_change, compact_journals,
+    set_engine, get_engine, FastDictReader, read_csv_parallel,
+)
+from .backups import create_backups, create_backups_async, list_backups, restore_backup
+from .validators import (
+    validate_student, validate_program, validate_college,
+    validate_students_batch, validate_programs_batch, validate_colleges_batch,
+)
 from .auth import hash_password, verify_password
+from .joins import program_lookup, invalidate_program_lookup
+from .aggregates import enrollment_stats
+from .relations import relations
+from .columnar import StudentColumns, student_columns
+from .importer import ImportJob
+from .lazycsv import LazyRows
+from .cascade import delete_program_cascade, delete_college_cascade
+from .events import ChangeEvent, EventBus
+from .records import StudentRecord, compact_students
+from .datastore import DataStore
 
 __all__ = [
-    "init_files", "load_csv", "save_csv", "create_backups",
+    "init_files", "load_csv", "save_csv", "save_tables", "append_csv", "log_change", "compact_journals",
+    "set_engine", "get_engine", "FastDictReader", "read_csv_parallel",
+    "create_backups", "create_backups_async", "list_backups", "restore_backup",
     "validate_student", "validate_program", "validate_college",
+    "validate_students_batch", "validate_programs_batch", "validate_colleges_batch",
     "hash_password", "verify_password",
+    "program_lookup", "invalidate_program_lookup", "enrollment_stats", "relations",
+    "StudentColumns", "student_columns",
+    "ImportJob", "LazyRows", "delete_program_cascade", "delete_college_cascade",
+    "ChangeEvent", "EventBus", "StudentRecord", "compact_students", "DataStore",
 ]
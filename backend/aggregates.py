@@ -0,0 +1,155 @@
+"""
+Maintained enrollment aggregates.
+
+:class:`EnrollmentStats` counts students per program, students per college,
+programs per college and students by year and gender. It is built in one pass
+over the data and then kept current with O(1) hooks on every create, update
+and delete, so tables, info popups and sidebars read counts instantly.
+"""
+
+from collections import Counter
+from config import COLUMNAR_MIN_ROWS
+from .lazycsv import LazyRows
+
+
+def _inc(counter, key, n=1):
+    counter[key] += n
+    if counter[key] <= 0:
+        del counter[key]
+
+
+class EnrollmentStats:
+    """Enrollment counters over a students list and a programs list.
+
+    Update hooks take the record before and/or after the change; callers that
+    edit a dict in place should pass a copy taken before the edit.
+    """
+
+    def __init__(self, students, programs):
+        self.students = students
+        self.programs = programs
+        self.rebuild()
+
+    def rebuild(self):
+        """Recount everything in a single pass over programs and students."""
+        self.students_per_program = Counter()
+        self.students_per_college = Counter()
+        self.programs_per_college = Counter()
+        self.by_year = Counter()
+        self.by_gender = Counter()
+        self._college_of = {}  # program code -> college code
+        for p in self.programs:
+            code = p.get('code', '')
+            if code in self._college_of:
+                continue
+            college = p.get('college', '')
+            self._college_of[code] = college
+            self.programs_per_college[college] += 1
+        if isinstance(self.students, LazyRows):
+            # one pass over the file that leaves the pending rows undecoded
+            groups = Counter(self.students.scan(('program', 'year', 'gender')))
+            for (program, year, gender), n in groups.items():
+                self._count_student({'program': program, 'year': year, 'gender': gender}, n)
+            return
+        columns = None
+        if len(self.students) >= COLUMNAR_MIN_ROWS:
+            from .columnar import student_columns
+            columns = student_columns(self.students, self.programs)
+        if columns is not None:
+            # vectorized group-bys over the encoded columns
+            self.students_per_program.update(columns.count_by('program'))
+            self.students_per_college.update(columns.count_by('college'))
+            self.by_year.update(columns.count_by('year'))
+            self.by_gender.update(columns.count_by('gender'))
+            return
+        for s in self.students:
+            self._count_student(s, 1)
+
+    def _count_student(self, s, n):
+        program = s.get('program', 'Unknown')
+        _inc(self.students_per_program, program, n)
+        college = self._college_of.get(program)
+        if college is not None:
+            _inc(self.students_per_college, college, n)
+        _inc(self.by_year, s.get('year', ''), n)
+        _inc(self.by_gender, s.get('gender', ''), n)
+
+    # --- queries ---
+    def students_in_program(self, code):
+        """Number of students enrolled in program `code`."""
+        return self.students_per_program.get(code, 0)
+
+    def students_in_college(self, code):
+        """Number of students enrolled in any program of college `code`."""
+        return self.students_per_college.get(code, 0)
+
+    def programs_in_college(self, code):
+        """Number of programs belonging to college `code`."""
+        return self.programs_per_college.get(code, 0)
+
+    def top_programs(self, n=3):
+        """Return the `n` (program, count) pairs with the most students."""
+        return self.students_per_program.most_common(n)
+
+    # --- student hooks ---
+    def student_added(self, student):
+        self._count_student(student, 1)
+
+    def student_removed(self, student):
+        self._count_student(student, -1)
+
+    def student_changed(self, before, after):
+        self._count_student(before, -1)
+        self._count_student(after, 1)
+
+    # --- program hooks ---
+    def program_added(self, program):
+        code = program.get('code', '')
+        if code in self._college_of:
+            return
+        college = program.get('college', '')
+        self._college_of[code] = college
+        _inc(self.programs_per_college, college)
+        _inc(self.students_per_college, college, self.students_in_program(code))
+
+    def program_removed(self, program):
+        code = program.get('code', '')
+        college = self._college_of.pop(code, None)
+        if college is None:
+            return
+        _inc(self.programs_per_college, college, -1)
+        _inc(self.students_per_college, college, -self.students_in_program(code))
+
+    def program_changed(self, before, after):
+        self.program_removed(before)
+        self.program_added(after)
+
+
+# the stats built for the current students/programs lists
+_stats = None
+
+
+def enrollment_stats(students, programs):
+    """Return the shared stats for these lists, building them on first use.
+
+    Replacing either list (e.g. a reload from disk) triggers a rebuild.
+    """
+    global _stats
+    if _stats is None or _stats.students is not students or _stats.programs is not programs:
+        _stats = EnrollmentStats(students, programs)
+    return _stats
+
+
+def tracked_stats(students=None, programs=None):
+    """Return the shared stats if they were built for the given list(s), else None.
+
+    Used by mutation paths that only hold one of the lists (e.g. the CRUD
+    classes) to apply their O(1) hook when the stats are live.
+    """
+    if _stats is None:
+        return None
+    if students is not None and _stats.students is not students:
+        return None
+    if programs is not None and _stats.programs is not programs:
+        return None
+    return _stats
@@ -0,0 +1,338 @@
+"""
+Incremental, compressed snapshots of the data tables.
+
+A snapshot is a small JSON manifest under ``BACKUP_DIR/snapshots`` naming,
+for every table in ``config.FILES``, the SHA-256 of its csv content. The
+content itself is stored once per hash as a gzip object under
+``BACKUP_DIR/objects``, so a snapshot only costs the tables that changed
+since the last one; unchanged tables are recognised from their file size and
+modification time without even being read.
+
+Only the newest ``BACKUP_KEEP`` snapshots are kept, and objects no snapshot
+refers to any more are deleted. :func:`pin_tables` captures the tables without
+reading them, so a snapshot of the state before a change can be written in
+the background while the change goes ahead. :func:`restore_backup` writes a snapshot back
+as one group commit (see :func:`backend.storage.save_tables`).
+"""
+
+import csv
+import gzip
+import hashlib
+import io
+import json
+import locale
+import os
+import shutil
+import tempfile
+import threading
+from datetime import datetime
+from config import FILES, FIELDS, BACKUP_DIR, BACKUP_KEEP
+from . import storage
+
+
+# one snapshot at a time, whichever thread asks
+_backup_lock = threading.Lock()
+
+_READ_SIZE = 1 << 20
+
+
+def _objects_dir():
+    return os.path.join(BACKUP_DIR, 'objects')
+
+
+def _snapshots_dir():
+    return os.path.join(BACKUP_DIR, 'snapshots')
+
+
+def _pinned_dir():
+    return os.path.join(BACKUP_DIR, 'pinned')
+
+
+def _object_path(digest):
+    return os.path.join(_objects_dir(), digest + '.csv.gz')
+
+
+def _encoding():
+    """The encoding the csv files are written in (see :mod:`backend.storage`)."""
+    return locale.getpreferredencoding(False)
+
+
+def _table_bytes(key, rows=None):
+    """The effective csv content of a table, when it isn't just the file on disk."""
+    buf = io.StringIO(newline='')
+    writer = csv.DictWriter(buf, fieldnames=FIELDS[key], extrasaction='ignore')
+    writer.writeheader()
+    writer.writerows(storage.load_csv(key) if rows is None else rows)
+    return buf.getvalue().encode(_encoding())
+
+
+def _fingerprint(st):
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _store_object(digest, data):
+    """Compress `data` into the object for `digest` unless it already exists."""
+    path = _object_path(digest)
+    if os.path.exists(path):
+        return
+    temp = path + '.tmp'
+    with gzip.open(temp, 'wb') as f:
+        f.write(data)
+    os.replace(temp, path)
+
+
+def _store_file(path, size=None):
+    """Hash and compress the file at `path` in one read; return (digest, stat).
+
+    Reading once keeps the digest and the object consistent even if the
+    table is atomically replaced meanwhile (the open file stays the old one).
+    `size` limits the read to the file's first `size` bytes.
+    """
+    temp = os.path.join(_objects_dir(), 'incoming.tmp')
+    h = hashlib.sha256()
+    with open(path, 'rb') as src:
+        st = os.fstat(src.fileno())
+        left = st.st_size if size is None else size
+        with gzip.open(temp, 'wb') as dst:
+            while left > 0:
+                chunk = src.read(min(_READ_SIZE, left))
+                if not chunk:
+                    break
+                left -= len(chunk)
+                h.update(chunk)
+                dst.write(chunk)
+    digest = h.hexdigest()
+    if os.path.exists(_object_path(digest)):
+        os.remove(temp)
+    else:
+        os.replace(temp, _object_path(digest))
+    return digest, st
+
+
+def _store_bytes(data):
+    digest = hashlib.sha256(data).hexdigest()
+    _store_object(digest, data)
+    return {'hash': digest, 'size': len(data)}
+
+
+def _snapshot_table(key, previous):
+    """Return the manifest entry for table `key`, storing its content if new.
+
+    `previous` is the table's entry in the last snapshot, if any.
+    """
+    path = FILES[key]
+    if storage.get_engine() is not None or os.path.exists(storage.journal_path(key)):
+        # the file alone is stale: hash what load_csv would return instead
+        return _store_bytes(_table_bytes(key))
+    if not os.path.exists(path):
+        return None
+    if (previous and previous.get('stat') == _fingerprint(os.stat(path))
+            and os.path.exists(_object_path(previous['hash']))):
+        return previous
+    digest, st = _store_file(path)
+    return {'hash': digest, 'size': st.st_size, 'stat': _fingerprint(st)}
+
+
+def _snapshot_pinned(key, pin, previous):
+    """Like :func:`_snapshot_table`, for a table captured by :func:`pin_tables`."""
+    if 'data' in pin:
+        return _store_bytes(pin['data'])
+    if pin['journal'] is not None:
+        with open(pin['csv'], 'rb') as f:
+            head = f.read(pin['size'])
+        text = io.TextIOWrapper(io.BytesIO(head), encoding=_encoding(), newline='')
+        rows = storage.FastDictReader(text).read_all()
+        return _store_bytes(_table_bytes(key, storage._replay_journal(key, rows, pin['journal'])))
+    if (previous and previous.get('stat') == pin['stat']
+            and os.path.exists(_object_path(previous['hash']))):
+        return previous
+    digest, _ = _store_file(pin['csv'], pin['size'])
+    return {'hash': digest, 'size': pin['size'], 'stat': pin['stat']}
+
+
+def pin_tables():
+    """Capture every table as it is now, for a later :func:`create_backups`.
+
+    Nothing is read: each csv file is hard-linked under ``BACKUP_DIR/pinned``
+    (copied where links aren't supported) together with its current size,
+    since a table is only ever replaced by a rename or grown by appends. The
+    small journals are copied. With a storage engine the content itself is
+    captured. Pass the result as `pins`; the pinned files are removed once
+    the snapshot is written.
+    """
+    if storage.get_engine() is not None:
+        return {'folder': None, 'tables': {key: {'data': _table_bytes(key)} for key in FILES}}
+    os.makedirs(_pinned_dir(), exist_ok=True)
+    folder = tempfile.mkdtemp(dir=_pinned_dir())
+    tables = {}
+    # no compaction or append may land between the link and the size
+    with storage._journal_lock:
+        for key in FILES:
+            path = FILES[key]
+            if not os.path.exists(path):
+                continue
+            link = os.path.join(folder, key + '.csv')
+            try:
+                os.link(path, link)
+            except OSError:
+                shutil.copyfile(path, link)
+            journal = None
+            if os.path.exists(storage.journal_path(key)):
+                journal = os.path.join(folder, key + '.journal')
+                shutil.copyfile(storage.journal_path(key), journal)
+            st = os.stat(path)
+            tables[key] = {'csv': link, 'size': st.st_size, 'stat': _fingerprint(st), 'journal': journal}
+    return {'folder': folder, 'tables': tables}
+
+
+def release_pins(pins):
+    """Remove the files pinned by :func:`pin_tables`."""
+    if pins and pins['folder']:
+        shutil.rmtree(pins['folder'], ignore_errors=True)
+
+
+def _load_manifest(snapshot_id):
+    with open(os.path.join(_snapshots_dir(), snapshot_id + '.json'), 'r') as f:
+        return json.load(f)
+
+
+def _snapshot_ids():
+    """Snapshot ids, oldest first (ids sort by creation time)."""
+    try:
+        names = os.listdir(_snapshots_dir())
+    except FileNotFoundError:
+        return []
+    return sorted(n[:-5] for n in names if n.endswith('.json'))
+
+
+def create_backups(reason='manual', pins=None):
+    """Snapshot every table and return the snapshot id.
+
+    When nothing changed since the newest snapshot no new one is written and
+    that snapshot's id is returned. `pins` from :func:`pin_tables` snapshots
+    the tables as they were when pinned instead of as they are now.
+    """
+    with _backup_lock:
+        os.makedirs(_objects_dir(), exist_ok=True)
+        os.makedirs(_snapshots_dir(), exist_ok=True)
+        ids = _snapshot_ids()
+        last = _load_manifest(ids[-1]) if ids else None
+        last_tables = last['tables'] if last else {}
+
+        tables = {}
+        for key in FILES:
+            if pins is None:
+                entry = _snapshot_table(key, last_tables.get(key))
+            elif key in pins['tables']:
+                entry = _snapshot_pinned(key, pins['tables'][key], last_tables.get(key))
+            else:
+                entry = None
+            if entry is not None:
+                tables[key] = entry
+
+        strip = lambda t: {k: e['hash'] for k, e in t.items()}
+        if last is not None and strip(tables) == strip(last_tables):
+            if tables != last_tables:
+                # same content, newer file times: remember them for next time
+                last['tables'] = tables
+                _write_manifest(ids[-1], last)
+            return ids[-1]
+
+        now = datetime.now()
+        snapshot_id = now.strftime('%Y%m%d-%H%M%S-%f')
+        _write_manifest(snapshot_id, {
+            'id': snapshot_id,
+            'created': now.isoformat(timespec='seconds'),
+            'reason': reason,
+            'encoding': _encoding(),
+            'tables': tables,
+        })
+        _rotate()
+        return snapshot_id
+
+
+def _write_manifest(snapshot_id, manifest):
+    path = os.path.join(_snapshots_dir(), snapshot_id + '.json')
+    temp = path + '.tmp'
+    with open(temp, 'w') as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(temp, path)
+
+
+def _rotate():
+    """Drop snapshots beyond BACKUP_KEEP and objects nothing refers to."""
+    ids = _snapshot_ids()
+    for snapshot_id in ids[:-BACKUP_KEEP] if BACKUP_KEEP > 0 else []:
+        try:
+            os.remove(os.path.join(_snapshots_dir(), snapshot_id + '.json'))
+        except FileNotFoundError:
+            pass
+    live = set()
+    for snapshot_id in _snapshot_ids():
+        try:
+            live.update(e['hash'] for e in _load_manifest(snapshot_id)['tables'].values())
+        except (OSError, ValueError, KeyError):
+            continue
+    for name in os.listdir(_objects_dir()):
+        digest = name.split('.', 1)[0]
+        if name.endswith('.csv.gz') and digest not in live:
+            try:
+                os.remove(os.path.join(_objects_dir(), name))
+            except FileNotFoundError:
+                pass
+
+
+def create_backups_async(reason='scheduled', pins=None):
+    """Run :func:`create_backups` on a background thread and return the thread.
+
+    The thread's ``result`` attribute holds the snapshot id when it finishes
+    (``error`` holds the exception text if it failed). The thread releases
+    `pins` when done.
+    """
+    def _run():
+        try:
+            t.result = create_backups(reason, pins)
+        except Exception as e:
+            t.error = str(e)
+        finally:
+            release_pins(pins)
+
+    # non-daemon, so exiting waits for a snapshot in progress
+    t = threading.Thread(target=_run, name="backup")
+    t.result = t.error = None
+    t.start()
+    return t
+
+
+def list_backups():
+    """Return the snapshot manifests, newest first."""
+    result = []
+    for snapshot_id in reversed(_snapshot_ids()):
+        try:
+            manifest = _load_manifest(snapshot_id)
+        except (OSError, ValueError):
+            continue
+        manifest['size'] = sum(e.get('size', 0) for e in manifest['tables'].values())
+        result.append(manifest)
+    return result
+
+
+def restore_backup(snapshot_id, keys=None):
+    """Write snapshot `snapshot_id` back over the tables `keys` (default: all).
+
+    The current state is pinned first and snapshotted on the backup thread,
+    so a restore can be undone. Returns the restored data as ``{key: rows}``;
+    callers reload their lists.
+    """
+    manifest = _load_manifest(snapshot_id)
+    entries = {k: e for k, e in manifest['tables'].items()
+               if k in FILES and (keys is None or k in keys)}
+    # objects hold the csv bytes in the encoding they were written in
+    encoding = manifest.get('encoding') or _encoding()
+    tables = {}
+    for key, entry in entries.items():
+        with gzip.open(_object_path(entry['hash']), 'rt', encoding=encoding, newline='') as f:
+            tables[key] = storage.FastDictReader(f).read_all()
+    create_backups_async(reason=f"before restoring {snapshot_id}", pins=pin_tables())
+    storage.save_tables(tables)
+    return tables
@@ -0,0 +1,84 @@
+"""
+Cascading deletes with set-null semantics.
+
+Deleting a program clears the program of its students; deleting a college
+also clears the college of its programs and the program of their students.
+Affected rows are found through the foreign-key reverse indexes of
+:mod:`backend.relations` instead of scans, edited in one batch with the
+stats, relations and search hooks applied, and persisted with a single group
+commit: the small program and college tables are rewritten, while the
+edited students go to the students journal as one batch, so the write costs
+only the affected students rather than the whole table.
+"""
+
+from .storage import save_tables
+from .joins import invalidate_program_lookup
+from .aggregates import tracked_stats
+from .relations import relations
+from .search import reindex_student, invalidate_search_caches
+
+
+def _set_null(records, field, hooks):
+    """Clear `field` on every record in `records`, reporting each change to `hooks`."""
+    for r in records:
+        before = dict(r)
+        r[field] = ''
+        for hook in hooks:
+            hook(before, r)
+
+
+def _updates(records):
+    """Journal records for `records`, each edited in place."""
+    return [('update', r, None) for r in records]
+
+
+def delete_program_cascade(students, programs, program, remove=None):
+    """Delete `program`, clearing the program of its students.
+
+    `remove(program)` takes it out of the list (default ``programs.remove``;
+    the store passes its CRUD's indexed removal). Returns the number of
+    students whose program was cleared.
+    """
+    rel = relations(students, programs)
+    affected = rel.students_in_program(program.get('code', ''))
+    stats = tracked_stats(students, programs)
+
+    _set_null(affected, 'program', [h.student_changed for h in (stats, rel) if h])
+    for s in affected:
+        reindex_student(students, s)
+    (remove or programs.remove)(program)
+    for h in (stats, rel):
+        if h:
+            h.program_removed(program)
+    invalidate_program_lookup()
+    invalidate_search_caches()
+
+    save_tables({'program': programs}, {'student': _updates(affected)})
+    return len(affected)
+
+
+def delete_college_cascade(students, programs, colleges, college, remove=None):
+    """Delete `college`, clearing the college of its programs and the program of their students.
+
+    `remove(college)` takes it out of the list (default ``colleges.remove``).
+    Returns ``(programs_cleared, students_cleared)``.
+    """
+    rel = relations(students, programs)
+    code = college.get('code', '')
+    affected_programs = rel.programs_in_college(code)
+    affected_students = rel.students_in_college(code)
+    stats = tracked_stats(students, programs)
+
+    # students first: the stats move them out of the college through their program
+    _set_null(affected_students, 'program', [h.student_changed for h in (stats, rel) if h])
+    for s in affected_students:
+        reindex_student(students, s)
+    _set_null(affected_programs, 'college', [h.program_changed for h in (stats, rel) if h])
+    (remove or colleges.remove)(college)
+    invalidate_search_caches()
+
+    tables = {'college': colleges}
+    if affected_programs:
+        tables['program'] = programs
+    save_tables(tables, {'student': _updates(affected_students)})
+    return len(affected_programs), len(affected_students)
@@ -0,0 +1,88 @@
+"""
+Columnar view of the students table.
+
+:class:`StudentColumns` dictionary-encodes the program, college, year and
+gender of every student into small integer NumPy arrays, so group-by counts
+run as vectorized operations instead of Python loops over the records.
+
+The columns are built for one pass (e.g. the full recount in
+:class:`~backend.aggregates.EnrollmentStats`) and not kept, so edits never
+have to patch or rebuild them. NumPy is optional and imported lazily:
+without it :func:`student_columns` returns None and callers keep their plain
+loops.
+"""
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _code_dtype(np, n):
+    """Smallest integer dtype holding codes 0..n-1 plus -1 for "none"."""
+    if n < 128:
+        return np.int8
+    if n < 32768:
+        return np.int16
+    return np.int32
+
+
+def _encode(np, values, count):
+    """Dictionary-encode `values`; return (codes array, distinct values in code order)."""
+    table = {}
+    codes = np.fromiter((table.setdefault(v, len(table)) for v in values), dtype=np.int32, count=count)
+    return codes.astype(_code_dtype(np, len(table))), list(table)
+
+
+class StudentColumns:
+    """Encoded columns of a students list, aligned with it row for row.
+
+    Each categorical column is an integer array of codes into
+    ``values[column]``. A student whose program has no program record has
+    college code -1.
+    """
+
+    def __init__(self, students, programs, np):
+        self.students = students
+        self.programs = programs
+        self.np = np
+        self.values = {}
+        n = len(students)
+
+        self.program, self.values['program'] = _encode(np, (s.get('program', '') for s in students), n)
+        self.year, self.values['year'] = _encode(np, (s.get('year', '') for s in students), n)
+        self.gender, self.values['gender'] = _encode(np, (s.get('gender', '') for s in students), n)
+
+        # college through the program, first program record per code wins
+        college_of = {}
+        for p in programs:
+            college_of.setdefault(p.get('code', ''), p.get('college', ''))
+        colleges = {}
+        by_program = np.array(
+            [colleges.setdefault(college_of[code], len(colleges)) if code in college_of else -1
+             for code in self.values['program']],
+            dtype=np.int32,
+        )
+        self.values['college'] = list(colleges)
+        self.college = by_program[self.program].astype(_code_dtype(np, len(colleges)))
+
+    def __len__(self):
+        return len(self.program)
+
+    def count_by(self, column):
+        """``{value: count}`` of categorical `column` ('program', 'college', 'year' or 'gender')."""
+        codes = getattr(self, column)
+        values = self.values[column]
+        counts = self.np.bincount(codes[codes >= 0].astype(self.np.intp), minlength=len(values))
+        return {values[i]: int(c) for i, c in enumerate(counts.tolist()) if c}
+
+
+def student_columns(students, programs):
+    """Return columns for these lists as they are now, or None without NumPy."""
+    np = _numpy()
+    if np is None:
+        return None
+    return StudentColumns(students, programs, np)
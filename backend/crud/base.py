@@ -0,0 +1,132 @@
+"""
+Primary-key index shared by the CRUD classes.
+"""
+
+from bisect import bisect_left, insort
+from collections.abc import MutableMapping
+from ..lazycsv import LazyRows
+
+
+class _SlotIndex(MutableMapping):
+    """The `index` of a CRUD class over a :class:`LazyRows`.
+
+    Maps keys to records like the plain dict index, but holds only the
+    slots: a lookup finds the record's position and decodes just that one
+    record. Writes are no-ops since the CRUD class keeps the slots itself.
+    """
+
+    def __init__(self, crud):
+        self._crud = crud
+
+    def __getitem__(self, key):
+        pos = self._crud.position(key)
+        if pos is None:
+            raise KeyError(key)
+        return self._crud.data[pos]
+
+    def __contains__(self, key):
+        return key in self._crud._slots
+
+    def __iter__(self):
+        return iter(self._crud._slots)
+
+    def __len__(self):
+        return len(self._crud._slots)
+
+    def __setitem__(self, key, record):
+        pass
+
+    def __delitem__(self, key):
+        pass
+
+
+class IndexedCRUD:
+    """Primary-key index over a CRUD class's data list.
+
+    `index` maps each key to its record. Each record also gets a slot number
+    when it is indexed or appended; a delete removes the record from the list
+    in place (keeping the order of the others) and files its slot as a
+    tombstone, so a record's position is its slot minus the tombstones before
+    it, found without scanning the list. The slots are renumbered once the
+    tombstones pile up. The first record wins if the list holds duplicate
+    keys. Subclasses set `KEY` to their primary-key field.
+
+    Over a :class:`LazyRows` the index is built from the key column alone and
+    records are decoded only when they are looked up.
+    """
+
+    KEY = None
+
+    # renumber the slots once this many tombstones (or one per 16 records,
+    # if that is more) have piled up
+    COMPACT_TOMBSTONES = 64
+
+    def rebuild_index(self):
+        """Rebuild the primary-key index from the data list.
+
+        Call this after the data list has been replaced or mutated outside
+        of this class.
+        """
+        key = self.KEY
+        slots = {}
+        if isinstance(self.data, LazyRows):
+            for i, k in enumerate(self.data.keys()):
+                slots.setdefault(k, i)
+            self.index = _SlotIndex(self)
+        else:
+            index = {}
+            for i, r in enumerate(self.data):
+                k = r.get(key, '')
+                if k not in index:
+                    index[k] = r
+                    slots[k] = i
+            self.index = index
+        self._slots = slots
+        self._next_slot = len(self.data)
+        self._tombstones = []
+
+    def position(self, key):
+        """Return the list position of record `key`, or None if there is none."""
+        slot = self._slots.get(key)
+        if slot is None:
+            return None
+        return slot - bisect_left(self._tombstones, slot)
+
+    def _append(self, record):
+        """Append `record` to the list and index it."""
+        k = record.get(self.KEY, '')
+        self.data.append(record)
+        if k not in self.index:
+            self.index[k] = record
+            self._slots[k] = self._next_slot
+        self._next_slot += 1
+
+    def _rekey(self, old, new):
+        """Move the index entry of `old` to `new` after a rename."""
+        self.index[new] = self.index.pop(old)
+        self._slots[new] = self._slots.pop(old)
+
+    def take(self, key):
+        """Remove record `key` from the list and the index and return it.
+
+        The records after it keep their order. Returns None if there is no
+        such record.
+        """
+        record = self.index.get(key)
+        if record is None:
+            return None
+        data = self.data
+        pos = self.position(key)
+        if pos is None or pos >= len(data) or data[pos] is not record:
+            # the list was changed behind the index: find the record by identity
+            pos = next((i for i, r in enumerate(data) if r is record), None)
+            if pos is not None:
+                del data[pos]
+            self.rebuild_index()
+            return record
+        del data[pos]
+        del self.index[key]
+        insort(self._tombstones, self._slots.pop(key))
+        if len(self._tombstones) > max(self.COMPACT_TOMBSTONES, len(data) >> 4):
+            self.rebuild_index()
+        return record
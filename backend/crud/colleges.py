@@ -2,16 +2,25 @@
 CRUD operations for College entity.
 """
 
-from ..storage import save_csv
+from ..storage import log_change
 from ..validators import validate_college
+from ..search import invalidate_search_caches
+from .base import IndexedCRUD
 
 
-class CollegeCRUD:
-    """CRUD operations for College entity."""
+class CollegeCRUD(IndexedCRUD):
+    """CRUD operations for College entity.
+
+    Keeps a primary-key index (``code`` -> record and position) alongside
+    the data list.
+    """
+
+    KEY = 'code'
     
     def __init__(self, colleges_list):
         """Initialize with reference to colleges data list."""
         self.data = colleges_list
+        self.rebuild_index()
     
     def create(self, college):
         """Create a new college."""
@@ -19,16 +28,17 @@ class CollegeCRUD:
         if not ok:
             return False, msg
         
-        if any(c['code'] == college['code'] for c in self.data):
+        if college['code'] in self.index:
             return False, "College code already exists"
         
-        self.data.append(college)
-        save_csv('college', self.data)
+        self._append(college)
+        invalidate_search_caches()
+        log_change('college', 'insert', college)
         return True, "College created"
     
     def read(self, college_code):
         """Read a college by code."""
-        return next((c for c in self.data if c['code'] == college_code), None)
+        return self.index.get(college_code)
     
     def update(self, college_code, updates):
         """Update a college by code."""
@@ -36,21 +46,32 @@ class CollegeCRUD:
         if not college:
             return False, "College not found"
         
+        ok, msg = validate_college({**college, **updates, 'code': college_code})
+        if not ok:
+            return False, msg
+        
         college.update(updates)
         college['code'] = college_code  # preserve code
-        save_csv('college', self.data)
+        invalidate_search_caches()
+        log_change('college', 'update', college)
         return True, "College updated"
     
     def delete(self, college_code):
         """Delete a college by code."""
-        college = self.read(college_code)
-        if not college:
+        college = self.take(college_code)
+        if college is None:
             return False, "College not found"
         
-        self.data.remove(college)
-        save_csv('college', self.data)
+        invalidate_search_caches()
+        log_change('college', 'delete', college)
         return True, "College deleted"
     
+    def attach(self, colleges):
+        """Add records that are already persisted (e.g. by an import) without journaling them."""
+        for college in colleges:
+            self._append(college)
+        invalidate_search_caches()
+    
     def list(self):
         """List all colleges."""
         return self.data.copy()
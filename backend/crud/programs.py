@@ -2,16 +2,28 @@
 CRUD operations for Program entity.
 """
 
-from ..storage import save_csv
+from ..storage import log_change
 from ..validators import validate_program
+from ..joins import invalidate_program_lookup
+from ..aggregates import tracked_stats
+from ..relations import tracked_relations
+from ..search import invalidate_search_caches
+from .base import IndexedCRUD
 
 
-class ProgramCRUD:
-    """CRUD operations for Program entity."""
+class ProgramCRUD(IndexedCRUD):
+    """CRUD operations for Program entity.
+
+    Keeps a primary-key index (``code`` -> record and position) alongside
+    the data list.
+    """
+
+    KEY = 'code'
     
     def __init__(self, programs_list):
         """Initialize with reference to programs data list."""
         self.data = programs_list
+        self.rebuild_index()
     
     def create(self, program):
         """Create a new program."""
@@ -19,16 +31,24 @@ class ProgramCRUD:
         if not ok:
             return False, msg
         
-        if any(p['code'] == program['code'] for p in self.data):
+        if program['code'] in self.index:
             return False, "Program code already exists"
         
-        self.data.append(program)
-        save_csv('program', self.data)
+        self._append(program)
+        invalidate_program_lookup()
+        stats = tracked_stats(programs=self.data)
+        if stats:
+            stats.program_added(program)
+        rel = tracked_relations(programs=self.data)
+        if rel:
+            rel.program_added(program)
+        invalidate_search_caches()
+        log_change('program', 'insert', program)
         return True, "Program created"
     
     def read(self, program_code):
         """Read a program by code."""
-        return next((p for p in self.data if p['code'] == program_code), None)
+        return self.index.get(program_code)
     
     def update(self, program_code, updates):
         """Update a program by code."""
@@ -36,21 +56,53 @@ class ProgramCRUD:
         if not program:
             return False, "Program not found"
         
+        ok, msg = validate_program({**program, **updates, 'code': program_code})
+        if not ok:
+            return False, msg
+        
+        before = dict(program)
         program.update(updates)
         program['code'] = program_code  # preserve code
-        save_csv('program', self.data)
+        stats = tracked_stats(programs=self.data)
+        if stats:
+            stats.program_changed(before, program)
+        rel = tracked_relations(programs=self.data)
+        if rel:
+            rel.program_changed(before, program)
+        invalidate_search_caches()
+        log_change('program', 'update', program)
         return True, "Program updated"
     
     def delete(self, program_code):
         """Delete a program by code."""
-        program = self.read(program_code)
-        if not program:
+        program = self.take(program_code)
+        if program is None:
             return False, "Program not found"
         
-        self.data.remove(program)
-        save_csv('program', self.data)
+        invalidate_program_lookup()
+        stats = tracked_stats(programs=self.data)
+        if stats:
+            stats.program_removed(program)
+        rel = tracked_relations(programs=self.data)
+        if rel:
+            rel.program_removed(program)
+        invalidate_search_caches()
+        log_change('program', 'delete', program)
         return True, "Program deleted"
     
+    def attach(self, programs):
+        """Add records that are already persisted (e.g. by an import) without journaling them."""
+        stats = tracked_stats(programs=self.data)
+        rel = tracked_relations(programs=self.data)
+        for program in programs:
+            self._append(program)
+            if stats:
+                stats.program_added(program)
+            if rel:
+                rel.program_added(program)
+        invalidate_program_lookup()
+        invalidate_search_caches()
+    
     def list(self):
         """List all programs."""
         return self.data.copy()
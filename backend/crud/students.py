@@ -2,16 +2,28 @@
 CRUD operations for Student entity.
 """
 
-from ..storage import save_csv
+from ..storage import log_change
 from ..validators import validate_student
+from ..aggregates import tracked_stats
+from ..relations import tracked_relations
+from ..search import reindex_student, invalidate_search_caches
+from .base import IndexedCRUD
 
 
-class StudentCRUD:
-    """CRUD operations for Student entity."""
+class StudentCRUD(IndexedCRUD):
+    """CRUD operations for Student entity.
+
+    Keeps a primary-key index (``id`` -> record and position) alongside the
+    data list so point lookups, updates and deletes don't scan the whole
+    table.
+    """
+
+    KEY = 'id'
     
     def __init__(self, students_list):
         """Initialize with reference to students data list."""
         self.data = students_list
+        self.rebuild_index()
     
     def create(self, student):
         """Create a new student."""
@@ -19,16 +31,24 @@ class StudentCRUD:
         if not ok:
             return False, msg
         
-        if any(s['id'] == student['id'] for s in self.data):
+        if student['id'] in self.index:
             return False, "Student ID already exists"
         
-        self.data.append(student)
-        save_csv('student', self.data)
+        self._append(student)
+        stats = tracked_stats(students=self.data)
+        if stats:
+            stats.student_added(student)
+        rel = tracked_relations(students=self.data)
+        if rel:
+            rel.student_added(student)
+        reindex_student(self.data, student)
+        invalidate_search_caches()
+        log_change('student', 'insert', student)
         return True, "Student created"
     
     def read(self, student_id):
         """Read a student by ID."""
-        return next((s for s in self.data if s['id'] == student_id), None)
+        return self.index.get(student_id)
     
     def update(self, student_id, updates):
         """Update a student by ID."""
@@ -36,20 +56,60 @@ class StudentCRUD:
         if not student:
             return False, "Student not found"
         
+        new_id = updates.get('id', student_id)
+        if new_id != student_id and new_id in self.index:
+            return False, "Student ID already exists"
+        
+        ok, msg = validate_student({**student, **updates})
+        if not ok:
+            return False, msg
+        
+        before = dict(student)
         student.update(updates)
-        save_csv('student', self.data)
+        stats = tracked_stats(students=self.data)
+        if stats:
+            stats.student_changed(before, student)
+        rel = tracked_relations(students=self.data)
+        if rel:
+            rel.student_changed(before, student)
+        reindex_student(self.data, student)
+        if new_id != student_id:
+            # re-key the index so it follows the renamed record
+            self._rekey(student_id, new_id)
+        invalidate_search_caches()
+        log_change('student', 'update', student, old_key=student_id)
         return True, "Student updated"
     
     def delete(self, student_id):
         """Delete a student by ID."""
-        student = self.read(student_id)
-        if not student:
+        student = self.take(student_id)
+        if student is None:
             return False, "Student not found"
         
-        self.data.remove(student)
-        save_csv('student', self.data)
+        stats = tracked_stats(students=self.data)
+        if stats:
+            stats.student_removed(student)
+        rel = tracked_relations(students=self.data)
+        if rel:
+            rel.student_removed(student)
+        reindex_student(self.data, student, removed=True)
+        invalidate_search_caches()
+        log_change('student', 'delete', student)
         return True, "Student deleted"
     
+    def attach(self, students):
+        """Add records that are already persisted (e.g. by an import) without journaling them."""
+        stats = tracked_stats(students=self.data)
+        rel = tracked_relations(students=self.data)
+        for student in students:
+            self._append(student)
+            if stats:
+                stats.student_added(student)
+            if rel:
+                rel.student_added(student)
+            reindex_student(self.data, student)
+        invalidate_search_caches()
+    
     def list(self):
         """List all students."""
         return self.data.copy()
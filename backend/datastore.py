@@ -0,0 +1,229 @@
+"""
+Central in-memory data store.
+
+:class:`DataStore` owns the college, program and student tables, routes every
+mutation through the CRUD layer (which keeps the primary-key indexes,
+aggregates, relations and search index current and journals the change) and
+bumps a version counter. Every change is published on the store's
+:class:`~backend.events.EventBus` as a :class:`~backend.events.ChangeEvent`
+naming the table, the operation and the keys involved, so the UI can patch
+just what is affected.
+"""
+
+import functools
+import threading
+from config import FIELDS, KEYS, COMPACT_STUDENT_RECORDS
+from .storage import init_files, load_csv, append_csv
+from .crud import StudentCRUD, ProgramCRUD, CollegeCRUD
+from .aggregates import enrollment_stats
+from .relations import relations
+from .cascade import delete_program_cascade, delete_college_cascade
+from .events import ChangeEvent, EventBus
+from .records import StudentRecord, compact_students
+from .lazycsv import LazyRows
+from .backups import pin_tables, create_backups_async
+
+
+def _locked(method):
+    """Run a store method while holding the store's lock."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class DataStore:
+    """The app's tables plus their CRUD layer, indexes and change events.
+
+    Subscribers are called with a :class:`ChangeEvent` whose `op` is one of
+    ``'insert'``, ``'update'``, ``'delete'`` or ``'reload'``. Cascades list
+    every record they touched, table by table.
+
+    Every mutation holds :attr:`lock`. Code reading the tables or the shared
+    caches built on them (search index and results, lookups, stats) from
+    another thread must hold it too.
+    """
+
+    TABLES = ('college', 'program', 'student')
+
+    def __init__(self):
+        self.colleges = []
+        self.programs = []
+        self.students = []
+        self.version = 0
+        self.events = EventBus()
+        self.lock = threading.RLock()
+        self._bind()
+
+    def _bind(self):
+        self.cruds = {
+            'college': CollegeCRUD(self.colleges),
+            'program': ProgramCRUD(self.programs),
+            'student': StudentCRUD(self.students),
+        }
+
+    @_locked
+    def load(self):
+        """(Re)load every table from storage, falling back to empty tables on error.
+
+        A large students csv is mapped as a :class:`LazyRows` instead of
+        read in full; its rows are decoded as the views and queries reach them.
+        """
+        init_files()
+        for key, attr in (('college', 'colleges'), ('program', 'programs'), ('student', 'students')):
+            try:
+                setattr(self, attr, load_csv(key, lazy=key == 'student'))
+            except Exception:
+                import traceback
+                traceback.print_exc()
+                setattr(self, attr, [])
+        if COMPACT_STUDENT_RECORDS:
+            if isinstance(self.students, LazyRows):
+                # rows become records as they are decoded
+                self.students.row_type = StudentRecord
+            else:
+                self.students = compact_students(self.students)
+        # new lists: the shared caches keyed on list identity rebuild on next use
+        self._bind()
+        for key in self.TABLES:
+            self._changed(key, 'reload')
+
+    # --- events ---
+    def subscribe(self, callback, tables=None):
+        """Call `callback(event)` after every change (to one of `tables`, if given)."""
+        self.events.subscribe(callback, tables)
+
+    def unsubscribe(self, callback):
+        self.events.unsubscribe(callback)
+
+    def _changed(self, table, op, keys=()):
+        self.version += 1
+        self.events.publish(ChangeEvent(table, op, tuple(keys)))
+
+    # --- queries ---
+    def table(self, key):
+        """The records list of table `key`."""
+        return self.cruds[key].data
+
+    def student(self, student_id):
+        return self.cruds['student'].read(student_id)
+
+    def program(self, code):
+        return self.cruds['program'].read(code)
+
+    def college(self, code):
+        return self.cruds['college'].read(code)
+
+    def stats(self):
+        """Shared enrollment counters for the current tables."""
+        return enrollment_stats(self.students, self.programs)
+
+    def relations(self):
+        """Shared foreign-key indexes for the current tables."""
+        return relations(self.students, self.programs)
+
+    # --- mutations ---
+    def _backup_before_delete(self):
+        """Snapshot the tables as they are before a cascading delete.
+
+        The tables are pinned here without being read; hashing and
+        compressing them happens on a background thread.
+        """
+        try:
+            create_backups_async(reason="before delete", pins=pin_tables())
+        except Exception:
+            import traceback
+            traceback.print_exc()
+
+    def _compact(self, key, rows):
+        if key == 'student' and COMPACT_STUDENT_RECORDS:
+            return compact_students(rows)
+        return rows
+
+    @_locked
+    def create(self, key, record):
+        """Validate and add `record` to table `key`; returns (ok, message)."""
+        if key == 'student' and COMPACT_STUDENT_RECORDS:
+            record = StudentRecord(record)
+        ok, msg = self.cruds[key].create(record)
+        if ok:
+            self._changed(key, 'insert', [record[KEYS[key]]])
+        return ok, msg
+
+    @_locked
+    def update(self, key, pk, updates):
+        """Validate and apply `updates` to the record `pk` of table `key`; returns (ok, message)."""
+        ok, msg = self.cruds[key].update(pk, updates)
+        if ok:
+            new_pk = updates.get(KEYS[key], pk)
+            self._changed(key, 'update', [pk] if new_pk == pk else [pk, new_pk])
+        return ok, msg
+
+    @_locked
+    def delete(self, key, pk):
+        """Delete record `pk` from table `key` (no cascade); returns (ok, message)."""
+        ok, msg = self.cruds[key].delete(pk)
+        if ok:
+            self._changed(key, 'delete', [pk])
+        return ok, msg
+
+    @_locked
+    def delete_program(self, code):
+        """Delete a program, clearing the program of its students.
+
+        Returns the number of students affected, or None if there is no such program.
+        """
+        program = self.program(code)
+        if program is None:
+            return None
+        student_ids = self.relations().student_ids_in_program(code)
+        self._backup_before_delete()
+        crud = self.cruds['program']
+        affected = delete_program_cascade(self.students, self.programs, program,
+                                          remove=lambda p: crud.take(code))
+        if affected:
+            self._changed('student', 'update', student_ids)
+        self._changed('program', 'delete', [code])
+        return affected
+
+    @_locked
+    def delete_college(self, code):
+        """Delete a college, clearing its programs' college and their students' program.
+
+        Returns ``(programs_affected, students_affected)``, or None if there is no such college.
+        """
+        college = self.college(code)
+        if college is None:
+            return None
+        rel = self.relations()
+        program_codes = rel.program_codes_in_college(code)
+        student_ids = [s.get('id', '') for s in rel.students_in_programs(program_codes)]
+        self._backup_before_delete()
+        crud = self.cruds['college']
+        affected = delete_college_cascade(self.students, self.programs, self.colleges, college,
+                                          remove=lambda c: crud.take(code))
+        if affected[1]:
+            self._changed('student', 'update', student_ids)
+        if affected[0]:
+            self._changed('program', 'update', program_codes)
+        self._changed('college', 'delete', [code])
+        return affected
+
+    @_locked
+    def append(self, key, rows):
+        """Persist already-validated new `rows` to table `key` in one append and add them."""
+        rows = [{f: (row.get(f) or '') for f in FIELDS[key]} for row in rows]
+        if not rows:
+            return rows
+        append_csv(key, rows)
+        return self.attach(key, rows)
+
+    @_locked
+    def attach(self, key, rows):
+        """Add rows that are already persisted (e.g. by an :class:`ImportJob`)."""
+        if rows:
+            rows = self._compact(key, rows)
+            self.cruds[key].attach(rows)
+            self._changed(key, 'insert', [r.get(KEYS[key], '') for r in rows])
+        return rows
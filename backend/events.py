@@ -0,0 +1,56 @@
+"""
+Change notifications.
+
+The :class:`DataStore` publishes a :class:`ChangeEvent` on its
+:class:`EventBus` after every mutation, naming the table, the kind of change
+and the primary keys involved, so subscribers (the views) can patch just the
+affected rows and counters instead of rebuilding everything.
+"""
+
+from typing import NamedTuple, Tuple
+
+
+INSERT = 'insert'
+UPDATE = 'update'
+DELETE = 'delete'
+RELOAD = 'reload'
+
+
+class ChangeEvent(NamedTuple):
+    """One change to one table.
+
+    `keys` lists the primary keys involved; it is empty for a reload. An
+    update that renames a record lists its old key followed by its new key.
+    """
+    table: str
+    op: str
+    keys: Tuple[str, ...] = ()
+
+
+class EventBus:
+    """Synchronous publish/subscribe of :class:`ChangeEvent`s.
+
+    A failing subscriber is reported and skipped; it never stops the others
+    or the mutation that published the event.
+    """
+
+    def __init__(self):
+        self._subscribers = []  # (callback, tables or None)
+
+    def subscribe(self, callback, tables=None):
+        """Call `callback(event)` for every event, or only for the tables in `tables`."""
+        self.unsubscribe(callback)
+        self._subscribers.append((callback, frozenset(tables) if tables is not None else None))
+
+    def unsubscribe(self, callback):
+        self._subscribers = [(cb, t) for cb, t in self._subscribers if cb != callback]
+
+    def publish(self, event):
+        for callback, tables in list(self._subscribers):
+            if tables is not None and event.table not in tables:
+                continue
+            try:
+                callback(event)
+            except Exception:
+                import traceback
+                traceback.print_exc()
@@ -0,0 +1,119 @@
+"""
+Background CSV import.
+
+An :class:`ImportJob` streams a source CSV in chunks on a worker thread,
+validates each row, drops rows whose primary key is already taken, appends
+the accepted rows to the table on disk and reports progress through a queue
+the UI polls. Once the job reports ``'done'`` the UI thread hands
+:attr:`ImportJob.rows` to :meth:`DataStore.attach` to bring memory in line.
+"""
+
+import os
+import queue
+import threading
+from itertools import islice
+from config import FIELDS, KEYS, IMPORT_CHUNK_SIZE
+from .storage import FastDictReader, append_csv
+from .validators import validate_batch
+
+
+# how a duplicate primary key is named in error messages
+KEY_LABELS = {
+    'student': 'Student ID',
+    'program': 'Program code',
+    'college': 'College code',
+}
+
+# error messages kept for display (the count covers every error)
+MAX_ERROR_MESSAGES = 100
+
+
+class ImportJob:
+    """Import one CSV file into table `key` on a background thread.
+
+    `existing_keys` is a snapshot of the primary keys already in memory (the
+    worker never touches the live lists). Messages on :attr:`messages` are
+    ``('progress', fraction)``, then one of ``('done', None)``,
+    ``('cancelled', None)`` or ``('failed', error_text)``.
+    """
+
+    def __init__(self, key, source_path, existing_keys, chunk_size=IMPORT_CHUNK_SIZE):
+        self.key = key
+        self.source_path = source_path
+        self.existing_keys = existing_keys
+        self.chunk_size = chunk_size
+        self.messages = queue.Queue()
+
+        self.rows = []          # accepted records, in file order
+        self.errors = []        # first MAX_ERROR_MESSAGES error texts
+        self.error_count = 0
+        self.rows_read = 0
+
+        self._cancel = threading.Event()
+        self._thread = None
+
+    @property
+    def imported_count(self):
+        return len(self.rows)
+
+    def start(self):
+        """Start the worker thread and return self."""
+        self._thread = threading.Thread(target=self._run, name=f"import-{self.key}", daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """Ask the worker to stop; nothing is written if it hasn't committed yet."""
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def _error(self, text):
+        self.error_count += 1
+        if len(self.errors) < MAX_ERROR_MESSAGES:
+            self.errors.append(text)
+
+    def _run(self):
+        try:
+            total = max(os.path.getsize(self.source_path), 1)
+            with open(self.source_path, 'r', encoding='utf-8', newline='') as f:
+                reader = FastDictReader(f)
+                self._import_chunks(reader, total)
+            if self.cancelled:
+                self.messages.put(('cancelled', None))
+                return
+            # commit to disk; the UI thread commits to memory on 'done'
+            if self.rows:
+                append_csv(self.key, self.rows)
+            self.messages.put(('done', None))
+        except Exception as e:
+            self.messages.put(('failed', str(e)))
+
+    def _import_chunks(self, reader, total):
+        fields = FIELDS[self.key]
+        pk = KEYS[self.key]
+        label = KEY_LABELS[self.key]
+        seen = set()
+        row_num = 1  # the header is line 1
+        while not self.cancelled:
+            chunk = list(islice(reader, self.chunk_size))
+            if not chunk:
+                break
+            records = [{f: (row.get(f) or '') for f in fields} for row in chunk]
+            invalid = dict(validate_batch(self.key, records, start=row_num + 1))
+            for record in records:
+                row_num += 1
+                msg = invalid.get(row_num)
+                if msg is not None:
+                    self._error(f"Row {row_num}: {msg}")
+                    continue
+                key = record[pk]
+                if key in self.existing_keys or key in seen:
+                    self._error(f"Row {row_num}: {label} {key} already exists")
+                    continue
+                seen.add(key)
+                self.rows.append(record)
+            self.rows_read = row_num - 1
+            self.messages.put(('progress', min(reader.chars_read / total, 1.0)))
@@ -0,0 +1,62 @@
+"""
+Cached join structures shared by the views.
+
+Students reference programs by code and programs reference colleges by code.
+Instead of scanning the programs list for every student row, the views ask
+:func:`program_lookup` for a dict-backed :class:`ProgramLookup` that is only
+rebuilt when the set of programs changes.
+"""
+
+
+class ProgramLookup:
+    """Program code -> program record -> college joins in O(1)."""
+
+    def __init__(self, programs):
+        """Index `programs` by code (first record wins on duplicate codes)."""
+        self.programs = programs
+        self.by_code = {}
+        for p in programs:
+            self.by_code.setdefault(p.get('code', ''), p)
+
+    def get(self, code):
+        """Return the program record for `code`, or None."""
+        return self.by_code.get(code)
+
+    def college_of(self, code, default='N/A'):
+        """Return the college code of program `code`, or `default` if unknown."""
+        program = self.by_code.get(code)
+        if program is None:
+            return default
+        return program.get('college', default)
+
+    def name_of(self, code, default='N/A'):
+        """Return the name of program `code`, or `default` if unknown."""
+        program = self.by_code.get(code)
+        if program is None:
+            return default
+        return program.get('name', default)
+
+
+# the lookup built for the current programs list (it keeps the list alive,
+# so a new list can never be mistaken for the cached one)
+_program_lookup = None
+
+
+def program_lookup(programs):
+    """Return the shared lookup for `programs`, building it if needed.
+
+    The lookup holds the program dicts themselves, so in-place edits (name,
+    college) show through immediately. Adding or removing programs requires
+    :func:`invalidate_program_lookup`; replacing the list (e.g. a reload from
+    disk) is picked up automatically.
+    """
+    global _program_lookup
+    if _program_lookup is None or _program_lookup.programs is not programs:
+        _program_lookup = ProgramLookup(programs)
+    return _program_lookup
+
+
+def invalidate_program_lookup():
+    """Drop the cached lookup after programs were added or removed."""
+    global _program_lookup
+    _program_lookup = None
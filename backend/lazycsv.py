@@ -0,0 +1,330 @@
+"""
+Lazily decoded csv tables.
+
+:class:`LazyRows` memory-maps a csv file and indexes only where each row
+starts and ends, plus each row's primary key. A row is decoded the first time
+it is read and then kept, so edits to it stick like they do on a plain list.
+Load time and memory grow with the rows actually read instead of with the
+file size. :meth:`LazyRows.scan` reads a few columns of every row for a
+one-pass recount without decoding the rows.
+"""
+
+import csv
+import locale
+import mmap
+import os
+import weakref
+from array import array
+from collections.abc import MutableSequence, Sequence
+
+
+# bytes split per step while indexing a quote-free file
+_INDEX_BLOCK = 1 << 20
+
+# id -> every LazyRows that still maps its file (like lists, they aren't hashable)
+_mapped = weakref.WeakValueDictionary()
+
+
+def release_files(paths):
+    """Decode every row still pending in a LazyRows mapping one of `paths`, and unmap it.
+
+    Needed before replacing such a file where an open mapping blocks that
+    (Windows).
+    """
+    paths = {os.path.abspath(p) for p in paths}
+    for rows in list(_mapped.values()):
+        if rows.path in paths:
+            rows.close()
+
+
+def _records(buf, start):
+    """Yield ``(begin, end)`` of each record of `buf` from `start`.
+
+    A newline inside a quoted field does not end a record: a line only ends
+    one once the quotes seen so far are balanced.
+    """
+    size = len(buf)
+    begin = pos = start
+    balance = 0
+    while pos < size:
+        nl = buf.find(b'\n', pos)
+        end = size if nl == -1 else nl + 1
+        balance += buf[pos:end].count(b'"')
+        pos = end
+        if balance % 2 == 0:
+            yield begin, end
+            begin = pos
+            balance = 0
+    if begin < size:
+        yield begin, size
+
+
+class LazyRows(MutableSequence):
+    """A list of a csv table's rows, decoded on first access.
+
+    Rows decode to what ``csv.DictReader`` would give, passed through
+    :attr:`row_type` (set it before reading any row). Supports everything a
+    list does, plus :meth:`key_at` and :meth:`keys` to read the primary-key
+    column without decoding rows and :meth:`scan` to read a few columns of
+    every row. The file is unmapped once every row has been decoded, or by
+    :meth:`close`.
+    """
+
+    def __init__(self, path, key_field, encoding=None):
+        self.path = os.path.abspath(path)
+        self.key_field = key_field
+        self.encoding = encoding or locale.getpreferredencoding(False)
+        self.row_type = dict
+        self.fieldnames = None
+        # per list position: the decoded row (None while pending) and its
+        # row number in the file (-1 for rows added in memory)
+        self._rows = []
+        self._ids = array('q')
+        # per row number: where the row sits in the file and its raw key
+        self._starts = array('q')
+        self._ends = array('q')
+        self._keys = []
+        self._file = open(path, 'rb')
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+            self._plain = self._map.find(b'"') == -1
+            self._index()
+        except BaseException:
+            self._file.close()
+            raise
+        self._rows = [None] * len(self._starts)
+        self._ids = array('q', range(len(self._starts)))
+        self._pending = len(self._rows)
+        if self._pending:
+            _mapped[id(self)] = self
+        else:
+            self.close()
+
+    # --- indexing ---
+    def _index(self):
+        buf = self._map
+        nl = buf.find(b'\n')
+        header_end = len(buf) if nl == -1 else nl + 1
+        if not self._plain:
+            header_end = next(_records(buf, 0), (0, 0))[1]
+        if not header_end:
+            return
+        # like csv.DictReader the header is the first record, even a blank one
+        self.fieldnames = self._parse(0, header_end)
+        names = self.fieldnames
+        k = names.index(self.key_field) if self.key_field in names else None
+        if self._plain:
+            self._index_plain(header_end, k)
+        else:
+            for begin, end in _records(buf, header_end):
+                if buf[begin:end].strip(b'\r\n'):  # blank lines are skipped, as DictReader does
+                    self._add_span(begin, end, k)
+
+    def _index_plain(self, pos, k):
+        # no quotes anywhere: every line is one record, so split a block of
+        # lines at a time instead of walking the file record by record
+        buf = self._map
+        size = len(buf)
+        starts, ends, keys, encoding = self._starts, self._ends, self._keys, self.encoding
+        while pos < size:
+            stop = buf.rfind(b'\n', pos, min(pos + _INDEX_BLOCK, size)) + 1
+            if stop <= pos:
+                # the last line, or one longer than a block
+                nl = buf.find(b'\n', pos)
+                stop = size if nl == -1 else nl + 1
+            lines = buf[pos:stop].split(b'\n')
+            if not lines[-1]:
+                lines.pop()
+            for line in lines:
+                end = pos + len(line) + 1
+                if line and line != b'\r':
+                    starts.append(pos)
+                    ends.append(min(end, size))
+                    if k is None:
+                        keys.append('')
+                    else:
+                        parts = line.rstrip(b'\r').split(b',', k + 1)
+                        keys.append(parts[k].decode(encoding) if k < len(parts) else None)
+                pos = end
+            pos = stop
+
+    def _add_span(self, begin, end, k):
+        self._starts.append(begin)
+        self._ends.append(end)
+        if k is None:
+            self._keys.append('')
+        else:
+            values = self._parse(begin, end)
+            self._keys.append(values[k] if k < len(values) else None)
+
+    # --- decoding ---
+    def _parse(self, begin, end):
+        text = self._map[begin:end].decode(self.encoding)
+        if self._plain:
+            text = text.rstrip('\r\n')
+            return text.split(',') if text else []
+        return next(csv.reader([text]), [])
+
+    def _dict(self, n):
+        """Row number `n` as the dict csv.DictReader would give."""
+        values = self._parse(self._starts[n], self._ends[n])
+        names = self.fieldnames
+        row = dict(zip(names, values))
+        if len(values) > len(names):
+            row[None] = values[len(names):]
+        elif len(values) < len(names):
+            for name in names[len(values):]:
+                row[name] = None
+        return row
+
+    def _decode(self, i):
+        n = self._ids[i]
+        row = self._dict(n)
+        if self.row_type is not dict:
+            row = self.row_type(row)
+        self._rows[i] = row
+        self._keys[n] = None
+        self._pending -= 1
+        if not self._pending:
+            self.close()
+        return row
+
+    def close(self):
+        """Decode any rows still pending, then unmap and close the file."""
+        if self._pending:
+            for i, row in enumerate(self._rows):
+                if row is None:
+                    self._decode(i)
+            return  # the last decode closed the map
+        _mapped.pop(id(self), None)
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._map = b''
+        self._starts = array('q')
+        self._ends = array('q')
+        self._keys = []
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @property
+    def decoded(self):
+        """Number of rows held decoded (or added in memory)."""
+        return len(self._rows) - self._pending
+
+    # --- sequence protocol ---
+    def __len__(self):
+        return len(self._rows)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self._rows)))]
+        row = self._rows[i]
+        if row is None:
+            row = self._decode(i % len(self._rows))
+        return row
+
+    def __iter__(self):
+        rows = self._rows
+        i = 0
+        while i < len(rows):
+            row = rows[i]
+            yield row if row is not None else self._decode(i)
+            i += 1
+
+    def __setitem__(self, i, value):
+        if isinstance(i, slice):
+            indexes = range(*i.indices(len(self._rows)))
+            values = list(value)
+            if len(values) != len(indexes):
+                raise ValueError("LazyRows only supports same-length slice assignment")
+            for j, v in zip(indexes, values):
+                self[j] = v
+            return
+        i = range(len(self._rows))[i]
+        if self._rows[i] is None:
+            self._pending -= 1
+        self._rows[i] = value
+        self._ids[i] = -1
+        if not self._pending:
+            self.close()
+
+    def __delitem__(self, i):
+        indexes = range(len(self._rows))[i]
+        if isinstance(i, slice):
+            self._pending -= sum(1 for j in indexes if self._rows[j] is None)
+        elif self._rows[indexes] is None:
+            self._pending -= 1
+        del self._rows[i]
+        del self._ids[i]
+        if not self._pending:
+            self.close()
+
+    def insert(self, i, value):
+        self._rows.insert(i, value)
+        self._ids.insert(i, -1)
+
+    def append(self, value):
+        self._rows.append(value)
+        self._ids.append(-1)
+
+    def index(self, value, start=0, stop=None):
+        # the value is usually a row handed out earlier: find it by identity
+        # without decoding anything, then fall back to list semantics
+        stop = len(self._rows) if stop is None else stop
+        for i, row in enumerate(self._rows[start:stop], start):
+            if row is value:
+                return i
+        return super().index(value, start, stop)
+
+    def copy(self):
+        """A plain list of every row (decoding them all)."""
+        return list(self)
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self):
+        return f"<LazyRows {self.path!r}: {len(self)} rows, {self.decoded} decoded>"
+
+    # --- reading without keeping ---
+    def key_at(self, i):
+        """Primary key of row `i`, read off the file while the row is pending."""
+        row = self._rows[i]
+        if row is not None:
+            return row.get(self.key_field, '')
+        return self._keys[self._ids[i]]
+
+    def keys(self):
+        """The primary key of every row, in order, without decoding any."""
+        return [self.key_at(i) for i in range(len(self._rows))]
+
+    def scan(self, fields):
+        """Yield a tuple of the values of `fields` for every row, in order.
+
+        Pending rows are parsed for the pass but not decoded or kept. A field
+        the row lacks reads as None.
+        """
+        names = self.fieldnames or []
+        cols = [names.index(f) if f in names else len(names) for f in fields]
+        # rows at least this long hold every field that is in the header
+        width = max(cols, default=-1) + 1 if all(f in names for f in fields) else None
+        rows, ids = self._rows, self._ids
+        i = 0
+        while i < len(rows):
+            row = rows[i]
+            if row is not None:
+                yield tuple(row.get(f) for f in fields)
+            else:
+                n = ids[i]
+                text = self._map[self._starts[n]:self._ends[n]].decode(self.encoding)
+                values = text.rstrip('\r\n').split(',') if self._plain else next(csv.reader([text]), [])
+                if width is not None and len(values) >= width:
+                    yield tuple([values[c] for c in cols])
+                else:
+                    short = min(len(values), len(names))
+                    yield tuple([values[c] if c < short else None for c in cols])
+            i += 1
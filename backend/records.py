@@ -0,0 +1,141 @@
+"""
+Compact student records.
+
+A csv row dict carries a hash table and three string objects of its own for
+every student. A :class:`StudentRecord` keeps the id and the two names packed
+into one string, and stores program, year and gender as small-int codes into
+per-field value tables, so a record costs about a third of the dict.
+Records are mutable mappings that compare equal to the row dicts they
+replace, so code written against the csv dicts (``r['id']``,
+``r.get(...)``, ``dict(r)``, ``r == row``, ``r.update(...)``,
+``csv.DictWriter``) keeps working.
+"""
+
+from collections.abc import Mapping, MutableMapping
+from config import FIELDS
+
+
+STUDENT_FIELDS = tuple(FIELDS['student'])
+_FIELD_SET = frozenset(STUDENT_FIELDS)
+
+# high-cardinality columns, packed into one string joined by _SEP
+_TEXT_FIELDS = ('id', 'firstname', 'lastname')
+_SEP = '\x1f'
+
+# low-cardinality columns: each record holds a code into the field's values
+_CODED_FIELDS = ('program', 'year', 'gender')
+_values = {field: [] for field in _CODED_FIELDS}
+_codes = {field: {} for field in _CODED_FIELDS}
+
+
+def _code(field, value):
+    """The code of `value` in `field`'s value table, adding it if new."""
+    codes = _codes[field]
+    code = codes.get(value)
+    if code is None:
+        values = _values[field]
+        values.append(value)
+        code = codes.setdefault(value, len(values) - 1)
+    return code
+
+
+def _pack(texts):
+    """The id and names as one string, or as a tuple if they can't be joined safely."""
+    if all(t.__class__ is str and _SEP not in t for t in texts):
+        return _SEP.join(texts)
+    return tuple(texts)
+
+
+# field -> its position in the packed string, or the slot holding its code
+_TEXT_INDEX = {field: i for i, field in enumerate(_TEXT_FIELDS)}
+_CODE_SLOTS = {field: '_' + field for field in _CODED_FIELDS}
+
+
+class StudentRecord(MutableMapping):
+    """One student, field-for-field like the csv row dict it replaces.
+
+    Only the student fields exist: reading another key raises KeyError like a
+    missing dict key, and setting one raises KeyError too. Records compare
+    equal to any mapping with the same fields and values, and like dicts
+    they are not hashable.
+    """
+
+    __slots__ = ('_text',) + tuple(_CODE_SLOTS.values())
+
+    def __init__(self, row=None, **fields):
+        row = dict(row or {}, **fields) if fields or row is None else row
+        get = row.get
+        self._text = _pack([get(field, '') for field in _TEXT_FIELDS])
+        self._program = _code('program', get('program', ''))
+        self._year = _code('year', get('year', ''))
+        self._gender = _code('gender', get('gender', ''))
+
+    def __getitem__(self, key):
+        i = _TEXT_INDEX.get(key)
+        if i is not None:
+            text = self._text
+            return text.split(_SEP)[i] if text.__class__ is str else text[i]
+        slot = _CODE_SLOTS.get(key)
+        if slot is None:
+            raise KeyError(key)
+        return _values[key][getattr(self, slot)]
+
+    def get(self, key, default=None):
+        i = _TEXT_INDEX.get(key)
+        if i is not None:
+            text = self._text
+            return text.split(_SEP)[i] if text.__class__ is str else text[i]
+        slot = _CODE_SLOTS.get(key)
+        if slot is None:
+            return default
+        return _values[key][getattr(self, slot)]
+
+    def __setitem__(self, key, value):
+        if key not in _FIELD_SET:
+            raise KeyError(key)
+        if key in _CODE_SLOTS:
+            setattr(self, _CODE_SLOTS[key], _code(key, value))
+            return
+        text = self._text
+        texts = text.split(_SEP) if text.__class__ is str else list(text)
+        texts[_TEXT_INDEX[key]] = value
+        self._text = _pack(texts)
+
+    def __delitem__(self, key):
+        raise TypeError("student fields cannot be removed")
+
+    def __iter__(self):
+        return iter(STUDENT_FIELDS)
+
+    def __len__(self):
+        return len(STUDENT_FIELDS)
+
+    def __contains__(self, key):
+        return key in _FIELD_SET
+
+    def update(self, other=(), **fields):
+        items = other.items() if isinstance(other, Mapping) else other
+        for key, value in items:
+            self[key] = value
+        for key, value in fields.items():
+            self[key] = value
+
+    def copy(self):
+        """A plain dict copy, like ``dict.copy`` on the row it replaces."""
+        text = self._text
+        row = dict(zip(_TEXT_FIELDS, text.split(_SEP) if text.__class__ is str else text))
+        row['program'] = _values['program'][self._program]
+        row['year'] = _values['year'][self._year]
+        row['gender'] = _values['gender'][self._gender]
+        return {field: row[field] for field in STUDENT_FIELDS}
+
+    def __reduce__(self):
+        return (StudentRecord, (self.copy(),))
+
+    def __repr__(self):
+        return f"StudentRecord({self.copy()!r})"
+
+
+def compact_students(rows):
+    """Return `rows` as a list of :class:`StudentRecord` (records are kept as they are)."""
+    return [r if r.__class__ is StudentRecord else StudentRecord(r) for r in rows]
@@ -0,0 +1,132 @@
+"""
+Foreign-key reverse indexes.
+
+:class:`Relations` maps each program code to the students enrolled in it
+(keyed by student ID) and each college code to its programs (keyed by program
+code). It is built in one pass over the data and then kept current with O(1)
+hooks on every create, update and delete, so drill-downs and cascades cost the
+size of their result instead of a scan.
+"""
+
+
+class Relations:
+    """Reverse indexes over a students list and a programs list.
+
+    Update hooks take the record before and/or after the change; callers that
+    edit a dict in place should pass a copy taken before the edit.
+    """
+
+    def __init__(self, students, programs):
+        self.students = students
+        self.programs = programs
+        self.rebuild()
+
+    def rebuild(self):
+        """Re-index everything in a single pass over programs and students."""
+        self._by_program = {}  # program code -> {student id: record}
+        self._by_college = {}  # college code -> {program code: record}
+        for p in self.programs:
+            self._by_college.setdefault(p.get('college', ''), {}).setdefault(p.get('code', ''), p)
+        by_program = self._by_program
+        for s in self.students:
+            members = by_program.get(s.get('program', ''))
+            if members is None:
+                members = by_program[s.get('program', '')] = {}
+            members.setdefault(s.get('id', ''), s)
+
+    # --- queries ---
+    def student_ids_in_program(self, code):
+        """IDs of the students enrolled in program `code`."""
+        return set(self._by_program.get(code, ()))
+
+    def program_codes_in_college(self, code):
+        """Codes of the programs belonging to college `code`."""
+        return set(self._by_college.get(code, ()))
+
+    def students_in_program(self, code):
+        """Student records enrolled in program `code`."""
+        return list(self._by_program.get(code, {}).values())
+
+    def students_in_programs(self, codes):
+        """Student records enrolled in any program of `codes`."""
+        result = []
+        for code in codes:
+            result.extend(self._by_program.get(code, {}).values())
+        return result
+
+    def programs_in_college(self, code):
+        """Program records belonging to college `code`."""
+        return list(self._by_college.get(code, {}).values())
+
+    def students_in_college(self, code):
+        """Student records enrolled in any program of college `code`."""
+        return self.students_in_programs(self._by_college.get(code, ()))
+
+    # --- student hooks ---
+    def student_added(self, student):
+        self._by_program.setdefault(student.get('program', ''), {}).setdefault(student.get('id', ''), student)
+
+    def student_removed(self, student):
+        program = student.get('program', '')
+        members = self._by_program.get(program)
+        if members is not None and members.get(student.get('id', '')) is student:
+            del members[student.get('id', '')]
+            if not members:
+                del self._by_program[program]
+
+    def student_changed(self, before, after):
+        # `before` is usually a copy, so drop by key rather than identity
+        program = before.get('program', '')
+        members = self._by_program.get(program)
+        if members is not None and members.get(before.get('id', '')) is after:
+            del members[before.get('id', '')]
+            if not members:
+                del self._by_program[program]
+        self.student_added(after)
+
+    # --- program hooks ---
+    def program_added(self, program):
+        self._by_college.setdefault(program.get('college', ''), {}).setdefault(program.get('code', ''), program)
+
+    def program_removed(self, program):
+        college = program.get('college', '')
+        members = self._by_college.get(college)
+        if members is not None and members.get(program.get('code', '')) is program:
+            del members[program.get('code', '')]
+            if not members:
+                del self._by_college[college]
+
+    def program_changed(self, before, after):
+        college = before.get('college', '')
+        members = self._by_college.get(college)
+        if members is not None and members.get(before.get('code', '')) is after:
+            del members[before.get('code', '')]
+            if not members:
+                del self._by_college[college]
+        self.program_added(after)
+
+
+# the relations built for the current students/programs lists
+_relations = None
+
+
+def relations(students, programs):
+    """Return the shared relations for these lists, building them on first use.
+
+    Replacing either list (e.g. a reload from disk) triggers a rebuild.
+    """
+    global _relations
+    if _relations is None or _relations.students is not students or _relations.programs is not programs:
+        _relations = Relations(students, programs)
+    return _relations
+
+
+def tracked_relations(students=None, programs=None):
+    """Return the shared relations if they were built for the given list(s), else None."""
+    if _relations is None:
+        return None
+    if students is not None and _relations.students is not students:
+        return None
+    if programs is not None and _relations.programs is not programs:
+        return None
+    return _relations
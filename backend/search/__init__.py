@@ -5,5 +5,19 @@ Search operations for Students, Programs, and Colleges.
 from .students import StudentSearch
 from .programs import ProgramSearch
 from .colleges import CollegeSearch
+from .index import TrigramIndex, student_index, reindex_student
+from .cache import RefinementCache
 
-__all__ = ["StudentSearch", "ProgramSearch", "CollegeSearch"]
+
+def invalidate_search_caches():
+    """Drop the cached search bar results of every entity after a data change."""
+    StudentSearch.invalidate()
+    ProgramSearch.invalidate()
+    CollegeSearch.invalidate()
+
+
+__all__ = [
+    "StudentSearch", "ProgramSearch", "CollegeSearch",
+    "TrigramIndex", "student_index", "reindex_student",
+    "RefinementCache", "invalidate_search_caches",
+]
@@ -0,0 +1,67 @@
+"""
+Refinement cache for search-as-you-type.
+"""
+
+from collections import OrderedDict
+
+
+class RefinementCache:
+    """Small LRU of recent query -> result lists for one set of source lists.
+
+    A query that extends a cached one (``"mar"`` -> ``"mari"``) only filters
+    the cached subset, since every match of the longer query also matches the
+    shorter one; going back (backspace) is a plain cache hit. Entries are
+    dropped when the source lists are replaced or change length, and by
+    :meth:`invalidate` after in-place edits; a result computed across an
+    :meth:`invalidate` is returned but not cached.
+
+    Not thread-safe by itself: callers off the main thread hold the
+    :class:`~backend.datastore.DataStore` lock (see the views' ``filter_rows``).
+    """
+
+    def __init__(self, size=32):
+        """Keep at most `size` query results."""
+        self.size = size
+        self._results = OrderedDict()
+        self._token = None
+        self._generation = 0
+
+    def invalidate(self):
+        """Forget every cached result."""
+        self._results.clear()
+        self._token = None
+        self._generation += 1
+
+    def search(self, sources, query, match, full):
+        """Return the cached or refined results for `query`.
+
+        `sources` are the lists the results are drawn from, `match(item,
+        query)` tests one cached item and `full(query)` computes the results
+        from scratch when no cached query is a prefix of `query`.
+        """
+        token = tuple((id(s), len(s)) for s in sources)
+        if token != self._token:
+            self.invalidate()
+            self._token = token
+        generation = self._generation
+
+        results = self._results
+        if query in results:
+            results.move_to_end(query)
+            return results[query]
+
+        base = None
+        for cached in results:
+            if query.startswith(cached) and (base is None or len(cached) > len(base)):
+                base = cached
+        if base is None:
+            found = full(query)
+        else:
+            found = [item for item in results[base] if match(item, query)]
+
+        # an invalidate() while this result was computed means it may be stale
+        if generation == self._generation:
+            results[query] = found
+            if len(results) > self.size:
+                results.popitem(last=False)
+        return found
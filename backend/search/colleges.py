@@ -2,10 +2,15 @@
 Search operations for Colleges - search by specific fields or all fields.
 """
 
+from .cache import RefinementCache
+
 
 class CollegeSearch:
     """Search operations for colleges."""
     
+    # recent search bar results, refined as the query grows
+    _cache = RefinementCache()
+    
     @staticmethod
     def by_field(colleges, field, query):
         """Search colleges by a specific field (case-insensitive)."""
@@ -27,3 +32,23 @@ class CollegeSearch:
         """Search colleges across all fields."""
         query_lower = query.lower()
         return [c for c in colleges if any(query_lower in str(v).lower() for v in c.values())]
+    
+    @staticmethod
+    def global_search(colleges, query):
+        """Search bar match on code or name.
+        
+        Returns cached ``(position, college)`` pairs, positions counting from 1.
+        """
+        def match(item, q):
+            c = item[1]
+            return q in c.get('name', '').lower() or q in c.get('code', '').lower()
+        
+        def full(q):
+            return [item for item in enumerate(colleges, 1) if match(item, q)]
+        
+        return CollegeSearch._cache.search((colleges,), query.lower(), match, full)
+    
+    @staticmethod
+    def invalidate():
+        """Drop cached search bar results."""
+        CollegeSearch._cache.invalidate()
@@ -0,0 +1,223 @@
+"""
+Trigram search index - substring search without scanning every record.
+"""
+
+# student fields matched by the global search bar (college is joined in
+# through the program, see StudentsView.filter_table)
+STUDENT_SEARCH_FIELDS = ('id', 'firstname', 'lastname', 'gender', 'year', 'program')
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """Case-insensitive substring index over a list of dict records.
+
+    Field values repeat a lot (names, programs, years), so the index works on
+    the vocabulary of distinct lowercased values: each trigram has a posting
+    set of the values containing it, and each value has the set of records
+    (by sequence number, in list order) that hold it in an indexed field.
+
+    A query intersects the postings of its trigrams, smallest first, verifies
+    the surviving values and unions their records. Queries shorter than three
+    characters scan the vocabulary instead of the records. Results come back
+    in list order, exactly as a full scan would return them.
+
+    Records must be reported through :meth:`add`, :meth:`remove` and
+    :meth:`update` to keep the index current.
+    """
+
+    def __init__(self, records, fields, group_fields=()):
+        """Index `records` on `fields`; `group_fields` also get exact-value groups."""
+        self.records = records
+        self.fields = tuple(fields)
+        self.group_fields = tuple(group_fields)
+        self.rebuild()
+
+    def rebuild(self):
+        """Re-index every record of the list from scratch."""
+        self._docs = {}      # seq -> record
+        self._seq = {}       # id(record) -> seq
+        self._terms = {}     # seq -> (lowercased value per field, raw group values)
+        self._values = {}    # lowercased value -> set of seq
+        self._postings = {}  # trigram -> set of lowercased values
+        self._groups = {f: {} for f in self.group_fields}  # field -> value -> set of seq
+        # bulk path of add(): file every record under its values first, then
+        # split each distinct value into trigrams once
+        docs, seqs, terms_of, values = self._docs, self._seq, self._terms, self._values
+        fields = self.fields
+        groups = [(f, self._groups[f]) for f in self.group_fields]
+        seq = 0
+        for r in self.records:
+            if id(r) in seqs:
+                continue
+            docs[seq] = r
+            seqs[id(r)] = seq
+            terms = tuple([str(r.get(f, '')).lower() for f in fields])
+            for term in terms:
+                members = values.get(term)
+                if members is None:
+                    values[term] = {seq}
+                else:
+                    members.add(seq)
+            group_values = tuple([r.get(f, '') for f, _ in groups])
+            for (f, members_of), value in zip(groups, group_values):
+                members_of.setdefault(value, set()).add(seq)
+            terms_of[seq] = (terms, group_values)
+            seq += 1
+        self._next = seq
+        postings = self._postings
+        for term in values:
+            for i in range(len(term) - 2):
+                gram = term[i:i + 3]
+                posting = postings.get(gram)
+                if posting is None:
+                    postings[gram] = {term}
+                else:
+                    posting.add(term)
+
+    def __len__(self):
+        return len(self._docs)
+
+    def _index(self, seq, record):
+        values = self._values
+        terms = tuple(str(record.get(f, '')).lower() for f in self.fields)
+        for term in terms:
+            members = values.get(term)
+            if members is None:
+                values[term] = {seq}
+                for gram in _trigrams(term):
+                    self._postings.setdefault(gram, set()).add(term)
+            else:
+                members.add(seq)
+        group_values = tuple(record.get(f, '') for f in self.group_fields)
+        for f, value in zip(self.group_fields, group_values):
+            self._groups[f].setdefault(value, set()).add(seq)
+        # remember what was indexed so an in-place edit can still be undone
+        self._terms[seq] = (terms, group_values)
+
+    def _unindex(self, seq):
+        terms, group_values = self._terms.pop(seq)
+        for term in terms:
+            members = self._values.get(term)
+            if members is None:
+                continue
+            members.discard(seq)
+            if not members:
+                del self._values[term]
+                for gram in _trigrams(term):
+                    posting = self._postings.get(gram)
+                    if posting is not None:
+                        posting.discard(term)
+                        if not posting:
+                            del self._postings[gram]
+        for f, value in zip(self.group_fields, group_values):
+            members = self._groups[f].get(value)
+            if members is not None:
+                members.discard(seq)
+                if not members:
+                    del self._groups[f][value]
+
+    # --- maintenance hooks ---
+    def add(self, record):
+        """Index a record appended to the list."""
+        if id(record) in self._seq:
+            return
+        seq = self._next
+        self._next += 1
+        self._docs[seq] = record
+        self._seq[id(record)] = seq
+        self._index(seq, record)
+
+    def remove(self, record):
+        """Drop a record removed from the list."""
+        seq = self._seq.pop(id(record), None)
+        if seq is None:
+            return
+        del self._docs[seq]
+        self._unindex(seq)
+
+    def update(self, record):
+        """Re-index a record that was edited in place."""
+        seq = self._seq.get(id(record))
+        if seq is None:
+            self.add(record)
+            return
+        self._unindex(seq)
+        self._index(seq, record)
+
+    # --- queries ---
+    def values(self, field):
+        """Distinct values of a group field present in the index."""
+        return list(self._groups[field])
+
+    def matching_terms(self, query):
+        """Return the distinct indexed values that contain `query`."""
+        query = query.lower()
+        if len(query) < 3:
+            return [term for term in self._values if query in term]
+        postings = []
+        for gram in _trigrams(query):
+            posting = self._postings.get(gram)
+            if not posting:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                return []
+        return [term for term in candidates if query in term]
+
+    def search(self, query, joined=None):
+        """Return the records containing `query` in any indexed field, in list order.
+
+        `joined` maps a group field to values whose records match as well
+        (e.g. the programs whose college matched the query).
+        """
+        hits = set()
+        for term in self.matching_terms(query):
+            hits |= self._values[term]
+        for f, values in (joined or {}).items():
+            groups = self._groups[f]
+            for v in values:
+                hits |= groups.get(v, set())
+        docs = self._docs
+        return [docs[seq] for seq in sorted(hits)]
+
+
+# the index built for the current students list
+_student_index = None
+
+
+def student_index(students):
+    """Return the shared student index, building it if needed.
+
+    Replacing the list (e.g. a reload) or changing its length without going
+    through the hooks triggers a rebuild.
+    """
+    global _student_index
+    if (_student_index is None or _student_index.records is not students
+            or len(_student_index) != len(students)):
+        _student_index = TrigramIndex(students, STUDENT_SEARCH_FIELDS, group_fields=('program',))
+    return _student_index
+
+
+def tracked_student_index(students):
+    """Return the shared index if it was built for `students`, else None."""
+    if _student_index is None or _student_index.records is not students:
+        return None
+    return _student_index
+
+
+def reindex_student(students, record, removed=False):
+    """Report an added/edited (or `removed`) student to the shared index, if built."""
+    index = tracked_student_index(students)
+    if index is None:
+        return
+    if removed:
+        index.remove(record)
+    else:
+        index.update(record)
@@ -2,10 +2,15 @@
 Search operations for Programs - search by specific fields or all fields.
 """
 
+from .cache import RefinementCache
+
 
 class ProgramSearch:
     """Search operations for programs."""
     
+    # recent search bar results, refined as the query grows
+    _cache = RefinementCache()
+    
     @staticmethod
     def by_field(programs, field, query):
         """Search programs by a specific field (case-insensitive)."""
@@ -32,3 +37,25 @@ class ProgramSearch:
         """Search programs across all fields."""
         query_lower = query.lower()
         return [p for p in programs if any(query_lower in str(v).lower() for v in p.values())]
+    
+    @staticmethod
+    def global_search(programs, query):
+        """Search bar match on code, name or college.
+        
+        Returns cached ``(position, program)`` pairs, positions counting from 1.
+        """
+        def match(item, q):
+            p = item[1]
+            return (q in p.get('name', '').lower() or
+                    q in p.get('code', '').lower() or
+                    q in p.get('college', '').lower())
+        
+        def full(q):
+            return [item for item in enumerate(programs, 1) if match(item, q)]
+        
+        return ProgramSearch._cache.search((programs,), query.lower(), match, full)
+    
+    @staticmethod
+    def invalidate():
+        """Drop cached search bar results."""
+        ProgramSearch._cache.invalidate()
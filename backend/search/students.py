@@ -2,10 +2,17 @@
 Search operations for Students - search by specific fields or all fields.
 """
 
+from .cache import RefinementCache
+from .index import student_index
+from ..joins import program_lookup
+
 
 class StudentSearch:
     """Search operations for students."""
     
+    # recent search bar results, refined as the query grows
+    _cache = RefinementCache()
+    
     @staticmethod
     def by_field(students, field, query):
         """Search students by a specific field (case-insensitive)."""
@@ -50,3 +57,34 @@ class StudentSearch:
         """Search students across all fields."""
         query_lower = query.lower()
         return [s for s in students if any(query_lower in str(v).lower() for v in s.values())]
+    
+    @staticmethod
+    def global_search(students, programs, query):
+        """Search bar match on student fields or the college of their program.
+        
+        Results are cached, so extending the previous query only filters its
+        results. Call :meth:`invalidate` after editing records in place.
+        """
+        lookup = program_lookup(programs)
+        
+        def match(s, q):
+            return (q in s.get('firstname', '').lower() or
+                    q in s.get('lastname', '').lower() or
+                    q in s.get('id', '').lower() or
+                    q in s.get('gender', '').lower() or
+                    q in s.get('program', '').lower() or
+                    q in str(s.get('year', '')).lower() or
+                    q in lookup.college_of(s.get('program', '')).lower())
+        
+        def full(q):
+            index = student_index(students)
+            # college isn't a student field: match it through the program codes
+            codes = [c for c in index.values('program') if q in lookup.college_of(c).lower()]
+            return index.search(q, joined={'program': codes})
+        
+        return StudentSearch._cache.search((students, programs), query.lower(), match, full)
+    
+    @staticmethod
+    def invalidate():
+        """Drop cached search bar results."""
+        StudentSearch._cache.invalidate()
@@ -5,5 +5,9 @@ Sort operations for Students, Programs, and Colleges.
 from .students import StudentSort
 from .programs import ProgramSort
 from .colleges import CollegeSort
+from .keys import sort_key, sort_records, RowSortCache, TableSorter
 
-__all__ = ["StudentSort", "ProgramSort", "CollegeSort"]
+__all__ = [
+    "StudentSort", "ProgramSort", "CollegeSort",
+    "sort_key", "sort_records", "RowSortCache", "TableSorter",
+]
@@ -2,6 +2,8 @@
 Sort operations for Colleges.
 """
 
+from .keys import sort_key, sort_records
+
 
 class CollegeSort:
     """Sort operations for colleges."""
@@ -9,7 +11,12 @@ class CollegeSort:
     @staticmethod
     def by_field(colleges, field, reverse=False):
         """Sort colleges by a specific field."""
-        return sorted(colleges, key=lambda c: str(c.get(field, '')).lower(), reverse=reverse)
+        return sorted(colleges, key=lambda c: sort_key(c.get(field, '')), reverse=reverse)
+    
+    @staticmethod
+    def by_fields(colleges, spec):
+        """Stable sort colleges by several ``(field, reverse)`` pairs, most significant first."""
+        return sort_records(colleges, spec)
     
     @staticmethod
     def by_code(colleges, reverse=False):
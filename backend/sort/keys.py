@@ -0,0 +1,150 @@
+"""
+Typed sort keys and cached sort orders for table rows.
+"""
+
+import re
+
+
+# student ids look like 2023-0001; they sort as the integer 20230001
+_STUDENT_ID = re.compile(r'(\d{4})-(\d{4})')
+_NUMBER = re.compile(r'-?\d+(\.\d+)?')
+
+
+def sort_key(value):
+    """Return a key that orders numbers, student ids and text consistently.
+
+    Numbers and ids compare numerically, text case-insensitively, and every
+    number sorts before every piece of text, so a column mixing both never
+    compares a float with a str.
+    """
+    if isinstance(value, (int, float)):
+        return (0, value)
+    s = str(value)
+    m = _STUDENT_ID.fullmatch(s)
+    if m:
+        return (0, int(m.group(1)) * 10000 + int(m.group(2)))
+    if _NUMBER.fullmatch(s):
+        return (0, float(s))
+    return (1, s.lower())
+
+
+def sort_records(records, spec):
+    """Stable multi-column sort of dict records.
+
+    `spec` lists ``(field, reverse)`` pairs, most significant first.
+    """
+    result = list(records)
+    for field, reverse in reversed(spec):
+        result.sort(key=lambda r: sort_key(r.get(field, '')), reverse=reverse)
+    return result
+
+
+class RowSortCache:
+    """Sort orders of one list of table rows (tuples), computed once and reused.
+
+    Each column's typed keys and ascending permutation are built the first
+    time that column is sorted. The descending order is derived from the
+    ascending one in O(n) by reversing the runs of equal keys, which keeps
+    ties in their original order exactly like a stable ``reverse=True`` sort.
+    """
+
+    def __init__(self, rows, max_orders=16):
+        """Cache orders for `rows`; keep at most `max_orders` multi-column results."""
+        self.rows = rows
+        self.max_orders = max_orders
+        self._keys = {}    # column -> typed key per row
+        self._orders = {}  # ((column, reverse), ...) -> permutation
+
+    def keys(self, col):
+        """Typed sort keys of column `col`, one per row."""
+        keys = self._keys.get(col)
+        if keys is None:
+            keys = [sort_key(row[col]) for row in self.rows]
+            self._keys[col] = keys
+        return keys
+
+    def order(self, spec):
+        """Permutation of row indexes sorted by `spec` (``(column, reverse)`` pairs, most significant first)."""
+        spec = tuple(spec)
+        order = self._orders.get(spec)
+        if order is not None:
+            return order
+        if len(spec) == 1:
+            col, reverse = spec[0]
+            ascending = self._orders.get(((col, False),))
+            if ascending is None:
+                keys = self.keys(col)
+                ascending = sorted(range(len(self.rows)), key=keys.__getitem__)
+                self._remember(((col, False),), ascending)
+            order = self._reverse_runs(ascending, self.keys(col)) if reverse else ascending
+        else:
+            # stable passes from the least significant column up, starting
+            # from the cached order of the least significant one
+            order = list(self.order(spec[-1:]))
+            for col, reverse in reversed(spec[:-1]):
+                keys = self.keys(col)
+                order.sort(key=keys.__getitem__, reverse=reverse)
+        self._remember(spec, order)
+        return order
+
+    def sorted_rows(self, spec):
+        """The rows in the order given by `spec`."""
+        rows = self.rows
+        return [rows[i] for i in self.order(spec)]
+
+    @staticmethod
+    def _reverse_runs(ascending, keys):
+        result = []
+        end = len(ascending)
+        while end > 0:
+            start = end - 1
+            key = keys[ascending[start]]
+            while start > 0 and keys[ascending[start - 1]] == key:
+                start -= 1
+            result.extend(ascending[start:end])
+            end = start
+        return result
+
+    def _remember(self, spec, order):
+        if spec not in self._orders and len(self._orders) >= self.max_orders:
+            # drop the oldest multi-column order; single columns stay cached
+            for old in self._orders:
+                if len(old) > 1:
+                    del self._orders[old]
+                    break
+        self._orders[spec] = order
+
+
+class TableSorter:
+    """Column-click sorting for one table view.
+
+    Sorting by a column keeps the previous sort columns as tie-breakers, the
+    same result as repeatedly stable-sorting the rows, but served from a
+    :class:`RowSortCache` so re-sorting or flipping direction is a cache hit
+    or an O(n) pass. Passing a new rows list (after a refresh or search)
+    starts over.
+    """
+
+    def __init__(self):
+        self._cache = None
+        self._spec = []
+        self._last = None
+
+    def invalidate(self):
+        """Forget cached keys and orders after the sorted rows were patched in place.
+
+        The sort columns are kept, so the next sort still breaks ties the same way.
+        """
+        self._cache = None
+
+    def sort(self, rows, col, reverse=False):
+        """Return `rows` sorted by column index `col` on top of earlier sorts."""
+        if rows is not self._last:
+            self._cache = None
+            self._spec = []
+        if self._cache is None:
+            self._cache = RowSortCache(rows)
+        # a column's older entry can never break a tie its newer entry left
+        self._spec = [(col, reverse)] + [(c, r) for c, r in self._spec if c != col]
+        self._last = self._cache.sorted_rows(self._spec)
+        return self._last
@@ -2,6 +2,8 @@
 Sort operations for Programs.
 """
 
+from .keys import sort_key, sort_records
+
 
 class ProgramSort:
     """Sort operations for programs."""
@@ -9,7 +11,12 @@ class ProgramSort:
     @staticmethod
     def by_field(programs, field, reverse=False):
         """Sort programs by a specific field."""
-        return sorted(programs, key=lambda p: str(p.get(field, '')).lower(), reverse=reverse)
+        return sorted(programs, key=lambda p: sort_key(p.get(field, '')), reverse=reverse)
+    
+    @staticmethod
+    def by_fields(programs, spec):
+        """Stable sort programs by several ``(field, reverse)`` pairs, most significant first."""
+        return sort_records(programs, spec)
     
     @staticmethod
     def by_code(programs, reverse=False):
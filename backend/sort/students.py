@@ -2,6 +2,8 @@
 Sort operations for Students.
 """
 
+from .keys import sort_key, sort_records
+
 
 class StudentSort:
     """Sort operations for students."""
@@ -9,7 +11,12 @@ class StudentSort:
     @staticmethod
     def by_field(students, field, reverse=False):
         """Sort students by a specific field."""
-        return sorted(students, key=lambda s: str(s.get(field, '')).lower(), reverse=reverse)
+        return sorted(students, key=lambda s: sort_key(s.get(field, '')), reverse=reverse)
+    
+    @staticmethod
+    def by_fields(students, spec):
+        """Stable sort students by several ``(field, reverse)`` pairs, most significant first."""
+        return sort_records(students, spec)
     
     @staticmethod
     def by_id(students, reverse=False):
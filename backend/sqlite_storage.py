@@ -0,0 +1,166 @@
+"""
+SQLite storage engine.
+
+Keeps the students, programs, colleges and users tables in a single stdlib
+``sqlite3`` database with the same interface as the CSV functions in
+:mod:`backend.storage`. Single-record changes become single-row statements
+instead of full-file rewrites.
+
+Enable it with ``STORAGE_ENGINE = 'sqlite'`` in ``config.py``; the first start
+migrates the existing CSV files into ``DB_FILE``.
+"""
+
+import sqlite3
+import threading
+from collections.abc import Mapping
+from config import FIELDS, KEYS
+
+
+# table name for each storage key
+TABLES = {
+    'college': 'colleges',
+    'program': 'programs',
+    'student': 'students',
+    'user': 'users',
+}
+
+# (key, column) pairs that reference another table and get a lookup index
+FOREIGN_KEYS = [
+    ('program', 'college'),
+    ('student', 'program'),
+]
+
+
+class SQLiteEngine:
+    """Storage engine backed by a sqlite3 database file.
+
+    Rows are returned in insertion order (rowid), matching the CSV files.
+    Like the CRUD indexes, the first record wins when a duplicate primary key
+    is inserted in bulk.
+    """
+
+    def __init__(self, path):
+        """Open (or create) the database at `path` and ensure the schema exists."""
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        with self._lock, self._conn:
+            for key, table in TABLES.items():
+                cols = ", ".join(
+                    f"{f} TEXT NOT NULL DEFAULT ''" + (" PRIMARY KEY" if f == KEYS[key] else "")
+                    for f in FIELDS[key]
+                )
+                self._conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({cols})")
+            for key, column in FOREIGN_KEYS:
+                table = TABLES[key]
+                self._conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_{table}_{column} ON {table}({column})"
+                )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)"
+            )
+
+    @staticmethod
+    def _values(key, record):
+        return [record.get(f, '') or '' for f in FIELDS[key]]
+
+    def load(self, key):
+        """Return all rows of table `key` as a list of dicts."""
+        fields = FIELDS[key]
+        with self._lock:
+            cur = self._conn.execute(
+                f"SELECT {', '.join(fields)} FROM {TABLES[key]} ORDER BY rowid"
+            )
+            return [dict(zip(fields, row)) for row in cur]
+
+    def save(self, key, data):
+        """Replace the whole table with `data` in one transaction."""
+        table = TABLES[key]
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM {table}")
+            self._insert_many(key, data)
+
+    def save_many(self, tables, changes=None):
+        """Replace several tables (`{key: data}`) in one transaction.
+
+        `changes` maps a table key to ``(op, record, old_key)`` changes
+        applied in the same transaction, as :meth:`log_change` would.
+        """
+        with self._lock, self._conn:
+            for key, data in tables.items():
+                self._conn.execute(f"DELETE FROM {TABLES[key]}")
+                self._insert_many(key, data)
+            for key, entries in (changes or {}).items():
+                for op, record, old_key in entries:
+                    self._apply_change(key, op, record, old_key)
+
+    def append(self, key, rows):
+        """Insert new rows (existing primary keys are left untouched)."""
+        with self._lock, self._conn:
+            self._insert_many(key, rows)
+
+    def _insert_many(self, key, rows):
+        fields = FIELDS[key]
+        marks = ", ".join("?" for _ in fields)
+        self._conn.executemany(
+            f"INSERT OR IGNORE INTO {TABLES[key]} ({', '.join(fields)}) VALUES ({marks})",
+            (self._values(key, r) for r in rows if isinstance(r, Mapping)),
+        )
+
+    def log_change(self, key, op, record, old_key=None):
+        """Apply a single insert/update/delete as one statement."""
+        with self._lock, self._conn:
+            self._apply_change(key, op, record, old_key)
+
+    def _apply_change(self, key, op, record, old_key):
+        table = TABLES[key]
+        fields = FIELDS[key]
+        pk = KEYS[key]
+        target = record.get(pk, '') if old_key is None else old_key
+        if op == 'delete':
+            self._conn.execute(f"DELETE FROM {table} WHERE {pk} = ?", (target,))
+            return
+        values = self._values(key, record)
+        assignments = ", ".join(f"{f} = ?" for f in fields)
+        cur = self._conn.execute(
+            f"UPDATE {table} SET {assignments} WHERE {pk} = ?", values + [target]
+        )
+        if cur.rowcount == 0:
+            marks = ", ".join("?" for _ in fields)
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {table} ({', '.join(fields)}) VALUES ({marks})",
+                values,
+            )
+
+    def migrate_from_csv(self, force=False):
+        """Copy every CSV table into the database once.
+
+        Returns True if a migration ran. Later calls are no-ops unless `force`
+        is set, in which case the tables are overwritten from the CSV files.
+        """
+        from .storage import _load_csv_file
+
+        with self._lock:
+            done = self._conn.execute(
+                "SELECT value FROM meta WHERE name = 'migrated_from_csv'"
+            ).fetchone()
+            if done and not force:
+                return False
+            with self._conn:
+                for key, table in TABLES.items():
+                    self._conn.execute(f"DELETE FROM {table}")
+                    self._insert_many(key, _load_csv_file(key))
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (name, value) VALUES ('migrated_from_csv', '1')"
+                )
+            return True
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -1,20 +1,72 @@
 """
 CSV storage and file operations.
+
+Full-table writes go through :func:`save_csv` (or :func:`save_tables` for
+several tables that must change together). Files are never rewritten in
+place: each table is written to a temp file beside it, fsynced and renamed
+over the original, so a crash leaves either the old or the new file. A group
+commit records its renames in a manifest first, and :func:`init_files`
+finishes an interrupted group on the next start; it can also carry journal
+records for a large table, so that table costs only its changed rows. Single-record changes can
+instead be appended to a per-table journal with :func:`log_change`; the
+journal is replayed by :func:`load_csv` and folded back into the base CSV by
+:func:`compact_journal` (in the background once it grows past
+``JOURNAL_COMPACT_THRESHOLD`` records, and at shutdown).
+
+Every parse and every full write also leaves a binary snapshot of the table
+under ``CACHE_DIR``; while the csv's size, modification time and content hash
+still match it, :func:`load_csv` reads the snapshot instead of parsing.
+
+When ``config.STORAGE_ENGINE`` is ``'sqlite'`` the same functions delegate to
+an engine object (see :mod:`backend.sqlite_storage`) instead of the CSV files.
 """
 
 import csv
+import gc
+import hashlib
+import json
+import locale
+import marshal
+import operator
 import os
+import re
 import sys
 import shutil
-from config import FILES, FIELDS, resource_path
+import struct
+import tempfile
+import threading
+from collections.abc import Mapping
+from itertools import chain, repeat
+from config import (
+    FILES, FIELDS, KEYS, JOURNAL_COMPACT_THRESHOLD, STORAGE_ENGINE, DB_FILE, COMMIT_MANIFEST, resource_path,
+    SNAPSHOT_CACHE, CACHE_DIR, PARALLEL_LOAD_MIN_BYTES, LAZY_LOAD_MIN_BYTES,
+)
+from .workers import get_pool
+from .lazycsv import LazyRows, release_files
+
+
+JOURNAL_OPS = ('insert', 'update', 'delete')
+
+# guards base csv + journal so a compaction never races an append
+_journal_lock = threading.RLock()
+# number of records appended to each journal since it was last compacted
+_journal_counts = {}
+
+# active storage engine; None means the csv files are the source of truth
+_engine = None
+
+# temp files are named '.<table file>.<random>.tmp' next to the table
+_TEMP_SUFFIX = '.tmp'
 
 
 def init_files():
     """Initialize CSV files with headers if they don't exist.
-    
+
     When running as a PyInstaller bundle, copies bundled CSV seed files
-    to the writable data directory on first run.
+    to the writable data directory on first run. A group commit cut short
+    by a crash is completed first.
     """
+    recover_commit()
     for key, filepath in FILES.items():
         if not os.path.exists(filepath):
             # if running frozen, try to copy the bundled seed csv first
@@ -24,35 +76,794 @@ def init_files():
                     shutil.copy2(bundled, filepath)
                     continue
             # otherwise create empty csv with headers
-            with open(filepath, 'w', newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=FIELDS[key])
-                writer.writeheader()
+            _replace_file(filepath, _write_temp(key, []))
+
+    if STORAGE_ENGINE == 'sqlite' and _engine is None:
+        from .sqlite_storage import SQLiteEngine
+        engine = SQLiteEngine(DB_FILE)
+        engine.migrate_from_csv()
+        set_engine(engine)
+
+
+def set_engine(engine):
+    """Route load/save/log_change through `engine` (None restores plain csv).
+
+    An engine provides ``load(key)``, ``save(key, data)``,
+    ``append(key, rows)`` and ``log_change(key, op, record, old_key)``, and
+    optionally ``save_many(tables, changes)`` to commit several at once.
+    """
+    global _engine
+    _engine = engine
+
+
+def get_engine():
+    """Return the active storage engine, or None when using csv files."""
+    return _engine
+
 
+def journal_path(key):
+    """Return the path of the change journal for table `key`."""
+    return FILES[key] + '.journal'
 
-def load_csv(key):
-    """Load data from CSV file."""
+
+def load_csv(key, lazy=False):
+    """Load data from CSV file, replaying any pending journal records.
+
+    With `lazy`, a csv file of at least LAZY_LOAD_MIN_BYTES with no journal
+    pending is returned as a :class:`~backend.lazycsv.LazyRows` that decodes
+    rows as they are read; otherwise (or with an engine active) the table is
+    loaded in full.
+    """
+    if _engine is not None:
+        return _engine.load(key)
+    if lazy:
+        with _journal_lock:
+            path = FILES[key]
+            if (os.path.exists(path) and os.path.getsize(path) >= LAZY_LOAD_MIN_BYTES
+                    and not os.path.exists(journal_path(key))):
+                return LazyRows(path, KEYS[key], locale.getpreferredencoding(False))
+    return _load_csv_file(key)
+
+
+def _load_csv_file(key):
+    """Read a table straight from its csv file (plus journal), bypassing any engine."""
     if not os.path.exists(FILES[key]):
         init_files()
-    with open(FILES[key], 'r', newline='') as f:
-        return list(csv.DictReader(f))
+    with _journal_lock:
+        data = _read_snapshot(key) if SNAPSHOT_CACHE else None
+        if data is None:
+            data = read_csv_parallel(FILES[key])
+            if SNAPSHOT_CACHE:
+                _write_snapshot(key, data)
+        if os.path.exists(journal_path(key)):
+            data = _replay_journal(key, data)
+    return data
+
+
+# --- fast csv parsing ---
+
+# characters read per block by FastDictReader
+_PARSE_BLOCK = 1 << 20
+
+# one line as text-mode iteration with newline='' yields it
+_LINE = re.compile(r'[^\r\n]*(?:\r\n|\r|\n)|[^\r\n]+')
+
+
+def _text_blocks(f, size):
+    """Yield `f` in blocks of whole '\n'-terminated lines (the last may be unterminated)."""
+    tail = ''
+    while True:
+        chunk = f.read(size)
+        if not chunk:
+            if tail:
+                yield tail
+            return
+        chunk = tail + chunk
+        cut = chunk.rfind('\n') + 1
+        tail = chunk[cut:]
+        if cut:
+            yield chunk[:cut]
+
+
+def _plain(text):
+    """True if `text` can be split on commas and line ends exactly like csv would."""
+    return '"' not in text and '\0' not in text and text.count('\r') == text.count('\r\n')
+
+
+def _record_batches(blocks):
+    """Yield lists of the records ``csv.reader`` would return for `blocks`.
+
+    Blocks without quotes are split in bulk. From the first block that has
+    quotes (or stray ``\r`` line breaks) on, plain lines are still split
+    directly and only the other lines go through csv, which reads on into
+    the following lines for a quoted newline.
+    """
+    for block in blocks:
+        if _plain(block):
+            lines = block.replace('\r\n', '\n').split('\n') if '\r' in block else block.split('\n')
+            if not lines[-1]:
+                lines.pop()
+            yield [line.split(',') if line else [] for line in lines]
+            continue
+        lines = chain.from_iterable(_LINE.findall(b) for b in chain([block], blocks))
+        batch = []
+        for line in lines:
+            if _plain(line):
+                line = line.rstrip('\r\n')
+                batch.append(line.split(',') if line else [])
+            else:
+                batch.append(next(csv.reader(chain([line], lines))))
+            if len(batch) >= 10000:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+        return
+
+
+def _dicts(names, records):
+    """``csv.DictReader`` rows for header `names` and parsed `records`, skipping empty ones."""
+    width = len(names)
+    if width and all(map(width.__eq__, map(len, records))):
+        return _build_rows(names, records)
+    # some record is empty, short or long
+    rows = []
+    for values in records:
+        if not values:
+            continue
+        row = dict(zip(names, values))
+        if width < len(values):
+            row[None] = values[width:]
+        elif width > len(values):
+            for name in names[len(values):]:
+                row[name] = None
+        rows.append(row)
+    return rows
+
+
+class FastDictReader:
+    """``csv.DictReader`` for the default dialect, tuned for unquoted files.
+
+    Reads `f` (opened with ``newline=''``) in large blocks and splits
+    unquoted lines with ``str.split`` instead of csv's quoting state machine;
+    quoted lines are still parsed by csv. Rows are exactly what
+    ``csv.DictReader(f)`` yields: short rows are padded with None and extra
+    values are listed under the None key. `chars_read` counts the characters
+    consumed so far, for progress reporting.
+    """
+
+    def __init__(self, f):
+        self.chars_read = 0
+        self._batches = _record_batches(self._blocks(f))
+        self._records = iter(())
+        self._fieldnames = False  # not read yet
+        self._rows = None
+
+    def _blocks(self, f):
+        for block in _text_blocks(f, _PARSE_BLOCK):
+            self.chars_read += len(block)
+            yield block
+
+    @property
+    def fieldnames(self):
+        if self._fieldnames is False:
+            # like DictReader the header is the first record, even an empty one
+            self._fieldnames = None
+            for batch in self._batches:
+                if batch:
+                    self._fieldnames = batch[0]
+                    self._records = iter(batch[1:])
+                    break
+        return self._fieldnames
+
+    def _row_batches(self):
+        if self.fieldnames is None:
+            return
+        yield _dicts(self.fieldnames, list(self._records))
+        for batch in self._batches:
+            yield _dicts(self.fieldnames, batch)
+
+    def _remaining(self):
+        # one row stream for the reader's lifetime, so partial reads (e.g.
+        # islice chunks) pick up where the last one stopped, as with DictReader
+        if self._rows is None:
+            self._rows = chain.from_iterable(self._row_batches())
+        return self._rows
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._remaining())
+
+    def read_all(self):
+        """All remaining rows as a list."""
+        # millions of fresh dicts would set off pointless collections
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return list(self._remaining())
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+
+# --- parallel parsing of large files ---
+
+def _parse_range(path, begin, end, encoding):
+    """Parse bytes `begin`..`end` of `path` (whole lines); return its non-empty records marshalled.
+
+    Marshal data loads in the parent about twice as fast as a pickled result.
+    Returns None if the range holds a quote, since a quoted field may span
+    the range boundaries.
+    """
+    gc.disable()
+    try:
+        with open(path, 'rb') as f:
+            f.seek(begin)
+            data = f.read(end - begin)
+        if b'"' in data:
+            return None
+        text = data.decode(encoding)
+        return marshal.dumps([r for batch in _record_batches(iter([text])) for r in batch if r])
+    finally:
+        gc.enable()
+
+
+def _line_ranges(f, start, size, parts):
+    """Split bytes `start`..`size` of `f` into about `parts` ranges ending on a newline."""
+    bounds = [start]
+    for i in range(1, parts):
+        f.seek(max(start + (size - start) * i // parts, bounds[-1]))
+        f.readline()  # on to the start of the next line
+        if f.tell() >= size:
+            break
+        if f.tell() > bounds[-1]:
+            bounds.append(f.tell())
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def read_csv_parallel(path, workers=None):
+    """Read csv `path` into rows like ``list(csv.DictReader(f))``, parsing across processes.
+
+    Files of at least PARALLEL_LOAD_MIN_BYTES without quotes are cut into
+    newline-aligned byte ranges that a process pool parses, and the rows are
+    merged back in file order. Smaller or quoted files, single-core machines
+    and any failure of the pool fall back to :class:`FastDictReader` in this
+    process. `workers` overrides the number of ranges (default: one per core).
+    """
+    encoding = locale.getpreferredencoding(False)
+    workers = workers or os.cpu_count() or 1
+    try:
+        if workers >= 2 and os.path.getsize(path) >= PARALLEL_LOAD_MIN_BYTES and '\n'.encode(encoding) == b'\n':
+            rows = _read_ranges(path, workers, encoding)
+            if rows is not None:
+                return rows
+    except Exception:
+        pass  # e.g. a broken pool or a platform without process support
+    with open(path, 'r', newline='') as f:
+        return FastDictReader(f).read_all()
+
+
+def _read_ranges(path, workers, encoding):
+    """The rows of `path` parsed in `workers` byte ranges, or None if it can't be cut safely."""
+    with open(path, 'rb') as f:
+        header = f.readline()
+        # a quoted field may hold a newline (and a header may be quoted or blank)
+        if b'"' in header or not header.strip(b'\r\n') or b'\r' in header.rstrip(b'\r\n'):
+            return None
+        size = os.fstat(f.fileno()).st_size
+        ranges = _line_ranges(f, len(header), size, workers)
+    names = header.decode(encoding).rstrip('\r\n').split(',')
+    pool = get_pool()
+    # millions of fresh dicts would set off pointless collections
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        futures = [pool.submit(_parse_range, path, begin, end, encoding) for begin, end in ranges]
+        parts = [future.result() for future in futures]
+        if None in parts:
+            return None  # a quoted field; parse the file in one piece
+        rows = []
+        for part in parts:
+            rows.extend(_dicts(names, marshal.loads(part)))
+        return rows
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+# --- binary snapshots of parsed tables ---
+
+# bump when the snapshot layout changes; marshal data is also tied to the
+# Python version that wrote it
+_SNAPSHOT_FORMAT = (1,) + tuple(sys.version_info[:2])
+# a snapshot file is this length prefix, the marshalled
+# (format, csv size, csv mtime_ns, csv digest) and then the marshalled rows
+_SNAPSHOT_PREFIX = struct.Struct('<I')
+
+
+def snapshot_path(key):
+    """Return the path of the binary snapshot of table `key`."""
+    return os.path.join(CACHE_DIR, os.path.basename(FILES[key]) + '.snapshot')
+
+
+def _file_digest(path):
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        st = os.fstat(f.fileno())
+        while True:
+            chunk = f.read(1 << 20)
+            if not chunk:
+                break
+            h.update(chunk)
+    return st.st_size, st.st_mtime_ns, h.hexdigest()
+
+
+def _build_rows(header, rows):
+    """DictReader-equal dicts of `rows`, each a full-width sequence of values for `header`."""
+    return list(map(dict, map(zip, repeat(header), rows)))
+
+
+def _read_snapshot(key):
+    """The table as parsed from its csv, if a still-valid snapshot exists, else None."""
+    try:
+        with open(snapshot_path(key), 'rb') as f:
+            (meta_size,) = _SNAPSHOT_PREFIX.unpack(f.read(_SNAPSHOT_PREFIX.size))
+            fmt, size, mtime_ns, digest = marshal.loads(f.read(meta_size))
+            if fmt != _SNAPSHOT_FORMAT:
+                return None
+            st = os.stat(FILES[key])
+            if (st.st_size, st.st_mtime_ns) != (size, mtime_ns):
+                return None
+            if _file_digest(FILES[key]) != (size, mtime_ns, digest):
+                return None
+            # one read: marshal.load on a file object reads in tiny pieces
+            blob = f.read()
+    except (OSError, EOFError, ValueError, TypeError, struct.error):
+        return None
+    # millions of fresh tuples and dicts would set off pointless collections
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        header, rows = marshal.loads(blob)
+        del blob
+        if header is None or not rows:
+            return rows  # irregular rows are kept as dicts
+        return _build_rows(header, rows)
+    except (EOFError, ValueError, TypeError):
+        return None
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def _write_snapshot(key, data):
+    """Snapshot `data`, the rows just parsed from the table's csv."""
+    header = tuple(data[0]) if data else ()
+    if all(tuple(r) == header for r in data):
+        _store_snapshot(key, list(header), [tuple(r.values()) for r in data])
+    else:
+        # irregular rows (short, or with extra values under the None key)
+        _store_snapshot(key, None, data)
+
+
+def _cell(value):
+    """A value as csv.writer writes it and csv.reader reads it back."""
+    if value is None:
+        return ''
+    return value if value.__class__ is str else str(value)
+
+
+def _snapshot_saved(key, data):
+    """Snapshot a table just written from `data` by :func:`_write_temp`."""
+    fields = FIELDS[key]
+    rows = None
+    try:
+        # fast path: every row has every field and every value is a str
+        values = operator.itemgetter(*fields)
+        rows = [values(r) for r in data]
+        if len(fields) == 1:
+            rows = [(v,) for v in rows]
+        if set(map(type, chain.from_iterable(rows))) - {str}:
+            rows = None
+    except (KeyError, TypeError, IndexError):
+        pass
+    if rows is None:
+        rows = [tuple([_cell(r.get(f, '')) for f in fields]) for r in data if isinstance(r, Mapping)]
+    _store_snapshot(key, list(fields), rows)
+
+
+def _store_snapshot(key, header, rows):
+    """Write the snapshot of table `key` for the csv as it is on disk now.
+
+    Failures are ignored: the snapshot is only a cache.
+    """
+    temp = None
+    try:
+        meta = marshal.dumps((_SNAPSHOT_FORMAT,) + _file_digest(FILES[key]))
+        body = marshal.dumps((header, rows))
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, temp = tempfile.mkstemp(prefix=f".{os.path.basename(FILES[key])}.", suffix=_TEMP_SUFFIX, dir=CACHE_DIR)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_SNAPSHOT_PREFIX.pack(len(meta)))
+            f.write(meta)
+            f.write(body)
+        os.replace(temp, snapshot_path(key))
+    except Exception:
+        if temp is not None:
+            _remove_quietly(temp)
 
 
 def save_csv(key, data):
-    """Save data to CSV file."""
-    with open(FILES[key], 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=FIELDS[key])
-        writer.writeheader()
+    """Save data to CSV file.
+
+    A full rewrite supersedes the journal, so any pending records are dropped.
+    """
+    if _engine is not None:
+        _engine.save(key, data)
+        return
+    _save_csv_file(key, data)
+
+
+def save_tables(tables, changes=None):
+    """Save several tables as one unit: after a crash either all or none changed.
+
+    `tables` maps a table key to its full data, e.g. the programs and
+    colleges rewritten by a cascading delete. `changes` maps a table key to
+    ``(op, record, old_key)`` journal records committed in the same unit
+    (see :func:`log_change`), e.g. the students a cascade edited, so a large
+    table costs only its changed rows. Changes to a table that is also in
+    `tables` are ignored: its full data supersedes them.
+    """
+    changes = {key: entries for key, entries in (changes or {}).items() if entries and key not in tables}
+    if _engine is not None:
+        save_many = getattr(_engine, 'save_many', None)
+        if save_many is not None:
+            save_many(tables, changes)
+        else:
+            for key, data in tables.items():
+                _engine.save(key, data)
+            for key, entries in changes.items():
+                for op, record, old_key in entries:
+                    _engine.log_change(key, op, record, old_key)
+        return
+    _save_csv_files(tables, changes)
+
+
+def _save_csv_file(key, data):
+    """Rewrite a table's csv file and drop its journal, bypassing any engine."""
+    _save_csv_files({key: data})
+
+
+def _save_csv_files(tables, changes=None):
+    """Atomically rewrite the csv files of `tables`, dropping their journals,
+    and extend the journals of `changes` in the same commit."""
+    changes = changes or {}
+    with _journal_lock:
+        temps = {}
+        journals = {}
         try:
-            writer.writerows(data)
+            for key, data in tables.items():
+                temps[key] = _write_temp(key, data)
+            for key, entries in changes.items():
+                journals[key] = _write_journal_temp(key, entries)
+        except BaseException:
+            for temp in chain(temps.values(), journals.values()):
+                _remove_quietly(temp)
+            raise
+        if os.name == 'nt':
+            # Windows can't replace a file that is still memory-mapped
+            release_files([FILES[key] for key in temps])
+        renames = {key: [temp, FILES[key]] for key, temp in temps.items()}
+        # journal renames aren't keyed by table, so applying them keeps the journal
+        renames.update({f"{key}.journal": [temp, journal_path(key)] for key, temp in journals.items()})
+        if len(renames) == 1 and not any(os.path.exists(journal_path(key)) for key in temps):
+            # a single rename is atomic by itself; no manifest needed
+            temp, target = next(iter(renames.values()))
+            _replace_file(target, temp)
+        elif renames:
+            # from here on the manifest makes the group roll forward on restart,
+            # including dropping journals the new files already contain
+            _write_manifest(renames)
+            _apply_manifest()
+        for key in temps:
+            _discard_journal(key)
+        full = []
+        for key, entries in changes.items():
+            count = _journal_counts.get(key, 0) + len(entries)
+            _journal_counts[key] = count
+            if count >= JOURNAL_COMPACT_THRESHOLD:
+                full.append(key)
+        if SNAPSHOT_CACHE:
+            for key, data in tables.items():
+                _snapshot_saved(key, data)
+    if full:
+        compact_journals_async(full)
+
+
+def _write_temp(key, data):
+    """Write table `key` to a synced temp file beside its csv and return its path."""
+    target = FILES[key]
+    fd, temp = tempfile.mkstemp(
+        prefix=f".{os.path.basename(target)}.", suffix=_TEMP_SUFFIX,
+        dir=os.path.dirname(target) or '.',
+    )
+    try:
+        with os.fdopen(fd, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS[key])
+            writer.writeheader()
+            try:
+                writer.writerows(data)
+            except Exception:
+                # fail-safe: start over with rows that are dict-like only
+                f.seek(0)
+                f.truncate()
+                writer.writeheader()
+                writer.writerows(r for r in data if isinstance(r, Mapping))
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        _remove_quietly(temp)
+        raise
+    return temp
+
+
+def _journal_row(key, op, record, old_key=None):
+    """The journal line (as a list of values) for one change; see :func:`log_change`."""
+    if op not in JOURNAL_OPS:
+        raise ValueError(f"Unknown journal op: {op}")
+    pk = record.get(KEYS[key], '')
+    row = [op, pk if old_key is None else old_key]
+    if op != 'delete':
+        row.extend(record.get(field, '') for field in FIELDS[key])
+    return row
+
+
+def _write_journal_temp(key, entries):
+    """Write the table's journal plus `entries` to a synced temp file beside it and return its path."""
+    target = journal_path(key)
+    rows = [_journal_row(key, op, record, old_key) for op, record, old_key in entries]
+    fd, temp = tempfile.mkstemp(
+        prefix=f".{os.path.basename(target)}.", suffix=_TEMP_SUFFIX,
+        dir=os.path.dirname(target) or '.',
+    )
+    try:
+        with os.fdopen(fd, 'w', newline='') as f:
+            if os.path.exists(target):
+                with open(target, 'r', newline='') as journal:
+                    pending = journal.read()
+                # a torn last line must not swallow the first new record
+                if pending and not pending.endswith('\n'):
+                    pending += '\r\n'
+                f.write(pending)
+            csv.writer(f).writerows(rows)
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        _remove_quietly(temp)
+        raise
+    return temp
+
+
+def _replace_file(target, temp):
+    """Rename `temp` over `target` and make the rename durable."""
+    os.replace(temp, target)
+    _fsync_dir(os.path.dirname(target))
+
+
+def _fsync_dir(path):
+    """Flush a directory entry change to disk (a no-op where unsupported)."""
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    try:
+        fd = os.open(path or '.', os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _write_manifest(renames):
+    """Durably record a group commit's `{key: [temp, target]}` renames."""
+    fd, temp = tempfile.mkstemp(
+        prefix=f".{os.path.basename(COMMIT_MANIFEST)}.", suffix=_TEMP_SUFFIX,
+        dir=os.path.dirname(COMMIT_MANIFEST) or '.',
+    )
+    with os.fdopen(fd, 'w') as f:
+        json.dump(renames, f)
+        f.flush()
+        os.fsync(f.fileno())
+    _replace_file(COMMIT_MANIFEST, temp)
+
+
+def _apply_manifest():
+    """Perform (or finish) the renames recorded in the manifest, then drop it."""
+    with open(COMMIT_MANIFEST, 'r') as f:
+        renames = json.load(f)
+    for key, (temp, target) in renames.items():
+        # a temp already renamed before a crash is simply gone
+        if os.path.exists(temp):
+            os.replace(temp, target)
+    _fsync_dir(os.path.dirname(COMMIT_MANIFEST))
+    for key in renames:
+        if key in FILES:
+            _discard_journal(key)
+    os.remove(COMMIT_MANIFEST)
+    _fsync_dir(os.path.dirname(COMMIT_MANIFEST))
+
+
+def recover_commit():
+    """Finish a group commit interrupted by a crash and clear stray temp files.
+
+    Called by :func:`init_files`. Temp files not named by a manifest belong to
+    a write that never committed, so the original files are still current.
+    """
+    with _journal_lock:
+        if os.path.exists(COMMIT_MANIFEST):
+            try:
+                _apply_manifest()
+            except ValueError:
+                # the manifest is written atomically, but never trust a bad one
+                os.remove(COMMIT_MANIFEST)
+        dirs = {os.path.dirname(p) or '.' for p in list(FILES.values()) + [COMMIT_MANIFEST]} | {CACHE_DIR}
+        names = {os.path.basename(p) for p in list(FILES.values()) + [COMMIT_MANIFEST]}
+        for d in dirs:
+            try:
+                entries = os.listdir(d)
+            except OSError:
+                continue
+            for entry in entries:
+                if not (entry.startswith('.') and entry.endswith(_TEMP_SUFFIX)):
+                    continue
+                if any(entry.startswith(f".{name}.") for name in names):
+                    _remove_quietly(os.path.join(d, entry))
+
+
+def log_change(key, op, record, old_key=None):
+    """Append a single insert/update/delete record to the table's journal.
+
+    `record` is the full row after the change (for deletes only its primary
+    key is used). Pass `old_key` when an update renames the primary key.
+    Costs one small append instead of rewriting the whole CSV.
+    """
+    if op not in JOURNAL_OPS:
+        raise ValueError(f"Unknown journal op: {op}")
+    if _engine is not None:
+        _engine.log_change(key, op, record, old_key)
+        return
+    row = _journal_row(key, op, record, old_key)
+    with _journal_lock:
+        with open(journal_path(key), 'a', newline='') as f:
+            csv.writer(f).writerow(row)
+        count = _journal_counts.get(key, 0) + 1
+        _journal_counts[key] = count
+    if count >= JOURNAL_COMPACT_THRESHOLD:
+        compact_journals_async([key])
+
+
+def append_csv(key, rows):
+    """Append new records to a table without rewriting what is already stored.
+
+    Journal records are replayed on top of the base csv, so rows appended
+    behind a pending journal would read as older than its records (e.g. an
+    import of a key deleted earlier would be deleted again). A pending
+    journal is therefore folded in, together with the new rows, first.
+    """
+    if _engine is not None:
+        _engine.append(key, rows)
+        return
+    if not os.path.exists(FILES[key]):
+        init_files()
+    with _journal_lock:
+        if os.path.exists(journal_path(key)):
+            fields = FIELDS[key]
+            new = [{f: r.get(f, '') for f in fields} for r in rows]
+            _save_csv_file(key, _load_csv_file(key) + new)
+            return
+        with open(FILES[key], 'a', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS[key], extrasaction='ignore')
+            writer.writerows(rows)
+
+
+def compact_journal(key):
+    """Fold the table's journal into its base CSV and remove the journal."""
+    with _journal_lock:
+        if not os.path.exists(journal_path(key)):
+            _journal_counts.pop(key, None)
+            return
+        _save_csv_file(key, _load_csv_file(key))
+
+
+def compact_journals(keys=None):
+    """Compact the journals of `keys` (default: every table). Call at shutdown."""
+    for key in (keys or FILES):
+        try:
+            compact_journal(key)
         except Exception:
-            # fail-safe: write rows that are dict-like only
-            safe_rows = []
-            for r in data:
-                if isinstance(r, dict):
-                    safe_rows.append(r)
-            writer.writerows(safe_rows)
+            import traceback
+            traceback.print_exc()
+
+
+def compact_journals_async(keys=None):
+    """Compact journals on a background thread and return the thread.
+
+    The thread is non-daemon so the interpreter waits for an in-progress
+    rewrite instead of cutting it short at exit.
+    """
+    # reset the counters now so further appends don't spawn duplicate workers
+    with _journal_lock:
+        for key in (keys or FILES):
+            _journal_counts[key] = 0
+    t = threading.Thread(target=compact_journals, args=(keys,), name="journal-compactor")
+    t.start()
+    return t
+
+
+def _discard_journal(key):
+    """Remove the table's journal after its records reached the base CSV."""
+    try:
+        os.remove(journal_path(key))
+    except FileNotFoundError:
+        pass
+    _journal_counts.pop(key, None)
+
+
+def _replay_journal(key, data, path=None):
+    """Apply journal records for `key` on top of `data` and return the result.
+
+    Records keep their original position; inserts of unknown keys append.
+    `path` reads a copy of the journal instead (e.g. one pinned for a backup).
+    """
+    fields = FIELDS[key]
+    pk = KEYS[key]
+    rows = list(data)
+    positions = {}
+    for i, r in enumerate(rows):
+        positions.setdefault(r.get(pk, ''), i)
+
+    applied = 0
+    with open(path or journal_path(key), 'r', newline='') as f:
+        for entry in csv.reader(f):
+            op = entry[0] if entry else None
+            if op not in JOURNAL_OPS or len(entry) != (2 if op == 'delete' else len(fields) + 2):
+                # tolerate a torn last line from an interrupted append
+                continue
+            applied += 1
+            target = entry[1]
+            pos = positions.pop(target, None)
+            if op == 'delete':
+                if pos is not None:
+                    rows[pos] = None
+                continue
+            record = dict(zip(fields, entry[2:]))
+            new_key = record[pk]
+            if pos is None:
+                # insert of a new key, or update of a row we never saw
+                pos = positions.get(new_key)
+                if pos is None:
+                    rows.append(record)
+                    pos = len(rows) - 1
+            rows[pos] = record
+            positions[new_key] = pos
+    if path is None:
+        _journal_counts[key] = applied
+    return [r for r in rows if r is not None]
 
 
-def create_backups():
-    """Create backup of all CSV files (placeholder for future implementation)."""
-    pass
+def create_backups(reason='manual'):
+    """Snapshot every table; see :func:`backend.backups.create_backups`."""
+    from .backups import create_backups as _create_backups
+    return _create_backups(reason)
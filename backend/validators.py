@@ -5,6 +5,11 @@ Data validation functions for students, programs, and colleges.
 import re
 
 
+# compiled once instead of on every call
+_STUDENT_ID = re.compile(r'^202\d-\d{4}$')
+_DIGIT = re.compile(r'\d')
+
+
 def validate_student(record):
     """Validate a student record dict. Returns (True, '') or (False, 'error')."""
     required = ['id', 'firstname', 'lastname', 'gender', 'year', 'program']
@@ -13,11 +18,11 @@ def validate_student(record):
             return False, f"Missing field: {k}"
 
     # id must match format 202x-xxxx (e.g. 2023-0001)
-    if not re.match(r'^202\d-\d{4}$', record.get('id', '')):
+    if not _STUDENT_ID.match(record.get('id', '')):
         return False, "Student ID must follow the format 202X-XXXX (e.g. 2024-0001)"
 
     # names should not contain digits
-    if re.search(r'\d', record.get('firstname', '')) or re.search(r'\d', record.get('lastname', '')):
+    if _DIGIT.search(record.get('firstname', '')) or _DIGIT.search(record.get('lastname', '')):
         return False, "Names cannot contain numbers"
 
     return True, ""
@@ -30,7 +35,7 @@ def validate_program(record):
         if not record.get(k):
             return False, f"Missing field: {k}"
 
-    if re.search(r'\d', record.get('name', '')):
+    if _DIGIT.search(record.get('name', '')):
         # allow digits in codes but not in names
         return False, "Program name cannot contain numbers"
 
@@ -44,7 +49,44 @@ def validate_college(record):
         if not record.get(k):
             return False, f"Missing field: {k}"
 
-    if re.search(r'\d', record.get('name', '')):
+    if _DIGIT.search(record.get('name', '')):
         return False, "College name cannot contain numbers"
 
     return True, ""
+
+
+VALIDATORS = {
+    'student': validate_student,
+    'program': validate_program,
+    'college': validate_college,
+}
+
+def validate_batch(kind, records, start=2):
+    """Validate many `kind` records and return their (row_num, error) pairs in row order.
+
+    Rows are numbered from `start` (2 = first data line of a csv with a
+    header). Validation runs in this process: shipping the rows to worker
+    processes costs as much pickling as validating them here.
+    """
+    validate = VALIDATORS[kind]
+    errors = []
+    for row_num, record in enumerate(records, start):
+        ok, msg = validate(record)
+        if not ok:
+            errors.append((row_num, msg))
+    return errors
+
+
+def validate_students_batch(records, start=2):
+    """Batch form of :func:`validate_student`; see :func:`validate_batch`."""
+    return validate_batch('student', records, start)
+
+
+def validate_programs_batch(records, start=2):
+    """Batch form of :func:`validate_program`; see :func:`validate_batch`."""
+    return validate_batch('program', records, start)
+
+
+def validate_colleges_batch(records, start=2):
+    """Batch form of :func:`validate_college`; see :func:`validate_batch`."""
+    return validate_batch('college', records, start)
@@ -0,0 +1,31 @@
+"""
+Shared worker process pool.
+
+Parallel csv parsing fans work out to a
+:class:`~concurrent.futures.ProcessPoolExecutor`, started on first use and
+shut down when the interpreter exits.
+"""
+
+import atexit
+
+
+_pool = None
+
+
+def get_pool():
+    """Return the shared process pool, starting it if needed."""
+    global _pool
+    if _pool is None:
+        from concurrent.futures import ProcessPoolExecutor
+        _pool = ProcessPoolExecutor()
+        atexit.register(shutdown_pool)
+    return _pool
+
+
+def shutdown_pool():
+    """Stop the pool's worker processes; the next :func:`get_pool` starts a new one."""
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        atexit.unregister(shutdown_pool)
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -67,10 +67,75 @@ FIELDS = {
     'user': ['username', 'salt', 'password'],
 }
 
+# primary key column of each table
+KEYS = {
+    'college': 'code',
+    'program': 'code',
+    'student': 'id',
+    'user': 'username',
+}
+
+# single-record changes are appended to '<file>.journal' and folded back into
+# the base csv once this many records have accumulated (or at shutdown)
+JOURNAL_COMPACT_THRESHOLD = 500
+
+# a multi-table save (e.g. a cascading delete) records its pending renames
+# here so an interrupted commit is finished on the next start
+COMMIT_MANIFEST = data_path('.nexo-commit.json')
+
+# parsed tables are cached here in a binary form that loads much faster than
+# the csv; a cache file is only used while its csv is byte-for-byte unchanged
+SNAPSHOT_CACHE = True
+CACHE_DIR = data_path('.cache')
+
+# csv files of at least this many bytes are parsed across a process pool
+# (see backend.storage.read_csv_parallel)
+PARALLEL_LOAD_MIN_BYTES = 32 * 1024 * 1024
+
+# a students csv of at least this many bytes is memory-mapped and its rows
+# decoded as they are read (see backend.lazycsv)
+LAZY_LOAD_MIN_BYTES = 64 * 1024 * 1024
+
+# --- backups ---
+# compressed snapshots of every table; only the newest BACKUP_KEEP are kept
+BACKUP_DIR = data_path('backups')
+BACKUP_KEEP = 20
+# the app snapshots the tables this often while running
+BACKUP_INTERVAL_MS = 30 * 60 * 1000
+
+# rows validated per step of a background import (progress is reported and
+# cancellation checked between steps)
+IMPORT_CHUNK_SIZE = 20000
+
+# keep students in memory as compact slotted records (backend.records)
+# instead of one dict per row
+COMPACT_STUDENT_RECORDS = True
+
+# from this many students on, full recounts use the NumPy columns of
+# backend.columnar (smaller tables aren't worth importing NumPy at startup)
+COLUMNAR_MIN_ROWS = 50000
+
+# --- storage engine ---
+# 'csv' keeps the flat files above as the source of truth; 'sqlite' moves the
+# tables into DB_FILE (migrated once from the csv files on first start)
+STORAGE_ENGINE = 'csv'
+DB_FILE = data_path('nexo.db')
+
 # --- window dimensions ---
 WINDOW_WIDTH = 1400
 WINDOW_HEIGHT = 940
 
+# --- search ---
+# keystrokes closer together than this are coalesced into one search
+SEARCH_DEBOUNCE_MS = 120
+# how often the dashboard checks for a finished background search
+SEARCH_POLL_MS = 15
+
+# --- views ---
+# the dashboard builds each view on first show; this long after startup it
+# builds the others in the background, one per step (None turns that off)
+VIEW_PREWARM_DELAY_MS = 800
+
 # --- chart colors --- subtle purple palette
 COLOR_PALETTE = [
     '#5a4a7a',  # subtle muted purple (primary)
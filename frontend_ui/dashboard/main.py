@@ -4,6 +4,8 @@ Dashboard main frame and navigation for nexo.
 
 import customtkinter as ctk
 import tkinter as tk
+import queue
+import threading
 
 
 # optional plotting libraries removed from top-level to avoid extra dependency
@@ -11,10 +13,11 @@ import tkinter as tk
 
 from config import (
     BG_COLOR, PANEL_COLOR, ACCENT_COLOR, TEXT_MUTED, BORDER_COLOR, 
-    FONT_MAIN, FONT_BOLD, COLOR_PALETTE, get_font, TEXT_PRIMARY, THEME_MANAGER
+    FONT_MAIN, FONT_BOLD, COLOR_PALETTE, get_font, TEXT_PRIMARY, THEME_MANAGER,
+    SEARCH_DEBOUNCE_MS, SEARCH_POLL_MS, VIEW_PREWARM_DELAY_MS
 )
 from frontend_ui.ui import DepthCard, get_icon, get_main_logo
-from backend import create_backups
+from backend import create_backups_async
 from frontend_ui.auth import LoginFrame
 
 
@@ -26,6 +29,14 @@ class DashboardFrame(ctk.CTkFrame):
         self.controller = controller
         self.current_view = None
 
+        # search scheduler state: only the newest generation is ever shown
+        self._search_generation = 0
+        self._search_after_id = None
+        self._search_poll_id = None
+        self._search_requests = queue.Queue()
+        self._search_results = queue.Queue()
+        self._search_worker = None
+
         # lazy-import views here (not at module level) so matplotlib/numpy
         # are not loaded until the dashboard is actually constructed.
         from frontend_ui.views.students import StudentsView
@@ -60,14 +71,18 @@ class DashboardFrame(ctk.CTkFrame):
         self.content_area.grid_rowconfigure(0, weight=1)
         self.content_area.grid_columnconfigure(0, weight=1)
 
-        # create views
+        # views are built on first show (see get_view); only the first one
+        # is built before the window paints
         self.views = {}
-        for V in (self._StudentsView, self._ProgramsView, self._CollegesView):
-            view = V(self.content_area, controller)
-            self.views[V] = view
-            view.grid(row=0, column=0, sticky="nsew")
-
         self.show_view(self._StudentsView)
+        self._prewarm_id = None
+        if VIEW_PREWARM_DELAY_MS is not None:
+            self._prewarm_id = self.after(VIEW_PREWARM_DELAY_MS, self._prewarm_views)
+
+        # patch the visible view after data changes, once per batch of changes
+        self._data_refresh_id = None
+        self._pending_events = []
+        controller.store.subscribe(self._on_data_changed)
 
     def create_topbar(self):
         """Create unified top navigation bar with logo, text, tabs, and controls."""
@@ -271,29 +286,10 @@ class DashboardFrame(ctk.CTkFrame):
             self.import_btn.configure(state="normal", fg_color=ACCENT_COLOR)
     
     def handle_refresh(self):
-        """Refresh the current view's data from disk and update table + sidebar."""
-        from backend import load_csv
-        try:
-            self.controller.colleges = load_csv('college')
-        except Exception:
-            pass
-        try:
-            self.controller.programs = load_csv('program')
-        except Exception:
-            pass
-        try:
-            self.controller.students = load_csv('student')
-        except Exception:
-            pass
-        if self.current_view and self.current_view in self.views:
-            view = self.views[self.current_view]
-            view.refresh_table()
-            if hasattr(view, 'refresh_sidebar'):
-                try:
-                    view.refresh_sidebar()
-                except Exception:
-                    pass
-            self.search_entry.delete(0, "end")
+        """Reload the data from disk; the store listener redraws the current view."""
+        self.controller.store.load()
+        self._cancel_search()
+        self.search_entry.delete(0, "end")
     
     def handle_import(self):
         """Handle import button - delegates to current view."""
@@ -314,15 +310,61 @@ class DashboardFrame(ctk.CTkFrame):
             return
         
         if self.current_view == self._StudentsView:
-            self.views[self._StudentsView].add_student()
+            self.get_view(self._StudentsView).add_student()
         elif self.current_view == self._ProgramsView:
-            self.views[self._ProgramsView].add_program()
+            self.get_view(self._ProgramsView).add_program()
         elif self.current_view == self._CollegesView:
-            self.views[self._CollegesView].add_college()
+            self.get_view(self._CollegesView).add_college()
+
+    def _on_data_changed(self, event):
+        """Store subscriber: queue the event and patch the current view once per burst."""
+        self._pending_events.append(event)
+        if self._data_refresh_id is None:
+            self._data_refresh_id = self.after_idle(self._refresh_current_view)
+
+    def _refresh_current_view(self):
+        self._data_refresh_id = None
+        events, self._pending_events = self._pending_events, []
+        if self.controller.store.version == self._rendered_version:
+            return
+        if self.current_view and self.current_view in self.views:
+            view = self.views[self.current_view]
+            # hidden views rebuild in full when shown, so only the visible one is patched
+            if hasattr(view, 'apply_changes'):
+                view.apply_changes(events)
+            else:
+                view.refresh_table()
+            self._rendered_version = self.controller.store.version
+
+    def get_view(self, view_class):
+        """Return the view of `view_class`, building it on first use."""
+        view = self.views.get(view_class)
+        if view is None:
+            view = view_class(self.content_area, self.controller)
+            view.grid(row=0, column=0, sticky="nsew")
+            self.views[view_class] = view
+            # a newer sibling stacks on top: keep the current view in front
+            if self.current_view in self.views and self.current_view is not view_class:
+                self.views[self.current_view].tkraise()
+        return view
+
+    def _prewarm_views(self):
+        """Build the next view that hasn't been shown yet, then schedule the one after."""
+        self._prewarm_id = None
+        for view_class in (self._StudentsView, self._ProgramsView, self._CollegesView):
+            if view_class not in self.views:
+                try:
+                    self.get_view(view_class)
+                except Exception:
+                    import traceback
+                    traceback.print_exc()
+                    return
+                self._prewarm_id = self.after(VIEW_PREWARM_DELAY_MS, self._prewarm_views)
+                return
 
     def show_view(self, view_class):
-        """Show a specific view."""
-        view = self.views[view_class]
+        """Show a specific view, building it first if needed."""
+        view = self.get_view(view_class)
         view.tkraise()
         self.current_view = view_class
 
@@ -337,9 +379,13 @@ class DashboardFrame(ctk.CTkFrame):
         self.update_title_card(view_class)
         
         # clear search on view change
+        self._cancel_search()
         self.search_entry.delete(0, "end")
         
-        self.views[view_class].refresh_table()
+        view.refresh_table()
+        if hasattr(view, 'update_sidebar'):
+            view.update_sidebar()
+        self._rendered_version = self.controller.store.version
     
     def update_title_card(self, view_class):
         """Update title card label and button based on active view."""
@@ -351,14 +397,78 @@ class DashboardFrame(ctk.CTkFrame):
             self.title_label.configure(text="Colleges")
 
     def handle_search_dynamic(self, event):
-        """Filter current view's table based on search query."""
+        """Schedule a search of the current view after typing pauses."""
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+        self._search_after_id = self.after(SEARCH_DEBOUNCE_MS, self._run_search)
+
+    def _cancel_search(self):
+        """Forget pending and running searches so their results are never shown."""
+        self._search_generation += 1
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+            self._search_after_id = None
+        if self._search_poll_id is not None:
+            self.after_cancel(self._search_poll_id)
+            self._search_poll_id = None
+
+    def _run_search(self):
+        """Start the search for the current query; older searches become stale."""
+        self._search_after_id = None
+        self._cancel_search()
         query = self.search_entry.get().strip().lower()
-        
-        if self.current_view:
-            if len(query) < 1:
-                self.views[self.current_view].refresh_table()
-            else:
-                self.views[self.current_view].filter_table(query)
+        if not self.current_view:
+            return
+        if len(query) < 1:
+            self.views[self.current_view].refresh_table()
+            return
+        if self._search_worker is None:
+            self._search_worker = threading.Thread(target=self._search_loop, name="search-worker", daemon=True)
+            self._search_worker.start()
+        self._search_requests.put((self._search_generation, self.current_view, query))
+        if self._search_poll_id is None:
+            self._search_poll_id = self.after(SEARCH_POLL_MS, self._poll_search)
+
+    def _search_loop(self):
+        """Worker thread: match the newest queued query, skipping superseded ones."""
+        while True:
+            request = self._search_requests.get()
+            while True:
+                try:
+                    request = self._search_requests.get_nowait()
+                except queue.Empty:
+                    break
+            generation, view_class, query = request
+            if generation != self._search_generation:
+                continue
+            # read before searching: an edit after this point shows up as a newer version
+            version = self.controller.store.version
+            try:
+                rows = self.views[view_class].filter_rows(query)
+            except Exception:
+                import traceback
+                traceback.print_exc()
+                rows = None
+            self._search_results.put((generation, view_class, rows, version))
+
+    def _poll_search(self):
+        """Main thread: show the latest finished search and drop stale ones."""
+        self._search_poll_id = None
+        while True:
+            try:
+                generation, view_class, rows, version = self._search_results.get_nowait()
+            except queue.Empty:
+                break
+            if generation == self._search_generation:
+                if version != self.controller.store.version:
+                    # the data changed while searching: search again
+                    self._run_search()
+                    return
+                if rows is not None:
+                    self.views[view_class].show_filtered_rows(rows)
+                return
+        # keep polling while the newest search is still running
+        self._search_poll_id = self.after(SEARCH_POLL_MS, self._poll_search)
 
     def open_admin_panel(self):
         """Open admin management panel for registering admins and changing credentials."""
@@ -561,12 +671,85 @@ class DashboardFrame(ctk.CTkFrame):
         ctk.CTkLabel(frame, text="Data Management", font=get_font(15, True)).pack(anchor="w", pady=(15, 12))
         ctk.CTkButton(frame, text="Create Backup", height=40, font=FONT_MAIN,
                      fg_color=ACCENT_COLOR, text_color=TEXT_PRIMARY, hover_color="#7C3AED",
-                     command=lambda: self.controller.show_custom_dialog("Success", "Backup created successfully!")).pack(fill="x", pady=6)
+                     command=self.handle_create_backup).pack(fill="x", pady=6)
         ctk.CTkButton(frame, text="View Backups", height=40, font=FONT_MAIN,
-                     fg_color=ACCENT_COLOR, text_color=TEXT_PRIMARY, hover_color="#7C3AED").pack(fill="x", pady=6)
+                     fg_color=ACCENT_COLOR, text_color=TEXT_PRIMARY, hover_color="#7C3AED",
+                     command=self.open_backups).pack(fill="x", pady=6)
         ctk.CTkButton(frame, text="Export Data", height=40, font=FONT_MAIN,
                      fg_color=ACCENT_COLOR, text_color=TEXT_PRIMARY, hover_color="#7C3AED").pack(fill="x", pady=6)
 
+    def handle_create_backup(self):
+        """Snapshot the tables on a background thread and report when done."""
+        worker = create_backups_async(reason="manual")
+
+        def _wait():
+            if worker.is_alive():
+                self.after(100, _wait)
+            elif worker.error:
+                self.controller.show_custom_dialog("Error", f"Backup failed: {worker.error}", dialog_type="error")
+            else:
+                self.controller.show_custom_dialog("Success", "Backup created successfully!")
+        _wait()
+
+    def open_backups(self):
+        """Open the list of snapshots, each with a Restore button."""
+        from frontend_ui.ui import DepthCard
+        from backend import list_backups, restore_backup
+
+        panel = ctk.CTkToplevel(self)
+        panel.title("Backups")
+        panel.geometry("520x560")
+        panel.configure(fg_color=BG_COLOR)
+        panel.attributes('-topmost', True)
+        panel.grab_set()
+        panel.focus_force()
+        panel.update_idletasks()
+        x = (panel.winfo_screenwidth() // 2) - (panel.winfo_width() // 2)
+        y = (panel.winfo_screenheight() // 2) - (panel.winfo_height() // 2)
+        panel.geometry(f"+{x}+{y}")
+
+        container = ctk.CTkFrame(panel, fg_color="transparent")
+        container.pack(fill="both", expand=True, padx=20, pady=20)
+        card = DepthCard(container, fg_color=PANEL_COLOR, corner_radius=12, border_width=2, border_color=BORDER_COLOR)
+        card.pack(fill="both", expand=True)
+        scroll = ctk.CTkScrollableFrame(card, fg_color="transparent")
+        scroll.pack(fill="both", expand=True, padx=16, pady=16)
+
+        ctk.CTkLabel(scroll, text="Backups", font=get_font(18, True)).pack(anchor="w", pady=(0, 20))
+
+        try:
+            backups = list_backups()
+        except Exception:
+            backups = []
+        if not backups:
+            ctk.CTkLabel(scroll, text="No backups yet.", font=FONT_MAIN, text_color=TEXT_MUTED).pack(anchor="w")
+            return
+
+        def _restore(snapshot_id):
+            if not self.controller.show_custom_dialog(
+                    "Confirm Restore",
+                    f"Replace the current data with the backup from {snapshot_id}?\n\n"
+                    "The current data is backed up first.",
+                    dialog_type="yesno"):
+                return
+            try:
+                restore_backup(snapshot_id)
+            except Exception as e:
+                self.controller.show_custom_dialog("Error", f"Could not restore: {e}", dialog_type="error")
+                return
+            panel.destroy()
+            self.handle_refresh()
+            self.controller.show_custom_dialog("Success", "Backup restored successfully!")
+
+        for b in backups:
+            row = ctk.CTkFrame(scroll, fg_color="transparent")
+            row.pack(fill="x", pady=4)
+            info = f"{b.get('created', b['id']).replace('T', ' ')}  ·  {b.get('reason', '')}  ·  {b['size'] // 1024} KB"
+            ctk.CTkLabel(row, text=info, font=FONT_MAIN, anchor="w").pack(side="left", fill="x", expand=True)
+            ctk.CTkButton(row, text="Restore", width=80, height=30, font=FONT_MAIN,
+                          fg_color=ACCENT_COLOR, text_color=TEXT_PRIMARY, hover_color="#7C3AED",
+                          command=lambda i=b['id']: _restore(i)).pack(side="right")
+
     def apply_theme(self, choice: str):
         """Apply appearance mode safely and notify all listeners."""
         try:
@@ -605,7 +788,7 @@ class DashboardFrame(ctk.CTkFrame):
     def _confirm_logout(self, result):
         """Confirm logout and stay on dashboard in view-only mode."""
         if result:
-            create_backups()
+            create_backups_async(reason="logout")
             self.controller.logged_in = False
             self.update_button_states()
             self.update_auth_button()
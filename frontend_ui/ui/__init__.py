@@ -5,9 +5,13 @@ UI module - reusable UI components, styling, and utilities.
 from .cards import DepthCard, StatCard
 from .inputs import SmartSearchEntry, SearchableComboBox, StyledComboBox
 from .utils import setup_treeview_style, placeholder_image, get_icon, get_main_logo
+from .table import VirtualTable
+from .importing import run_import
 
 __all__ = [
     "DepthCard", "StatCard",
     "SmartSearchEntry", "SearchableComboBox", "StyledComboBox",
-    "setup_treeview_style", "placeholder_image", "get_icon", "get_main_logo"
+    "setup_treeview_style", "placeholder_image", "get_icon", "get_main_logo",
+    "VirtualTable",
+    "run_import",
 ]
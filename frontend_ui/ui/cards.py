@@ -35,5 +35,13 @@ class StatCard(DepthCard):
         lbl = ctk.CTkLabel(icon_f, image=icon_img, text="")
         lbl.image = icon_img
         lbl.place(relx=0.5, rely=0.5, anchor="center")
-        ctk.CTkLabel(inner, text=num, font=get_font(22, True)).pack()
+        self._value = num
+        self._value_label = ctk.CTkLabel(inner, text=num, font=get_font(22, True))
+        self._value_label.pack()
         ctk.CTkLabel(inner, text=sub, font=get_font(12), text_color=TEXT_MUTED).pack()
+
+    def set_value(self, num):
+        """Show `num` as the card's value; a no-op when it is already shown."""
+        if num != self._value:
+            self._value_label.configure(text=num)
+            self._value = num
@@ -0,0 +1,93 @@
+"""
+Progress window for background CSV imports.
+
+`run_import` shows a progress bar for an :class:`~backend.ImportJob`, polls
+its message queue from the Tk loop, and once the worker is done hands the
+accepted rows to the store and reports the result.
+"""
+
+import queue
+import customtkinter as ctk
+from config import FONT_BOLD, BG_COLOR, ACCENT_COLOR, TEXT_MUTED, get_font
+
+
+# how often the progress window checks the job's queue (ms)
+POLL_INTERVAL = 50
+
+
+def run_import(parent, controller, job, noun):
+    """Show a progress window for the started `job` and finish the import when it ends.
+
+    `noun` is the plural table name used in titles and messages (e.g. "students").
+    """
+    window = ctk.CTkToplevel(parent)
+    window.title(f"Importing {noun.title()}")
+    window.geometry("420x170")
+    window.configure(fg_color=BG_COLOR)
+    window.attributes('-topmost', True)
+    window.grab_set()
+    window.focus_force()
+
+    window.update_idletasks()
+    x = (window.winfo_screenwidth() // 2) - (window.winfo_width() // 2)
+    y = (window.winfo_screenheight() // 2) - (window.winfo_height() // 2)
+    window.geometry(f"+{x}+{y}")
+
+    status = ctk.CTkLabel(window, text="Reading file...", font=get_font(13), text_color=TEXT_MUTED)
+    status.pack(anchor="w", padx=25, pady=(25, 10))
+    bar = ctk.CTkProgressBar(window, progress_color=ACCENT_COLOR, fg_color="#2A1F3D", height=8)
+    bar.pack(fill="x", padx=25, pady=(0, 20))
+    bar.set(0)
+
+    def _cancel():
+        job.cancel()
+        status.configure(text="Cancelling...")
+
+    ctk.CTkButton(window, text="Cancel", command=_cancel, fg_color="#c41e3a",
+                  text_color="white", font=FONT_BOLD, height=36).pack(fill="x", padx=25)
+    window.protocol("WM_DELETE_WINDOW", _cancel)
+
+    def _poll():
+        finished = None
+        while True:
+            try:
+                kind, payload = job.messages.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'progress':
+                bar.set(payload)
+                if not job.cancelled:
+                    status.configure(text=f"Checked {job.rows_read} rows: {job.imported_count} new, {job.error_count} errors")
+            else:
+                finished = (kind, payload)
+        if finished is None:
+            window.after(POLL_INTERVAL, _poll)
+            return
+        window.destroy()
+        finish_import(controller, job, noun, *finished)
+
+    window.after(POLL_INTERVAL, _poll)
+
+
+def finish_import(controller, job, noun, kind, payload):
+    """Merge a finished import into memory and report the result."""
+    if kind == 'failed':
+        controller.show_custom_dialog("Import Error", f"Failed to import: {payload}", dialog_type="error")
+        return
+    if kind == 'cancelled':
+        controller.show_custom_dialog("Import Cancelled", f"No {noun} were imported.")
+        return
+
+    # the rows are already on disk; the store brings memory and its indexes in line
+    controller.store.attach(job.key, job.rows)
+
+    # show results
+    imported_count = job.imported_count
+    error_count = job.error_count
+    if error_count == 0:
+        controller.show_custom_dialog("Import Success", f"Successfully imported {imported_count} {noun}!")
+    else:
+        error_msg = "\n".join(job.errors[:10])
+        if error_count > 10:
+            error_msg += f"\n... and {error_count - 10} more errors"
+        controller.show_custom_dialog("Import Complete", f"Imported {imported_count} {noun}.\n{error_count} errors:\n\n{error_msg}", dialog_type="warning")
@@ -0,0 +1,154 @@
+"""
+Virtualized paging for the ttk.Treeview tables.
+
+`VirtualTable` keeps a fixed pool of Treeview rows and pagination buttons and
+rewrites them in place on every page turn, sort or search, instead of
+deleting and re-creating widgets.
+"""
+
+import customtkinter as ctk
+from config import ACCENT_COLOR
+
+
+PAGE_BUTTON_COLOR = "#3b3b3f"
+
+
+class VirtualTable:
+    """Pooled rows, stripes, hover and page buttons for one paged Treeview.
+
+    Pool row ``i`` always shows the ``i``-th row of the page, so its stripe
+    tag never changes; unused pool rows are detached rather than deleted.
+    """
+    def __init__(self, tree, pagination_frame, prev_btn, next_btn, count_label, on_goto, max_buttons=5):
+        self.tree = tree
+        self.prev_btn = prev_btn
+        self.next_btn = next_btn
+        self.count_label = count_label
+        self.on_goto = on_goto
+
+        self._rows = []     # pooled item ids, in display order
+        self._stripe = {}   # item id -> 'even' / 'odd'
+        self._values = {}   # item id -> row it currently shows
+        self._shown = 0     # pool rows currently attached
+        self._hover = None  # item id with the hover tag
+
+        self._buttons = [
+            ctk.CTkButton(pagination_frame, text="", width=32, height=28, fg_color=PAGE_BUTTON_COLOR,
+                          command=lambda i=i: self._on_button(i))
+            for i in range(max_buttons)
+        ]
+        self._button_pages = [None] * max_buttons
+        self._button_current = [None] * max_buttons
+        self._packed = 0
+        self._nav_state = (None, None)
+        self._count_text = None
+
+    def render(self, items, page, per):
+        """Show page `page` of `items` (`per` rows a page) and return the clamped page."""
+        total = len(items)
+        total_pages = max(1, (total + per - 1) // per)
+        page = min(max(1, page), total_pages)
+        start = (page - 1) * per
+        end = min(start + per, total)
+
+        self._clear_hover()
+        selection = self.tree.selection()
+        if selection:
+            self.tree.selection_remove(*selection)
+        self._fill(items[start:end])
+
+        if total > 0:
+            text = f"Showing {start + 1}-{end} of {total} entries"
+        else:
+            text = "Showing 0 of 0 entries"
+        if text != self._count_text:
+            self.count_label.configure(text=text)
+            self._count_text = text
+
+        self._update_buttons(page, total_pages)
+        return page
+
+    def _fill(self, rows):
+        tree = self.tree
+        n = len(rows)
+        while len(self._rows) < n:
+            i = len(self._rows)
+            stripe = 'even' if i % 2 == 0 else 'odd'
+            iid = tree.insert("", "end", values=(), tags=(stripe,))
+            tree.detach(iid)
+            self._rows.append(iid)
+            self._stripe[iid] = stripe
+        values = self._values
+        for iid, row in zip(self._rows, rows):
+            # rows unchanged since the last render keep their item untouched
+            if values.get(iid) != row:
+                tree.item(iid, values=row)
+                values[iid] = row
+        if n > self._shown:
+            for i in range(self._shown, n):
+                tree.move(self._rows[i], "", i)
+        elif n < self._shown:
+            tree.detach(*self._rows[n:self._shown])
+        self._shown = n
+
+    def _update_buttons(self, page, total_pages):
+        max_buttons = len(self._buttons)
+        start_page = max(1, page - 2)
+        end_page = min(total_pages, start_page + max_buttons - 1)
+        if end_page - start_page < max_buttons - 1:
+            start_page = max(1, end_page - max_buttons + 1)
+        pages = list(range(start_page, end_page + 1))
+
+        for i, p in enumerate(pages):
+            btn = self._buttons[i]
+            is_current = p == page
+            if self._button_pages[i] != p:
+                btn.configure(text=str(p))
+                self._button_pages[i] = p
+            if self._button_current[i] != is_current:
+                btn.configure(fg_color=ACCENT_COLOR if is_current else PAGE_BUTTON_COLOR)
+                self._button_current[i] = is_current
+        # buttons only ever come and go at the end, so pack order stays right
+        for i in range(self._packed, len(pages)):
+            self._buttons[i].pack(side="left", padx=2)
+        for i in range(len(pages), self._packed):
+            self._buttons[i].pack_forget()
+        self._packed = len(pages)
+
+        nav_state = (page > 1, page < total_pages)
+        if nav_state != self._nav_state:
+            self.prev_btn.configure(state=("normal" if nav_state[0] else "disabled"))
+            self.next_btn.configure(state=("normal" if nav_state[1] else "disabled"))
+            self._nav_state = nav_state
+
+    def _on_button(self, i):
+        page = self._button_pages[i]
+        if page is not None:
+            self.on_goto(page)
+
+    # --- hover ---
+    def _clear_hover(self):
+        if self._hover is not None:
+            self.tree.item(self._hover, tags=(self._stripe[self._hover],))
+            self._hover = None
+
+    def on_motion(self, event):
+        """Hand cursor over headings and a hover highlight on the row under the mouse."""
+        region = self.tree.identify_region(event.x, event.y)
+        if region == "heading":
+            self.tree.configure(cursor="hand2")
+            self._clear_hover()
+            return
+        self.tree.configure(cursor="")
+
+        row = self.tree.identify_row(event.y)
+        if not row or row == self._hover:
+            return
+        self._clear_hover()
+        self.tree.item(row, tags=('hover',))
+        self._hover = row
+
+    def on_leave(self, event):
+        """Drop the cursor and hover highlight when the mouse leaves the table."""
+        self.tree.configure(cursor="")
+        self._clear_hover()
@@ -7,11 +7,13 @@ from tkinter import ttk
 
 from config import (
     FONT_MAIN, FONT_BOLD, BG_COLOR, PANEL_COLOR, ACCENT_COLOR, 
-    TEXT_MUTED, BORDER_COLOR, COLOR_PALETTE, TEXT_PRIMARY, FILES
+    TEXT_MUTED, BORDER_COLOR, COLOR_PALETTE, TEXT_PRIMARY
 )
 from config import get_font
-from frontend_ui.ui import DepthCard, placeholder_image, setup_treeview_style, get_icon
-from backend import validate_college, save_csv
+from frontend_ui.ui import DepthCard, placeholder_image, setup_treeview_style, get_icon, VirtualTable, run_import
+from backend import ImportJob
+from backend.sort import TableSorter
+from backend.search import CollegeSearch
 
 
 class CollegesView(ctk.CTkFrame):
@@ -23,6 +25,7 @@ class CollegesView(ctk.CTkFrame):
         self.grid_columnconfigure(1, weight=0)
         self.sort_column = None
         self.sort_reverse = False
+        self._sorter = TableSorter()
         self.column_names = {}  # store original column names
         self.current_page = 1
         self.page_size = 25
@@ -55,7 +58,6 @@ class CollegesView(ctk.CTkFrame):
         ctrl = ctk.CTkFrame(table_container, fg_color="transparent")
         ctrl.pack(fill="x", padx=15, pady=(10,12))
         self.table_container = table_container
-        self._last_hover = None
         
         # left section: Previous button, pagination, and Next button together
         left_ctrl = ctk.CTkFrame(ctrl, fg_color="transparent")
@@ -66,7 +68,6 @@ class CollegesView(ctk.CTkFrame):
         
         self.pagination_frame = ctk.CTkFrame(left_ctrl, fg_color="transparent")
         self.pagination_frame.pack(side="left", padx=8)
-        self.page_buttons = []
         
         # next Button - right next to pagination
         self.next_btn = ctk.CTkButton(left_ctrl, text="Next ▶", width=80, fg_color="#6d28d9", hover_color="#5b21b6", text_color="white", command=lambda: self.change_page(1))
@@ -99,10 +100,15 @@ class CollegesView(ctk.CTkFrame):
                                              font=get_font(13), text_color=TEXT_MUTED)
         self.entry_count_label.pack(side="left", padx=0)
 
+        # pooled rows and page buttons, rewritten in place on every render
+        self.table = VirtualTable(self.tree, self.pagination_frame, self.prev_btn, self.next_btn,
+                                  self.entry_count_label, self.goto_page)
+
         # table_container configure binding will be set below after cards are created
 
         right_panel = ctk.CTkFrame(self, width=280, fg_color="transparent")
         right_panel.grid(row=1, column=1, sticky="nsew")
+        self.right_panel = right_panel
         
         ctk.CTkLabel(right_panel, text="DIRECTORY FACTS", font=get_font(13, True), text_color=TEXT_MUTED).pack(anchor="w", pady=(0, 10))
 
@@ -168,53 +174,10 @@ class CollegesView(ctk.CTkFrame):
         self._last_page_items = rows
         self.current_page = min(max(1, self.current_page), max(1, (len(rows) + self.page_size - 1) // self.page_size))
         self._render_page()
-        self._last_hover = None
 
     def _render_page(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        total = len(self._last_page_items)
-        per = self.page_size
-        total_pages = max(1, (total + per - 1) // per)
-        self.current_page = min(self.current_page, total_pages)
-        start = (self.current_page - 1) * per
-        end = start + per
-        for idx, row in enumerate(self._last_page_items[start:end]):
-            tag = 'even' if idx % 2 == 0 else 'odd'
-            self.tree.insert("", "end", values=row, tags=(tag,))
-        
-        # update entry count - show range (e.g., "Showing 1-12 of 100 entries")
-        if total > 0:
-            display_text = f"Showing {start + 1}-{end} of {total} entries"
-        else:
-            display_text = "Showing 0 of 0 entries"
-        self.entry_count_label.configure(text=display_text)
-        
-        for btn in self.page_buttons:
-            btn.destroy()
-        self.page_buttons.clear()
-        
-        start_page = max(1, self.current_page - 2)
-        end_page = min(total_pages, start_page + 4)
-        if end_page - start_page < 4:
-            start_page = max(1, end_page - 4)
-        
-        for p in range(start_page, end_page + 1):
-            is_current = p == self.current_page
-            btn = ctk.CTkButton(
-                self.pagination_frame, 
-                text=str(p), 
-                width=32, 
-                height=28,
-                fg_color=ACCENT_COLOR if is_current else "#3b3b3f",
-                command=lambda page=p: self.goto_page(page)
-            )
-            btn.pack(side="left", padx=2)
-            self.page_buttons.append(btn)
-        
-        self.prev_btn.configure(state=("normal" if self.current_page > 1 else "disabled"))
-        self.next_btn.configure(state=("normal" if self.current_page < total_pages else "disabled"))
-    
+        self.current_page = self.table.render(self._last_page_items, self.current_page, self.page_size)
+
     def goto_page(self, page):
         self.current_page = page
         self._render_page()
@@ -312,57 +275,27 @@ class CollegesView(ctk.CTkFrame):
         # ensure heights get updated after layout changes (defer to allow layout)
         self.after(50, self._update_sidebar_heights)
 
+    def _fact_values(self):
+        students, programs = len(self.controller.students), len(self.controller.programs)
+        return [str(students), str(programs), str(len(self.controller.colleges)), str(students // max(programs, 1))]
+
+    def update_sidebar(self):
+        """Set the directory facts in place; cards whose value is unchanged are not touched."""
+        for card, value in zip(self._sidebar_cards, self._fact_values()):
+            card.set_value(value)
+
+    def apply_changes(self, events):
+        """Rebuild the college rows if colleges changed and update the facts for store `events`."""
+        if any(e.table == 'college' or e.op == 'reload' for e in events):
+            self.refresh_table()
+        self.update_sidebar()
+
 
     def _on_tree_motion(self, event):
-        region = self.tree.identify_region(event.x, event.y)
-        # change cursor to hand when hovering over sortable headings
-        if region == "heading":
-            self.tree.configure(cursor="hand2")
-            # clear any row hover
-            if getattr(self, '_last_hover', None):
-                prev_row = self._last_hover
-                if prev_row in self.tree.get_children():
-                    items = self.tree.get_children()
-                    if prev_row in items:
-                        idx = items.index(prev_row)
-                        tag = 'even' if idx % 2 == 0 else 'odd'
-                        self.tree.item(prev_row, tags=(tag,))
-                self._last_hover = None
-            return
-        else:
-            self.tree.configure(cursor="")
-        
-        row = self.tree.identify_row(event.y)
-        if not row:
-            return
-        if getattr(self, '_last_hover', None) == row:
-            return
-        if getattr(self, '_last_hover', None):
-            prev_row = self._last_hover
-            # check if the previous row still exists
-            if prev_row in self.tree.get_children():
-                items = self.tree.get_children()
-                if prev_row in items:
-                    idx = list(items).index(prev_row)
-                    tag = 'even' if idx % 2 == 0 else 'odd'
-                    self.tree.item(prev_row, tags=(tag,))
-        # set hover tag as the only tag for this row
-        self.tree.item(row, tags=('hover',))
-        self._last_hover = row
+        self.table.on_motion(event)
 
     def _on_tree_leave(self, event):
-        self.tree.configure(cursor="")
-        if getattr(self, '_last_hover', None):
-            prev_row = self._last_hover
-            # check if the row still exists
-            if prev_row in self.tree.get_children():
-                # restore the striping tag
-                items = self.tree.get_children()
-                if prev_row in items:
-                    idx = items.index(prev_row)
-                    tag = 'even' if idx % 2 == 0 else 'odd'
-                    self.tree.item(prev_row, tags=(tag,))
-            self._last_hover = None
+        self.table.on_leave(event)
 
     def on_row_click(self, event):
         region = self.tree.identify_region(event.x, event.y)
@@ -416,7 +349,7 @@ class CollegesView(ctk.CTkFrame):
 
     def _show_college_info(self, college_code):
         """Show college information in a window."""
-        college = next((c for c in self.controller.colleges if c['code'] == college_code), None)
+        college = self.controller.store.college(college_code)
         if not college:
             self.controller.show_custom_dialog("Error", "College not found", dialog_type="error")
             return
@@ -477,10 +410,11 @@ class CollegesView(ctk.CTkFrame):
         add_info_row("College Name:", college.get('name', 'N/A'))
         add_info_row("College Code:", college.get('code', 'N/A'))
         
-        program_count = len([p for p in self.controller.programs if p.get('college') == college_code])
+        stats = self.controller.store.stats()
+        program_count = stats.programs_in_college(college_code)
         add_info_row("Programs:", str(program_count))
         
-        student_count = len([s for s in self.controller.students for p in self.controller.programs if p.get('college') == college_code and s.get('program') == p.get('code')])
+        student_count = stats.students_in_college(college_code)
         add_info_row("Students:", str(student_count))
 
         # action buttons - only show if authenticated
@@ -495,32 +429,21 @@ class CollegesView(ctk.CTkFrame):
                 self.on_row_select(None)
 
         def _delete():
-            college_obj = next((c for c in self.controller.colleges if c['code'] == college_code), None)
+            college_obj = self.controller.store.college(college_code)
             if not college_obj:
                 return
-            affected_programs = [p for p in self.controller.programs if p.get('college') == college_code]
-            affected_students = [s for s in self.controller.students if s.get('program', '') in {p['code'] for p in affected_programs}]
+            affected_programs = stats.programs_in_college(college_code)
+            affected_students = stats.students_in_college(college_code)
             warning_parts = [f"Are you sure you want to delete college '{college_code}'?"]
             if affected_programs:
-                warning_parts.append(f"\n\n⚠ The college field will be cleared for {len(affected_programs)} program(s).")
+                warning_parts.append(f"\n\n⚠ The college field will be cleared for {affected_programs} program(s).")
             if affected_students:
-                warning_parts.append(f" The program field will also be cleared for {len(affected_students)} enrolled student(s).")
+                warning_parts.append(f" The program field will also be cleared for {affected_students} enrolled student(s).")
             if not affected_programs and not affected_students:
                 warning_parts.append("\n\nNo programs or students will be affected.")
             if self.controller.show_custom_dialog("Confirm Delete", "".join(warning_parts), dialog_type="yesno"):
                 profile_window.destroy()
-                prog_codes = {p['code'] for p in self.controller.programs if p.get('college') == college_code}
-                for s in self.controller.students:
-                    if s.get('program') in prog_codes:
-                        s['program'] = ''
-                save_csv('student', self.controller.students)
-                for p in self.controller.programs:
-                    if p.get('college') == college_code:
-                        p['college'] = ''
-                save_csv('program', self.controller.programs)
-                self.controller.colleges.remove(college_obj)
-                save_csv('college', self.controller.colleges)
-                self.refresh_table()
+                self.controller.store.delete_college(college_code)
                 self.controller.show_custom_dialog("Success", "College deleted successfully!")
 
         # only show edit/delete buttons if user is logged in
@@ -533,11 +456,24 @@ class CollegesView(ctk.CTkFrame):
             login_msg.pack(fill="x", pady=10)
 
     def filter_table(self, query):
+        self.show_filtered_rows(self.filter_rows(query))
+
+    def filter_rows(self, query):
+        """Build the table rows matching `query`.
+
+        No widget access; holds the store lock, so it can run off the main thread.
+        """
+        with self.controller.store.lock:
+            return self._filter_rows(query)
+
+    def _filter_rows(self, query):
         rows = []
-        for idx, c in enumerate(self.controller.colleges, 1):
-            if (query in c.get('name', '').lower() or 
-                query in c.get('code', '').lower()):
-                rows.append((idx, c['code'], c['name']))
+        for idx, c in CollegeSearch.global_search(self.controller.colleges, query):
+            rows.append((idx, c['code'], c['name']))
+        return rows
+
+    def show_filtered_rows(self, rows):
+        """Show rows from :meth:`filter_rows` starting at the first page."""
         self._last_page_items = rows
         self.current_page = 1
         self._render_page()
@@ -579,19 +515,12 @@ class CollegesView(ctk.CTkFrame):
         if not self.sort_column:
             return
         
-        # sort the entire _last_page_items list
+        # sort the entire _last_page_items list (earlier sort columns break ties)
         col_index = self.tree['columns'].index(self.sort_column) if self.sort_column in self.tree['columns'] else 0
-        self._last_page_items.sort(key=lambda x: self.try_numeric(str(x[col_index])), reverse=self.sort_reverse)
+        self._last_page_items = self._sorter.sort(self._last_page_items, col_index, self.sort_reverse)
         
         # re-render the current page
         self._render_page()
-    
-    @staticmethod
-    def try_numeric(val):
-        try:
-            return float(val)
-        except ValueError:
-            return val
 
     def add_college(self):
         # check authentication
@@ -647,7 +576,7 @@ class CollegesView(ctk.CTkFrame):
             if not name.replace(" ", "").isalpha():
                 return False, "College Name must contain only letters and spaces"
             
-            if any(c['code'] == code for c in self.controller.colleges):
+            if self.controller.store.college(code) is not None:
                 return False, "College Code already exists"
             
             return True, ""
@@ -662,18 +591,10 @@ class CollegesView(ctk.CTkFrame):
             name = name_entry.get().strip().title()
             
             new_col = {'code': code, 'name': name}
-            ok, msg = validate_college(new_col)
+            ok, msg = self.controller.store.create('college', new_col)
             if not ok:
                 self.controller.show_custom_dialog("Error", msg, dialog_type="error")
                 return
-            self.controller.colleges.append(new_col)
-            save_csv('college', self.controller.colleges)
-            self.refresh_table()
-            try:
-                self.refresh_sidebar()
-                self._refresh_all_sidebars()
-            except Exception:
-                pass
             modal.destroy()
             self.controller.show_custom_dialog("Success", "College added successfully!")
         
@@ -713,42 +634,27 @@ class CollegesView(ctk.CTkFrame):
         row_data = self.tree.item(selected_item)['values']
         college_code = row_data[1]
         
-        college = next((c for c in self.controller.colleges if c['code'] == college_code), None)
+        college = self.controller.store.college(college_code)
         if not college:
             self.controller.show_custom_dialog("Error", "College not found", dialog_type="error")
             return
         
         # count affected programs and students
-        affected_programs = [p for p in self.controller.programs if p['college'] == college['code']]
-        affected_students = [s for s in self.controller.students if s.get('program', '') in [p['code'] for p in affected_programs]]
+        stats = self.controller.store.stats()
+        affected_programs = stats.programs_in_college(college['code'])
+        affected_students = stats.students_in_college(college['code'])
         
         # build warning message
         warning_parts = [f"Are you sure you want to delete college '{college['code']}'?"]
         if affected_programs:
-            warning_parts.append(f"\n\n⚠ The college field will be cleared for {len(affected_programs)} program(s).")
+            warning_parts.append(f"\n\n⚠ The college field will be cleared for {affected_programs} program(s).")
         if affected_students:
-            warning_parts.append(f" The program field will also be cleared for {len(affected_students)} enrolled student(s).")
+            warning_parts.append(f" The program field will also be cleared for {affected_students} enrolled student(s).")
         if not affected_programs and not affected_students:
             warning_parts.append("\n\nNo programs or students will be affected.")
         
         if self.controller.show_custom_dialog("Confirm Delete", "".join(warning_parts), dialog_type="yesno"):
-            prog_codes = {p['code'] for p in self.controller.programs if p.get('college') == college['code']}
-            for s in self.controller.students:
-                if s.get('program') in prog_codes:
-                    s['program'] = ''
-            save_csv('student', self.controller.students)
-            for p in self.controller.programs:
-                if p.get('college') == college['code']:
-                    p['college'] = ''
-            save_csv('program', self.controller.programs)
-            self.controller.colleges.remove(college)
-            save_csv('college', self.controller.colleges)
-            self.refresh_table()
-            try:
-                self.refresh_sidebar()
-                self._refresh_all_sidebars()
-            except Exception:
-                pass
+            self.controller.store.delete_college(college['code'])
             self.controller.show_custom_dialog("Success", "College deleted successfully!")
 
     def on_row_select(self, event):
@@ -760,7 +666,7 @@ class CollegesView(ctk.CTkFrame):
         row_data = self.tree.item(selected_item)['values']
         college_code = row_data[1]
         
-        college = next((c for c in self.controller.colleges if c['code'] == college_code), None)
+        college = self.controller.store.college(college_code)
         if not college:
             return
         
@@ -825,23 +731,22 @@ class CollegesView(ctk.CTkFrame):
                 self.controller.show_custom_dialog("Validation Error", error_msg, dialog_type="error")
                 return
             
-            college['name'] = name_entry.get().strip().title()
-            save_csv('college', self.controller.colleges)
+            ok, msg = self.controller.store.update('college', college['code'], {'name': name_entry.get().strip().title()})
+            if not ok:
+                self.controller.show_custom_dialog("Error", msg, dialog_type="error")
+                return
             edit_window.destroy()
-            self.refresh_table()
             self.controller.show_custom_dialog("Success", "College updated successfully!")
         
         def delete():
-            has_programs = any(p['college'] == college['code'] for p in self.controller.programs)
+            has_programs = bool(self.controller.store.relations().programs_in_college(college['code']))
             if has_programs:
                 self.controller.show_custom_dialog("Error", "Cannot delete college with associated programs", dialog_type="error")
                 return
             
             if self.controller.show_custom_dialog("Confirm Delete", f"Delete {college['code']}?", dialog_type="yesno"):
-                self.controller.colleges.remove(college)
-                save_csv('college', self.controller.colleges)
+                self.controller.store.delete('college', college['code'])
                 edit_window.destroy()
-                self.refresh_table()
                 self.controller.show_custom_dialog("Success", "College deleted successfully!")
         
         ctk.CTkButton(button_frame, text="Save Changes", command=save, height=40,
@@ -850,9 +755,8 @@ class CollegesView(ctk.CTkFrame):
                      fg_color="#c41e3a", font=FONT_BOLD).pack(side="left", fill="x", expand=True, padx=(5, 0))
 
     def import_data(self):
-        """Import colleges from CSV file."""
+        """Import colleges from CSV file on a background worker."""
         from tkinter import filedialog
-        import csv
         
         file_path = filedialog.askopenfilename(
             title="Select CSV file to import",
@@ -862,69 +766,8 @@ class CollegesView(ctk.CTkFrame):
         if not file_path:
             return
         
-        try:
-            imported_count = 0
-            error_count = 0
-            errors = []
-            
-            with open(file_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                existing_codes = set()
-                
-                # load existing codes
-                try:
-                    import csv as csv_module
-                    with open(FILES['college'], 'r', encoding='utf-8') as existing:
-                        existing_reader = csv_module.DictReader(existing)
-                        for row in existing_reader:
-                            existing_codes.add(row['code'])
-                except:
-                    pass
-                
-                rows_to_add = []
-                for row_num, row in enumerate(reader, start=2):
-                    # validate the row
-                    is_valid, error_msg = validate_college({
-                        'code': row.get('code', ''),
-                        'name': row.get('name', '')
-                    })
-                    
-                    if not is_valid:
-                        error_count += 1
-                        errors.append(f"Row {row_num}: {error_msg}")
-                        continue
-                    
-                    # check if code already exists
-                    if row.get('code') in existing_codes:
-                        error_count += 1
-                        errors.append(f"Row {row_num}: College code {row.get('code')} already exists")
-                        continue
-                    
-                    rows_to_add.append(row)
-                    existing_codes.add(row.get('code'))
-                    imported_count += 1
-                
-                # append to CSV file
-                if rows_to_add:
-                    with open(FILES['college'], 'a', newline='', encoding='utf-8') as f:
-                        writer = csv.DictWriter(f, fieldnames=['code', 'name'])
-                        for row in rows_to_add:
-                            writer.writerow({
-                                'code': row.get('code', ''),
-                                'name': row.get('name', '')
-                            })
-                    
-                    self.refresh_table()
-            
-            # show results
-            if error_count == 0:
-                self.controller.show_custom_dialog("Import Success", f"Successfully imported {imported_count} colleges!")
-            else:
-                error_msg = "\n".join(errors[:10])
-                if len(errors) > 10:
-                    error_msg += f"\n... and {len(errors) - 10} more errors"
-                self.controller.show_custom_dialog("Import Complete", f"Imported {imported_count} colleges.\n{error_count} errors:\n\n{error_msg}", dialog_type="warning")
-        
-        except Exception as e:
-            self.controller.show_custom_dialog("Import Error", f"Failed to import: {str(e)}", dialog_type="error")
+        # the worker checks duplicates against a snapshot of the in-memory codes
+        existing_codes = {c.get('code', '') for c in self.controller.colleges}
+        job = ImportJob('college', file_path, existing_codes).start()
+        run_import(self, self.controller, job, "colleges")
 
@@ -9,11 +9,13 @@ from tkinter import ttk
 
 from config import (
     FONT_MAIN, FONT_BOLD, BG_COLOR, PANEL_COLOR, ACCENT_COLOR, 
-    TEXT_MUTED, BORDER_COLOR, COLOR_PALETTE, TEXT_PRIMARY, FILES
+    TEXT_MUTED, BORDER_COLOR, COLOR_PALETTE, TEXT_PRIMARY
 )
 from config import get_font
-from frontend_ui.ui import DepthCard, setup_treeview_style, placeholder_image, get_icon, StyledComboBox
-from backend import validate_program, save_csv
+from frontend_ui.ui import DepthCard, setup_treeview_style, placeholder_image, get_icon, StyledComboBox, VirtualTable, run_import
+from backend import ImportJob
+from backend.sort import TableSorter
+from backend.search import ProgramSearch
 
 
 class ProgramsView(ctk.CTkFrame):
@@ -25,6 +27,7 @@ class ProgramsView(ctk.CTkFrame):
         self.grid_columnconfigure(1, weight=0)
         self.sort_column = None
         self.sort_reverse = False
+        self._sorter = TableSorter()
         self.column_names = {}  # store original column names
         self.setup_ui()
 
@@ -57,7 +60,6 @@ class ProgramsView(ctk.CTkFrame):
         self.current_page = 1
         self.page_size = 12
         self._last_page_items = []
-        self._last_hover = None
         self.table_container = table_container
         
         # left section: Previous button, pagination, and Next button together
@@ -69,7 +71,6 @@ class ProgramsView(ctk.CTkFrame):
         
         self.pagination_frame = ctk.CTkFrame(left_ctrl, fg_color="transparent")
         self.pagination_frame.pack(side="left", padx=8)
-        self.page_buttons = []
         
         # next Button - right next to pagination
         self.next_btn = ctk.CTkButton(left_ctrl, text="Next ▶", width=80, fg_color="#6d28d9", hover_color="#5b21b6", text_color="white", command=lambda: self.change_page(1))
@@ -102,6 +103,10 @@ class ProgramsView(ctk.CTkFrame):
                                              font=get_font(13), text_color=TEXT_MUTED)
         self.entry_count_label.pack(side="left", padx=0)
 
+        # pooled rows and page buttons, rewritten in place on every render
+        self.table = VirtualTable(self.tree, self.pagination_frame, self.prev_btn, self.next_btn,
+                                  self.entry_count_label, self.goto_page)
+
         def _on_table_config(e):
             total = max(e.width - 20, 200)
             # adjust column proportions to fit better
@@ -116,54 +121,11 @@ class ProgramsView(ctk.CTkFrame):
         right_panel.grid(row=1, column=1, sticky="nsew")
         self.right_panel = right_panel
 
-        top_card = DepthCard(right_panel, fg_color=PANEL_COLOR, corner_radius=15, border_width=2, border_color=BORDER_COLOR)
-        top_card.pack(fill="x", pady=(0, 20))
-        ctk.CTkLabel(top_card, text="Top Enrolled", font=get_font(13, True)).pack(anchor="w", padx=20, pady=15)
-        
-        enrollments = {}
-        for student in self.controller.students:
-            prog = student.get('program', 'Unknown')
-            enrollments[prog] = enrollments.get(prog, 0) + 1
-        
-        sorted_progs = sorted(enrollments.items(), key=lambda x: x[1], reverse=True)[:3]
-        colors_list = [ACCENT_COLOR, "#a78bfa", "#6366f1"]
-        
-        for i, (p, val) in enumerate(sorted_progs):
-            f = ctk.CTkFrame(top_card, fg_color="transparent")
-            f.pack(fill="x", padx=20, pady=5)
-            ctk.CTkLabel(f, text=p, font=get_font(13, True)).pack(side="left")
-            ctk.CTkLabel(f, text=f"{val} Students", text_color=TEXT_MUTED).pack(side="right")
-            bar = ctk.CTkProgressBar(top_card, progress_color=colors_list[i], fg_color="#2A1F3D", height=8)
-            bar.pack(fill="x", padx=20, pady=(0, 15))
-            try:
-                from ui.utils import animate_progress
-                animate_progress(bar, min(val / 50, 1.0), duration=420)
-            except Exception:
-                bar.set(min(val / 50, 1.0))
-
-        dist_card = DepthCard(right_panel, fg_color=PANEL_COLOR, corner_radius=15, border_width=2, border_color=BORDER_COLOR)
-        dist_card.pack(fill="both", expand=True)
-        ctk.CTkLabel(dist_card, text="College Program Distribution", font=get_font(13, True)).pack(anchor="w", padx=20, pady=15)
-
-        self.create_donut_chart(dist_card)
-        self.right_dist_card = dist_card
+        # the donut (and with it matplotlib) waits until the view is first shown
+        self._chart_shown = False
+        self._build_sidebar()
         self.refresh_table()
 
-    def _refresh_all_sidebars(self):
-        try:
-            from frontend_ui.dashboard import DashboardFrame
-            df = self.controller.frames.get(DashboardFrame)
-            if not df:
-                return
-            for v in df.views.values():
-                try:
-                    if hasattr(v, 'refresh_sidebar'):
-                        v.refresh_sidebar()
-                except Exception:
-                    pass
-        except Exception:
-            pass
-
     def create_donut_chart(self, parent):
         try:
             import matplotlib
@@ -188,10 +150,7 @@ class ProgramsView(ctk.CTkFrame):
             'CHS': '#fFFFFF',
         }
 
-        college_counts = {}
-        for p in self.controller.programs:
-            coll = p.get('college', 'Unknown')
-            college_counts[coll] = college_counts.get(coll, 0) + 1
+        college_counts = dict(self._stats().programs_per_college)
 
         labels = list(college_counts.keys())
         data = [college_counts[k] for k in labels]
@@ -218,61 +177,23 @@ class ProgramsView(ctk.CTkFrame):
                 sq.pack(side="left", padx=(0, 8))
                 ctk.CTkLabel(f, text=f"{lab} ({college_counts.get(lab,0)})", font=get_font(12)).pack(side="left")
 
+    def _stats(self):
+        """Shared enrollment counters for the controller's data."""
+        return self.controller.store.stats()
+
     def refresh_table(self):
+        stats = self._stats()
         rows = []
         for idx, p in enumerate(self.controller.programs, 1):
-            student_count = len([s for s in self.controller.students if s.get('program') == p['code']])
+            student_count = stats.students_in_program(p['code'])
             rows.append((idx, p['code'], p['name'], p['college'], student_count))
         self._last_page_items = rows
         self.current_page = min(max(1, self.current_page), max(1, (len(rows) + self.page_size - 1) // self.page_size))
         self._render_page()
-        self._last_hover = None
 
     def _render_page(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        total = len(self._last_page_items)
-        per = self.page_size
-        total_pages = max(1, (total + per - 1) // per)
-        self.current_page = min(self.current_page, total_pages)
-        start = (self.current_page - 1) * per
-        end = start + per
-        for idx, row in enumerate(self._last_page_items[start:end]):
-            tag = 'even' if idx % 2 == 0 else 'odd'
-            self.tree.insert("", "end", values=row, tags=(tag,))
-        
-        # update entry count - show range (e.g., "Showing 1-12 of 100 entries")
-        if total > 0:
-            display_text = f"Showing {start + 1}-{end} of {total} entries"
-        else:
-            display_text = "Showing 0 of 0 entries"
-        self.entry_count_label.configure(text=display_text)
-        
-        for btn in self.page_buttons:
-            btn.destroy()
-        self.page_buttons.clear()
-        
-        start_page = max(1, self.current_page - 2)
-        end_page = min(total_pages, start_page + 4)
-        if end_page - start_page < 4:
-            start_page = max(1, end_page - 4)
-        
-        for p in range(start_page, end_page + 1):
-            is_current = p == self.current_page
-            btn = ctk.CTkButton(
-                self.pagination_frame, 
-                text=str(p), 
-                width=32, 
-                height=28,
-                fg_color=ACCENT_COLOR if is_current else "#3b3b3f",
-                command=lambda page=p: self.goto_page(page)
-            )
-            btn.pack(side="left", padx=2)
-            self.page_buttons.append(btn)
-        
-        self.prev_btn.configure(state=("normal" if self.current_page > 1 else "disabled"))
-        self.next_btn.configure(state=("normal" if self.current_page < total_pages else "disabled"))
-    
+        self.current_page = self.table.render(self._last_page_items, self.current_page, self.page_size)
+
     def goto_page(self, page):
         self.current_page = page
         self._render_page()
@@ -320,21 +241,24 @@ class ProgramsView(ctk.CTkFrame):
     def refresh_sidebar(self):
         for w in self.right_panel.winfo_children():
             w.destroy()
+        self._build_sidebar()
+
+    def _build_sidebar(self):
         top_card = DepthCard(self.right_panel, fg_color=PANEL_COLOR, corner_radius=15, border_width=2, border_color=BORDER_COLOR)
         top_card.pack(fill="x", pady=(0, 20))
         ctk.CTkLabel(top_card, text="Top Enrolled", font=get_font(13, True)).pack(anchor="w", padx=20, pady=15)
 
-        enrollments = {}
-        for student in self.controller.students:
-            prog = student.get('program', 'Unknown')
-            enrollments[prog] = enrollments.get(prog, 0) + 1
-        sorted_progs = sorted(enrollments.items(), key=lambda x: x[1], reverse=True)[:3]
+        stats = self._stats()
+        sorted_progs = stats.top_programs(3)
         colors_list = [ACCENT_COLOR, "#a78bfa", "#6366f1"]
+        self._top_rows = []  # (name label, count label, bar) per top program
         for i, (p, val) in enumerate(sorted_progs):
             f = ctk.CTkFrame(top_card, fg_color="transparent")
             f.pack(fill="x", padx=20, pady=5)
-            ctk.CTkLabel(f, text=p, font=get_font(13, True)).pack(side="left")
-            ctk.CTkLabel(f, text=f"{val} Students", text_color=TEXT_MUTED).pack(side="right")
+            name_label = ctk.CTkLabel(f, text=p, font=get_font(13, True))
+            name_label.pack(side="left")
+            count_label = ctk.CTkLabel(f, text=f"{val} Students", text_color=TEXT_MUTED)
+            count_label.pack(side="right")
             bar = ctk.CTkProgressBar(top_card, progress_color=colors_list[i], fg_color="#2A1F3D", height=8)
             bar.pack(fill="x", padx=20, pady=(0, 15))
             try:
@@ -342,62 +266,69 @@ class ProgramsView(ctk.CTkFrame):
                 animate_progress(bar, min(val / 50, 1.0), duration=420)
             except Exception:
                 bar.set(min(val / 50, 1.0))
+            self._top_rows.append((name_label, count_label, bar))
+        self._top_values = list(sorted_progs)
 
         dist_card = DepthCard(self.right_panel, fg_color=PANEL_COLOR, corner_radius=15, border_width=2, border_color=BORDER_COLOR)
         dist_card.pack(fill="both", expand=True)
         ctk.CTkLabel(dist_card, text="College Program Distribution", font=get_font(13, True)).pack(anchor="w", padx=20, pady=15)
-        self.create_donut_chart(dist_card)
-
-    def _on_tree_motion(self, event):
-        region = self.tree.identify_region(event.x, event.y)
-        # change cursor to hand when hovering over sortable headings
-        if region == "heading":
-            self.tree.configure(cursor="hand2")
-            # clear any row hover
-            if getattr(self, '_last_hover', None):
-                prev_row = self._last_hover
-                if prev_row in self.tree.get_children():
-                    items = self.tree.get_children()
-                    if prev_row in items:
-                        idx = items.index(prev_row)
-                        tag = 'even' if idx % 2 == 0 else 'odd'
-                        self.tree.item(prev_row, tags=(tag,))
-                self._last_hover = None
+        self.right_dist_card = dist_card
+        self._build_donut()
+        self._dist_counts = dict(stats.programs_per_college)
+
+    def _build_donut(self):
+        self._dist_body = ctk.CTkFrame(self.right_dist_card, fg_color="transparent")
+        self._dist_body.pack(fill="both", expand=True)
+        if self._chart_shown:
+            self.create_donut_chart(self._dist_body)
+
+    def update_sidebar(self):
+        """Bring the sidebar up to date, touching only the widgets whose values changed."""
+        if not self._chart_shown:
+            self._chart_shown = True
+            self.create_donut_chart(self._dist_body)
+        stats = self._stats()
+        top = stats.top_programs(3)
+        if len(top) != len(self._top_rows):
+            self.refresh_sidebar()
             return
-        else:
-            self.tree.configure(cursor="")
-        
-        row = self.tree.identify_row(event.y)
-        if not row:
+        for (name_label, count_label, bar), new, old in zip(self._top_rows, top, self._top_values):
+            if new == old:
+                continue
+            if new[0] != old[0]:
+                name_label.configure(text=new[0])
+            if new[1] != old[1]:
+                count_label.configure(text=f"{new[1]} Students")
+                bar.set(min(new[1] / 50, 1.0))
+        self._top_values = list(top)
+
+        # the donut is the expensive part: redraw it only when the distribution changed
+        counts = dict(stats.programs_per_college)
+        if counts != self._dist_counts:
+            self._dist_body.destroy()
+            self._build_donut()
+            self._dist_counts = counts
+
+    def apply_changes(self, events):
+        """Rebuild the program rows and patch the sidebar for store `events`.
+
+        The program table is sized by the programs, not the students, and
+        unchanged rows are left alone when the page is re-rendered.
+        """
+        if any(e.op == 'reload' for e in events):
+            self.refresh_table()
+            self.refresh_sidebar()
             return
-        if getattr(self, '_last_hover', None) == row:
+        if all(e.table == 'college' for e in events):
             return
-        if getattr(self, '_last_hover', None):
-            prev_row = self._last_hover
-            # check if the previous row still exists
-            if prev_row in self.tree.get_children():
-                items = self.tree.get_children()
-                if prev_row in items:
-                    idx = list(items).index(prev_row)
-                    tag = 'even' if idx % 2 == 0 else 'odd'
-                    self.tree.item(prev_row, tags=(tag,))
-        # set hover tag as the only tag for this row
-        self.tree.item(row, tags=('hover',))
-        self._last_hover = row
+        self.refresh_table()
+        self.update_sidebar()
+
+    def _on_tree_motion(self, event):
+        self.table.on_motion(event)
 
     def _on_tree_leave(self, event):
-        self.tree.configure(cursor="")
-        if getattr(self, '_last_hover', None):
-            prev_row = self._last_hover
-            # check if the row still exists
-            if prev_row in self.tree.get_children():
-                # restore the striping tag
-                items = self.tree.get_children()
-                if prev_row in items:
-                    idx = items.index(prev_row)
-                    tag = 'even' if idx % 2 == 0 else 'odd'
-                    self.tree.item(prev_row, tags=(tag,))
-            self._last_hover = None
+        self.table.on_leave(event)
 
     def on_row_click(self, event):
         region = self.tree.identify_region(event.x, event.y)
@@ -409,13 +340,26 @@ class ProgramsView(ctk.CTkFrame):
                 self._show_program_info(prog_code)
 
     def filter_table(self, query):
+        self.show_filtered_rows(self.filter_rows(query))
+
+    def filter_rows(self, query):
+        """Build the table rows matching `query`.
+
+        No widget access; holds the store lock, so it can run off the main thread.
+        """
+        with self.controller.store.lock:
+            return self._filter_rows(query)
+
+    def _filter_rows(self, query):
+        stats = self._stats()
         rows = []
-        for idx, p in enumerate(self.controller.programs, 1):
-            if (query in p.get('name', '').lower() or 
-                query in p.get('code', '').lower() or
-                query in p.get('college', '').lower()):
-                student_count = len([s for s in self.controller.students if s.get('program') == p['code']])
-                rows.append((idx, p['code'], p['name'], p['college'], student_count))
+        for idx, p in ProgramSearch.global_search(self.controller.programs, query):
+            student_count = stats.students_in_program(p['code'])
+            rows.append((idx, p['code'], p['name'], p['college'], student_count))
+        return rows
+
+    def show_filtered_rows(self, rows):
+        """Show rows from :meth:`filter_rows` starting at the first page."""
         self._last_page_items = rows
         self.current_page = 1
         self._render_page()
@@ -457,23 +401,16 @@ class ProgramsView(ctk.CTkFrame):
         if not self.sort_column:
             return
         
-        # sort the entire _last_page_items list
+        # sort the entire _last_page_items list (earlier sort columns break ties)
         col_index = self.tree['columns'].index(self.sort_column) if self.sort_column in self.tree['columns'] else 0
-        self._last_page_items.sort(key=lambda x: self.try_numeric(str(x[col_index])), reverse=self.sort_reverse)
+        self._last_page_items = self._sorter.sort(self._last_page_items, col_index, self.sort_reverse)
         
         # re-render the current page
         self._render_page()
-    
-    @staticmethod
-    def try_numeric(val):
-        try:
-            return float(val)
-        except ValueError:
-            return val
 
     def _show_program_info(self, prog_code):
         """Show program information in a window."""
-        program = next((p for p in self.controller.programs if p['code'] == prog_code), None)
+        program = self.controller.store.program(prog_code)
         if not program:
             self.controller.show_custom_dialog("Error", "Program not found", dialog_type="error")
             return
@@ -535,7 +472,7 @@ class ProgramsView(ctk.CTkFrame):
         add_info_row("Program Code:", program.get('code', 'N/A'))
         add_info_row("College:", program.get('college', 'N/A'))
         
-        student_count = len([s for s in self.controller.students if s.get('program') == prog_code])
+        student_count = self._stats().students_in_program(prog_code)
         add_info_row("Enrolled Students:", str(student_count))
 
         # action buttons - only show if authenticated
@@ -550,20 +487,18 @@ class ProgramsView(ctk.CTkFrame):
                 self.on_row_select(None)
 
         def _delete():
-            program_obj = next((p for p in self.controller.programs if p['code'] == prog_code), None)
+            program_obj = self.controller.store.program(prog_code)
             if not program_obj:
                 return
-            affected_students = [s for s in self.controller.students if s.get('program', '') == prog_code]
+            affected_students = self._stats().students_in_program(prog_code)
             warning_parts = [f"Are you sure you want to delete program '{prog_code}'?"]
             if affected_students:
-                warning_parts.append(f"\n\n⚠ This will orphan {len(affected_students)} student(s) currently enrolled in this program.")
+                warning_parts.append(f"\n\n⚠ This will orphan {affected_students} student(s) currently enrolled in this program.")
             else:
                 warning_parts.append("\n\nNo students will be affected.")
             if self.controller.show_custom_dialog("Confirm Delete", "".join(warning_parts), dialog_type="yesno"):
                 profile_window.destroy()
-                self.controller.programs.remove(program_obj)
-                save_csv('program', self.controller.programs)
-                self.refresh_table()
+                self.controller.store.delete('program', program_obj['code'])
                 self.controller.show_custom_dialog("Success", "Program deleted successfully!")
 
         # only show edit/delete buttons if user is logged in
@@ -639,7 +574,7 @@ class ProgramsView(ctk.CTkFrame):
             if not name.replace(" ", "").isalpha():
                 return False, "Program Name must contain only letters and spaces"
             
-            if any(p['code'] == code for p in self.controller.programs):
+            if self.controller.store.program(code) is not None:
                 return False, "Program Code already exists"
             
             return True, ""
@@ -655,27 +590,11 @@ class ProgramsView(ctk.CTkFrame):
             college = college_widget.get()
 
             new_prog = {'code': code, 'name': name, 'college': college}
-            ok, msg = validate_program(new_prog)
+            ok, msg = self.controller.store.create('program', new_prog)
             if not ok:
                 self.controller.show_custom_dialog("Error", msg, dialog_type="error")
                 return
             
-            self.controller.programs.append(new_prog)
-            save_csv('program', self.controller.programs)
-            self.refresh_table()
-            try:
-                for w in self.right_panel.winfo_children():
-                    w.destroy()
-                dist_card = DepthCard(self.right_panel, fg_color=PANEL_COLOR, corner_radius=15, border_width=2, border_color=BORDER_COLOR)
-                dist_card.pack(fill="both", expand=True)
-                ctk.CTkLabel(dist_card, text="College Program Distribution", font=get_font(13, True)).pack(anchor="w", padx=20, pady=15)
-                self.create_donut_chart(dist_card)
-                try:
-                    self._refresh_all_sidebars()
-                except Exception:
-                    pass
-            except Exception:
-                pass
             modal.destroy()
             self.controller.show_custom_dialog("Success", "Program added successfully!")
         
@@ -720,34 +639,24 @@ class ProgramsView(ctk.CTkFrame):
         row_data = self.tree.item(selected_item)['values']
         prog_code = row_data[1]
         
-        program = next((p for p in self.controller.programs if p['code'] == prog_code), None)
+        program = self.controller.store.program(prog_code)
         if not program:
             self.controller.show_custom_dialog("Error", "Program not found", dialog_type="error")
             return
         
         # count affected students
-        affected_students = [s for s in self.controller.students if s.get('program', '') == prog_code]
+        stats = self._stats()
+        affected_students = stats.students_in_program(prog_code)
         
         # build warning message
         warning_parts = [f"Are you sure you want to delete program '{prog_code}'?"]
         if affected_students:
-            warning_parts.append(f"\n\n\u26a0 The program field will be cleared for {len(affected_students)} student(s) currently enrolled.")
+            warning_parts.append(f"\n\n\u26a0 The program field will be cleared for {affected_students} student(s) currently enrolled.")
         else:
             warning_parts.append("\n\nNo students will be affected.")
         
         if self.controller.show_custom_dialog("Confirm Delete", "".join(warning_parts), dialog_type="yesno"):
-            for s in self.controller.students:
-                if s.get('program') == prog_code:
-                    s['program'] = ''
-            save_csv('student', self.controller.students)
-            self.controller.programs.remove(program)
-            save_csv('program', self.controller.programs)
-            self.refresh_table()
-            try:
-                self.refresh_sidebar()
-                self._refresh_all_sidebars()
-            except Exception:
-                pass
+            self.controller.store.delete_program(prog_code)
             self.controller.show_custom_dialog("Success", "Program deleted successfully!")
 
     def on_row_select(self, event):
@@ -759,7 +668,7 @@ class ProgramsView(ctk.CTkFrame):
         row_data = self.tree.item(selected_item)['values']
         prog_code = row_data[1]
         
-        program = next((p for p in self.controller.programs if p['code'] == prog_code), None)
+        program = self.controller.store.program(prog_code)
         if not program:
             return
         
@@ -836,27 +745,24 @@ class ProgramsView(ctk.CTkFrame):
                 self.controller.show_custom_dialog("Validation Error", error_msg, dialog_type="error")
                 return
             
-            program['name'] = name_entry.get().strip().title()
-            program['college'] = college_widget.get()
-            ok, msg = validate_program(program)
-            if not ok:
-                self.controller.show_custom_dialog("Error", msg, dialog_type="error")
-                return
             try:
-                save_csv('program', self.controller.programs)
+                ok, msg = self.controller.store.update('program', program['code'], {
+                    'name': name_entry.get().strip().title(),
+                    'college': college_widget.get(),
+                })
             except Exception:
                 self.controller.show_custom_dialog("Error", "Failed to save program", dialog_type="error")
                 return
+            if not ok:
+                self.controller.show_custom_dialog("Error", msg, dialog_type="error")
+                return
             edit_window.destroy()
-            self.refresh_table()
             self.controller.show_custom_dialog("Success", "Program updated successfully!")
         
         def delete():
             if self.controller.show_custom_dialog("Confirm Delete", f"Delete {program['code']}?", dialog_type="yesno"):
-                self.controller.programs.remove(program)
-                save_csv('program', self.controller.programs)
+                self.controller.store.delete('program', program['code'])
                 edit_window.destroy()
-                self.refresh_table()
                 self.controller.show_custom_dialog("Success", "Program deleted successfully!")
         
         ctk.CTkButton(button_frame, text="Save Changes", command=save, height=40,
@@ -865,9 +771,8 @@ class ProgramsView(ctk.CTkFrame):
                      fg_color="#c41e3a", font=FONT_BOLD).pack(side="left", fill="x", expand=True, padx=(5, 0))
 
     def import_data(self):
-        """Import programs from CSV file."""
+        """Import programs from CSV file on a background worker."""
         from tkinter import filedialog
-        import csv
         
         file_path = filedialog.askopenfilename(
             title="Select CSV file to import",
@@ -877,71 +782,8 @@ class ProgramsView(ctk.CTkFrame):
         if not file_path:
             return
         
-        try:
-            imported_count = 0
-            error_count = 0
-            errors = []
-            
-            with open(file_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                existing_codes = set()
-                
-                # load existing codes
-                try:
-                    import csv as csv_module
-                    with open(FILES['program'], 'r', encoding='utf-8') as existing:
-                        existing_reader = csv_module.DictReader(existing)
-                        for row in existing_reader:
-                            existing_codes.add(row['code'])
-                except:
-                    pass
-                
-                rows_to_add = []
-                for row_num, row in enumerate(reader, start=2):
-                    # validate the row
-                    is_valid, error_msg = validate_program({
-                        'code': row.get('code', ''),
-                        'name': row.get('name', ''),
-                        'college': row.get('college', '')
-                    })
-                    
-                    if not is_valid:
-                        error_count += 1
-                        errors.append(f"Row {row_num}: {error_msg}")
-                        continue
-                    
-                    # check if code already exists
-                    if row.get('code') in existing_codes:
-                        error_count += 1
-                        errors.append(f"Row {row_num}: Program code {row.get('code')} already exists")
-                        continue
-                    
-                    rows_to_add.append(row)
-                    existing_codes.add(row.get('code'))
-                    imported_count += 1
-                
-                # append to CSV file
-                if rows_to_add:
-                    with open(FILES['program'], 'a', newline='', encoding='utf-8') as f:
-                        writer = csv.DictWriter(f, fieldnames=['code', 'name', 'college'])
-                        for row in rows_to_add:
-                            writer.writerow({
-                                'code': row.get('code', ''),
-                                'name': row.get('name', ''),
-                                'college': row.get('college', '')
-                            })
-                    
-                    self.refresh_table()
-            
-            # show results
-            if error_count == 0:
-                self.controller.show_custom_dialog("Import Success", f"Successfully imported {imported_count} programs!")
-            else:
-                error_msg = "\n".join(errors[:10])
-                if len(errors) > 10:
-                    error_msg += f"\n... and {len(errors) - 10} more errors"
-                self.controller.show_custom_dialog("Import Complete", f"Imported {imported_count} programs.\n{error_count} errors:\n\n{error_msg}", dialog_type="warning")
-        
-        except Exception as e:
-            self.controller.show_custom_dialog("Import Error", f"Failed to import: {str(e)}", dialog_type="error")
+        # the worker checks duplicates against a snapshot of the in-memory codes
+        existing_codes = {c.get('code', '') for c in self.controller.programs}
+        job = ImportJob('program', file_path, existing_codes).start()
+        run_import(self, self.controller, job, "programs")
 
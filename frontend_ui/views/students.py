@@ -4,14 +4,42 @@ Students view module extracted from original views.py
 import customtkinter as ctk
 import tkinter as tk
 from tkinter import ttk
+from collections.abc import Sequence
 
 from config import (
     FONT_MAIN, FONT_BOLD, BG_COLOR, PANEL_COLOR, ACCENT_COLOR, 
-    TEXT_MUTED, BORDER_COLOR, COLOR_PALETTE, TEXT_PRIMARY, FILES
+    TEXT_MUTED, BORDER_COLOR, COLOR_PALETTE, TEXT_PRIMARY
 )
 from config import get_font
-from frontend_ui.ui import DepthCard, setup_treeview_style, placeholder_image, get_icon, SearchableComboBox, StyledComboBox
-from backend import validate_student, save_csv
+from frontend_ui.ui import DepthCard, setup_treeview_style, placeholder_image, get_icon, SearchableComboBox, StyledComboBox, VirtualTable, run_import
+from backend import program_lookup, ImportJob, LazyRows
+from backend.sort import TableSorter
+from backend.search import StudentSearch
+
+
+class _LiveRows(Sequence):
+    """Table rows of a lazily loaded students list, built as the table reads them.
+
+    Only the shown page's students get decoded, and every row reflects the
+    store as it is when read.
+    """
+
+    def __init__(self, students, programs):
+        self.students = students
+        self.programs = programs
+
+    def __len__(self):
+        return len(self.students)
+
+    def __getitem__(self, i):
+        lookup = program_lookup(self.programs)
+        if isinstance(i, slice):
+            return [StudentsView._row(student, lookup) for student in self.students[i]]
+        return StudentsView._row(self.students[i], lookup)
+
+    def __iter__(self):
+        lookup = program_lookup(self.programs)
+        return (StudentsView._row(student, lookup) for student in self.students)
 
 
 class StudentsView(ctk.CTkFrame):
@@ -22,6 +50,7 @@ class StudentsView(ctk.CTkFrame):
         self.grid_columnconfigure(0, weight=1)
         self.sort_column = None
         self.sort_reverse = False
+        self._sorter = TableSorter()
         self.column_names = {}  # store original column names
         self.setup_ui()
 
@@ -58,7 +87,8 @@ class StudentsView(ctk.CTkFrame):
         self.current_page = 1
         self.page_size = 12
         self._last_page_items = []
-        self._last_hover = None
+        self._row_pos = None    # student id -> index in _last_page_items
+        self._filtered = False  # showing search results rather than every student
         self.table_container = table_container
 
         # left section: Previous button, pagination, and Next button together
@@ -80,7 +110,6 @@ class StudentsView(ctk.CTkFrame):
         # pagination indicator frame
         self.pagination_frame = ctk.CTkFrame(left_ctrl, fg_color="transparent")
         self.pagination_frame.pack(side="left", padx=8)
-        self.page_buttons = []
         
         # next Button - right next to pagination
         self.next_btn = ctk.CTkButton(
@@ -121,6 +150,10 @@ class StudentsView(ctk.CTkFrame):
                                              font=get_font(13), text_color=TEXT_MUTED)
         self.entry_count_label.pack(side="left", padx=0)
 
+        # pooled rows and page buttons, rewritten in place on every render
+        self.table = VirtualTable(self.tree, self.pagination_frame, self.prev_btn, self.next_btn,
+                                  self.entry_count_label, self.goto_page)
+
         # bind configure event to update page size dynamically
         table_container.bind('<Configure>', self._on_table_configure)
         
@@ -142,67 +175,91 @@ class StudentsView(ctk.CTkFrame):
         """Sidebar removed - table now takes full width."""
         pass
 
-    def _refresh_all_sidebars(self):
-        """Sidebar removed - no longer needed."""
-        pass
+    @staticmethod
+    def _row(student, lookup):
+        college = lookup.college_of(student.get('program', ''))
+        return (student.get('id', ''), student.get('firstname', ''), student.get('lastname', ''), student.get('gender', ''), student.get('year', ''), student.get('program', ''), college)
 
     def refresh_table(self):
-        rows = []
-        for student in self.controller.students:
-            college = next((p['college'] for p in self.controller.programs if p['code'] == student.get('program', '')), 'N/A')
-            rows.append((student.get('id', ''), student.get('firstname', ''), student.get('lastname', ''), student.get('gender', ''), student.get('year', ''), student.get('program', ''), college))
+        students = self.controller.students
+        if isinstance(students, LazyRows):
+            rows = _LiveRows(students, self.controller.programs)
+        else:
+            lookup = program_lookup(self.controller.programs)
+            rows = [self._row(student, lookup) for student in students]
 
         self._last_page_items = rows
+        self._row_pos = None
+        self._filtered = False
         self.current_page = min(max(1, self.current_page), max(1, (len(rows) + self.page_size - 1) // self.page_size))
         self._render_page()
-        self._last_hover = None
-        self._last_hover = None
+
+    def _positions(self):
+        """Student id -> index in _last_page_items, rebuilt only after the list is replaced."""
+        if self._row_pos is None:
+            self._row_pos = {row[0]: i for i, row in enumerate(self._last_page_items)}
+        return self._row_pos
+
+    def apply_changes(self, events):
+        """Patch the rows of the students named by store `events` and re-render the page.
+
+        Students of a changed program are patched too (their college column).
+        A reload, or new students while search results are shown, rebuilds
+        the table instead. Live rows over a lazily loaded table only need
+        re-rendering.
+        """
+        store = self.controller.store
+        live = isinstance(self._last_page_items, _LiveRows)
+        ids = {}
+        renames = []
+        for event in events:
+            if event.op == 'reload' or (event.op == 'insert' and event.table == 'student' and self._filtered):
+                self.refresh_table()
+                return
+            if live:
+                continue
+            if event.table == 'student':
+                ids.update(dict.fromkeys(event.keys))
+                if event.op == 'update' and len(event.keys) == 2:
+                    renames.append(event.keys)
+            elif event.table == 'program':
+                rel = store.relations()
+                for code in event.keys:
+                    ids.update(dict.fromkeys(rel.student_ids_in_program(code)))
+        if live:
+            self._render_page()
+            return
+        if not ids:
+            return
+
+        rows = self._last_page_items
+        pos = self._positions()
+        for old, new in renames:
+            # a renamed student keeps its place in the table
+            if old in pos and new not in pos:
+                pos[new] = pos.pop(old)
+        lookup = program_lookup(self.controller.programs)
+        gone = set()
+        for student_id in ids:
+            student = store.student(student_id)
+            i = pos.get(student_id)
+            if student is None:
+                if i is not None:
+                    gone.add(student_id)
+            elif i is not None:
+                rows[i] = self._row(student, lookup)
+            elif not self._filtered:
+                pos[student_id] = len(rows)
+                rows.append(self._row(student, lookup))
+        if gone:
+            rows[:] = [row for row in rows if row[0] not in gone]
+            self._row_pos = None
+        self._sorter.invalidate()
+        self._render_page()
 
     def _render_page(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        total = len(self._last_page_items)
-        per = self.page_size
-        total_pages = max(1, (total + per - 1) // per)
-        self.current_page = min(self.current_page, total_pages)
-        start = (self.current_page - 1) * per
-        end = min(start + per, total)
-        for idx, row in enumerate(self._last_page_items[start:end]):
-            tag = 'even' if idx % 2 == 0 else 'odd'
-            self.tree.insert("", "end", values=row, tags=(tag,))
-        
-        # update entry count - show range (e.g., "Showing 1-12 of 100 entries")
-        if total > 0:
-            display_text = f"Showing {start + 1}-{end} of {total} entries"
-        else:
-            display_text = "Showing 0 of 0 entries"
-        self.entry_count_label.configure(text=display_text)
-        
-        for btn in self.page_buttons:
-            btn.destroy()
-        self.page_buttons.clear()
-        
-        start_page = max(1, self.current_page - 2)
-        end_page = min(total_pages, start_page + 4)
-        if end_page - start_page < 4:
-            start_page = max(1, end_page - 4)
-        
-        for p in range(start_page, end_page + 1):
-            is_current = p == self.current_page
-            btn = ctk.CTkButton(
-                self.pagination_frame, 
-                text=str(p), 
-                width=32, 
-                height=28,
-                fg_color=ACCENT_COLOR if is_current else "#3b3b3f",
-                command=lambda page=p: self.goto_page(page)
-            )
-            btn.pack(side="left", padx=2)
-            self.page_buttons.append(btn)
-        
-        self.prev_btn.configure(state=("normal" if self.current_page > 1 else "disabled"))
-        self.next_btn.configure(state=("normal" if self.current_page < total_pages else "disabled"))
-    
+        self.current_page = self.table.render(self._last_page_items, self.current_page, self.page_size)
+
     def goto_page(self, page):
         self.current_page = page
         self._render_page()
@@ -261,55 +318,10 @@ class StudentsView(ctk.CTkFrame):
         pass
 
     def _on_tree_motion(self, event):
-        region = self.tree.identify_region(event.x, event.y)
-        # change cursor to hand when hovering over sortable headings
-        if region == "heading":
-            self.tree.configure(cursor="hand2")
-            # clear any row hover
-            if getattr(self, '_last_hover', None):
-                prev_row = self._last_hover
-                if prev_row in self.tree.get_children():
-                    items = self.tree.get_children()
-                    if prev_row in items:
-                        idx = items.index(prev_row)
-                        tag = 'even' if idx % 2 == 0 else 'odd'
-                        self.tree.item(prev_row, tags=(tag,))
-                self._last_hover = None
-            return
-        else:
-            self.tree.configure(cursor="")
-        
-        row = self.tree.identify_row(event.y)
-        if not row:
-            return
-        if getattr(self, '_last_hover', None) == row:
-            return
-        if getattr(self, '_last_hover', None):
-            prev_row = self._last_hover
-            # check if the previous row still exists
-            if prev_row in self.tree.get_children():
-                items = self.tree.get_children()
-                if prev_row in items:
-                    idx = list(items).index(prev_row)
-                    tag = 'even' if idx % 2 == 0 else 'odd'
-                    self.tree.item(prev_row, tags=(tag,))
-        # set hover tag as the only tag for this row
-        self.tree.item(row, tags=('hover',))
-        self._last_hover = row
+        self.table.on_motion(event)
 
     def _on_tree_leave(self, event):
-        self.tree.configure(cursor="")
-        if getattr(self, '_last_hover', None):
-            prev_row = self._last_hover
-            # check if the row still exists
-            if prev_row in self.tree.get_children():
-                # restore the striping tag
-                items = self.tree.get_children()
-                if prev_row in items:
-                    idx = items.index(prev_row)
-                    tag = 'even' if idx % 2 == 0 else 'odd'
-                    self.tree.item(prev_row, tags=(tag,))
-            self._last_hover = None
+        self.table.on_leave(event)
 
     def on_row_click(self, event):
         region = self.tree.identify_region(event.x, event.y)
@@ -319,18 +331,26 @@ class StudentsView(ctk.CTkFrame):
                 self.tree.selection_set(item)
 
     def filter_table(self, query):
-        rows = []
-        for student in self.controller.students:
-            college = next((p['college'] for p in self.controller.programs if p['code'] == student.get('program', '')), 'N/A')
-            if (query in student.get('firstname', '').lower() or 
-                query in student.get('lastname', '').lower() or
-                query in student.get('id', '').lower() or
-                query in student.get('gender', '').lower() or
-                query in student.get('program', '').lower() or
-                query in str(student.get('year', '')).lower() or
-                query in college.lower()):
-                rows.append((student.get('id', ''), student.get('firstname', ''), student.get('lastname', ''), student.get('gender', ''), student.get('year', ''), student.get('program', ''), college))
+        self.show_filtered_rows(self.filter_rows(query))
+
+    def filter_rows(self, query):
+        """Build the table rows matching `query`.
+
+        No widget access; holds the store lock, so it can run off the main thread.
+        """
+        with self.controller.store.lock:
+            return self._filter_rows(query)
+
+    def _filter_rows(self, query):
+        lookup = program_lookup(self.controller.programs)
+        students = StudentSearch.global_search(self.controller.students, self.controller.programs, query)
+        return [self._row(student, lookup) for student in students]
+
+    def show_filtered_rows(self, rows):
+        """Show rows from :meth:`filter_rows` starting at the first page."""
         self._last_page_items = rows
+        self._row_pos = None
+        self._filtered = True
         self.current_page = 1
         self._render_page()
 
@@ -382,23 +402,17 @@ class StudentsView(ctk.CTkFrame):
         if not self.sort_column:
             return
         
-        # sort the entire _last_page_items list
+        # sort the entire _last_page_items list (earlier sort columns break ties)
         col_index = self.tree['columns'].index(self.sort_column) if self.sort_column in self.tree['columns'] else 0
-        self._last_page_items.sort(key=lambda x: self.try_numeric(str(x[col_index])), reverse=self.sort_reverse)
+        self._last_page_items = self._sorter.sort(self._last_page_items, col_index, self.sort_reverse)
+        self._row_pos = None
         
         # re-render the current page
         self._render_page()
-    
-    @staticmethod
-    def try_numeric(val):
-        try:
-            return float(val)
-        except ValueError:
-            return val
 
     def _show_student_profile(self, student_id):
         """Show student profile in a new window."""
-        student = next((s for s in self.controller.students if s['id'] == student_id), None)
+        student = self.controller.store.student(student_id)
         if not student:
             self.controller.show_custom_dialog("Error", "Student not found", dialog_type="error")
             return
@@ -463,8 +477,9 @@ class StudentsView(ctk.CTkFrame):
         add_info_row("Year Level:", student.get('year', 'N/A'))
         add_info_row("Program:", student.get('program', 'N/A'))
         
-        program_name = next((p['name'] for p in self.controller.programs if p['code'] == student.get('program')), 'N/A')
-        college_name = next((c['name'] for c in self.controller.colleges if c['code'] == next((p['college'] for p in self.controller.programs if p['code'] == student.get('program')), '')), 'N/A')
+        lookup = program_lookup(self.controller.programs)
+        college_code = lookup.college_of(student.get('program'), '')
+        college_name = next((c['name'] for c in self.controller.colleges if c['code'] == college_code), 'N/A')
         add_info_row("College:", college_name)
 
         # action buttons - only show if authenticated
@@ -494,7 +509,7 @@ class StudentsView(ctk.CTkFrame):
             self.controller.show_custom_dialog("Access Denied", "You must log in to edit students.")
             return
         
-        student = next((s for s in self.controller.students if s['id'] == student_id), None)
+        student = self.controller.store.student(student_id)
         if not student:
             self.controller.show_custom_dialog("Error", "Student not found", dialog_type="error")
             return
@@ -581,33 +596,28 @@ class StudentsView(ctk.CTkFrame):
                 self.controller.show_custom_dialog("Validation Error", error_msg, dialog_type="error")
                 return
 
-            student['firstname'] = fname_entry.get().strip().title()
-            student['lastname'] = lname_entry.get().strip().title()
-            student['gender'] = gender_combo.get()
-            student['year'] = year_combo.get()
-            student['program'] = program_widget.get()
-
-            ok, msg = validate_student(student)
-            if not ok:
-                self.controller.show_custom_dialog("Error", msg, dialog_type="error")
-                return
-
             try:
-                save_csv('student', self.controller.students)
+                ok, msg = self.controller.store.update('student', student['id'], {
+                    'firstname': fname_entry.get().strip().title(),
+                    'lastname': lname_entry.get().strip().title(),
+                    'gender': gender_combo.get(),
+                    'year': year_combo.get(),
+                    'program': program_widget.get(),
+                })
             except Exception:
                 self.controller.show_custom_dialog("Error", "Failed to save student", dialog_type="error")
                 return
+            if not ok:
+                self.controller.show_custom_dialog("Error", msg, dialog_type="error")
+                return
 
             edit_window.destroy()
-            self.refresh_table()
             self.controller.show_custom_dialog("Success", "Student updated successfully!")
 
         def delete():
             if self.controller.show_custom_dialog("Confirm Delete", f"Delete {student['id']}?", dialog_type="yesno"):
-                self.controller.students.remove(student)
-                save_csv('student', self.controller.students)
+                self.controller.store.delete('student', student['id'])
                 edit_window.destroy()
-                self.refresh_table()
                 self.controller.show_custom_dialog("Success", "Student deleted successfully!")
 
         btn_frame = ctk.CTkFrame(form_frame, fg_color="transparent")
@@ -623,15 +633,13 @@ class StudentsView(ctk.CTkFrame):
             self.controller.show_custom_dialog("Access Denied", "You must log in to delete students.")
             return
         
-        student = next((s for s in self.controller.students if s['id'] == student_id), None)
+        student = self.controller.store.student(student_id)
         if not student:
             self.controller.show_custom_dialog("Error", "Student not found", dialog_type="error")
             return
 
         if self.controller.show_custom_dialog("Confirm Delete", f"Delete student {student_id}?", dialog_type="yesno"):
-            self.controller.students.remove(student)
-            save_csv('student', self.controller.students)
-            self.refresh_table()
+            self.controller.store.delete('student', student_id)
             self.controller.show_custom_dialog("Success", "Student deleted successfully!")
 
     def delete_student(self):
@@ -720,7 +728,7 @@ class StudentsView(ctk.CTkFrame):
                 return False, "Student ID must follow the format 202X-XXXX (e.g. 2024-0001)"
             
             # check for duplicate ID
-            if any(s['id'] == student_id for s in self.controller.students):
+            if self.controller.store.student(student_id) is not None:
                 return False, "Student ID already exists"
             
             # check name format (only letters and spaces)
@@ -752,19 +760,11 @@ class StudentsView(ctk.CTkFrame):
                 'year': year,
                 'program': program,
             }
-            ok, msg = validate_student(new_student)
+            ok, msg = self.controller.store.create('student', new_student)
             if not ok:
                 self.controller.show_custom_dialog("Error", msg, dialog_type="error")
                 return
             
-            self.controller.students.append(new_student)
-            save_csv('student', self.controller.students)
-            self.refresh_table()
-            try:
-                self.refresh_sidebar()
-                self._refresh_all_sidebars()
-            except Exception:
-                pass
             modal.destroy()
             self.controller.show_custom_dialog("Success", "Student added successfully!")
         
@@ -777,14 +777,13 @@ class StudentsView(ctk.CTkFrame):
                  fg_color="#555555", text_color="white", font=FONT_BOLD).pack(side="left", fill="x", expand=True, padx=(6, 0))
 
     def import_data(self):
-        """Import students from CSV file."""
+        """Import students from CSV file on a background worker."""
         # check authentication
         if not self.controller.logged_in:
             self.controller.show_custom_dialog("Access Denied", "You must log in to import students.")
             return
         
         from tkinter import filedialog
-        import csv
         
         file_path = filedialog.askopenfilename(
             title="Select CSV file to import",
@@ -794,79 +793,10 @@ class StudentsView(ctk.CTkFrame):
         if not file_path:
             return
         
-        try:
-            imported_count = 0
-            error_count = 0
-            errors = []
-            
-            with open(file_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                existing_ids = set()
-                
-                # load existing IDs
-                try:
-                    import csv as csv_module
-                    with open(FILES['student'], 'r', encoding='utf-8') as existing:
-                        existing_reader = csv_module.DictReader(existing)
-                        for row in existing_reader:
-                            existing_ids.add(row['id'])
-                except:
-                    pass
-                
-                rows_to_add = []
-                for row_num, row in enumerate(reader, start=2):
-                    # validate the row
-                    is_valid, error_msg = validate_student({
-                        'id': row.get('id', ''),
-                        'firstname': row.get('firstname', ''),
-                        'lastname': row.get('lastname', ''),
-                        'program': row.get('program', ''),
-                        'year': row.get('year', ''),
-                        'gender': row.get('gender', '')
-                    })
-                    
-                    if not is_valid:
-                        error_count += 1
-                        errors.append(f"Row {row_num}: {error_msg}")
-                        continue
-                    
-                    # check if ID already exists
-                    if row.get('id') in existing_ids:
-                        error_count += 1
-                        errors.append(f"Row {row_num}: Student ID {row.get('id')} already exists")
-                        continue
-                    
-                    rows_to_add.append(row)
-                    existing_ids.add(row.get('id'))
-                    imported_count += 1
-                
-                # append to CSV file
-                if rows_to_add:
-                    with open(FILES['student'], 'a', newline='', encoding='utf-8') as f:
-                        writer = csv.DictWriter(f, fieldnames=['id', 'firstname', 'lastname', 'program', 'year', 'gender'])
-                        for row in rows_to_add:
-                            writer.writerow({
-                                'id': row.get('id', ''),
-                                'firstname': row.get('firstname', ''),
-                                'lastname': row.get('lastname', ''),
-                                'program': row.get('program', ''),
-                                'year': row.get('year', ''),
-                                'gender': row.get('gender', '')
-                            })
-                    
-                    self.refresh_table()
-            
-            # show results
-            if error_count == 0:
-                self.controller.show_custom_dialog("Import Success", f"Successfully imported {imported_count} students!")
-            else:
-                error_msg = "\n".join(errors[:10])
-                if len(errors) > 10:
-                    error_msg += f"\n... and {len(errors) - 10} more errors"
-                self.controller.show_custom_dialog("Import Complete", f"Imported {imported_count} students.\n{error_count} errors:\n\n{error_msg}", dialog_type="warning")
-        
-        except Exception as e:
-            self.controller.show_custom_dialog("Import Error", f"Failed to import: {str(e)}", dialog_type="error")
+        # the worker checks duplicates against a snapshot of the in-memory ids
+        existing_ids = {s.get('id', '') for s in self.controller.students}
+        job = ImportJob('student', file_path, existing_ids).start()
+        run_import(self, self.controller, job, "students")
 
 
 
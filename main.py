@@ -5,6 +5,7 @@ Main entry point for nexo SIS application.
 import os
 import sys
 import tempfile
+import multiprocessing
 
 # matplotlib needs a writable config/cache dir — critical inside a frozen PyInstaller exe
 # where _MEIPASS is read-only. Point it to a persistent temp folder before any import.
@@ -15,8 +16,8 @@ if getattr(sys, 'frozen', False):
     os.environ.setdefault('MPLBACKEND', 'TkAgg')
 
 import customtkinter as ctk
-from config import BG_COLOR, WINDOW_WIDTH, WINDOW_HEIGHT, resource_path
-from backend import init_files, load_csv
+from config import BG_COLOR, WINDOW_WIDTH, WINDOW_HEIGHT, BACKUP_INTERVAL_MS, resource_path
+from backend import DataStore, compact_journals, create_backups_async
 from frontend_ui.auth import LoginFrame
 from frontend_ui.dashboard import DashboardFrame
 from frontend_ui.ui.utils import show_dialog
@@ -40,6 +41,12 @@ class App(ctk.CTk):
         self.show_frame(DashboardFrame, fade=False)
         self.protocol("WM_DELETE_WINDOW", self._on_close)
         self.report_callback_exception = self._handle_callback_exception
+        self.after(BACKUP_INTERVAL_MS, self._scheduled_backup)
+
+    def _scheduled_backup(self):
+        """Snapshot the tables in the background (a no-op when nothing changed)."""
+        create_backups_async(reason="scheduled")
+        self.after(BACKUP_INTERVAL_MS, self._scheduled_backup)
 
     def _handle_callback_exception(self, exc_type, exc_val, exc_tb):
         """Suppress KeyboardInterrupt in Tkinter callbacks; log everything else."""
@@ -49,7 +56,7 @@ class App(ctk.CTk):
         traceback.print_exception(exc_type, exc_val, exc_tb)
 
     def _on_close(self):
-        """Cancel all pending after() callbacks before destroying to suppress bgerror noise."""
+        """Cancel pending after() callbacks, fold change journals into the CSVs and close."""
         try:
             for after_id in self.tk.eval('after info').split():
                 try:
@@ -58,18 +65,26 @@ class App(ctk.CTk):
                     pass
         except Exception:
             pass
+        compact_journals()
         self.destroy()
 
     def _load_data(self):
-        """Initialise CSV files and load all data, falling back to empty lists on error."""
-        init_files()
-        for key, attr in (('college', 'colleges'), ('program', 'programs'), ('student', 'students')):
-            try:
-                setattr(self, attr, load_csv(key))
-            except Exception:
-                import traceback
-                traceback.print_exc()
-                setattr(self, attr, [])
+        """Create the data store and load every table into it."""
+        self.store = DataStore()
+        self.store.load()
+
+    # the store owns the tables; views read them through these
+    @property
+    def students(self):
+        return self.store.students
+
+    @property
+    def programs(self):
+        return self.store.programs
+
+    @property
+    def colleges(self):
+        return self.store.colleges
 
     def _build_frames(self):
         """Create the root container and instantiate all application frames."""
@@ -148,4 +163,7 @@ def main():
 
 
 if __name__ == "__main__":
+    # batch validation starts worker processes; a frozen exe must hand
+    # those off before building the UI
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,119 @@
+"""
+Shared fixtures: every test runs against its own copy of the data files.
+"""
+
+import csv
+import os
+import random
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from backend import storage, backups
+from backend.search import invalidate_search_caches
+
+
+COLLEGES = [
+    {'code': 'CCS', 'name': 'College of Computer Studies'},
+    {'code': 'COE', 'name': 'College of Engineering'},
+    {'code': 'CSM', 'name': 'College of Science and Mathematics'},
+]
+
+PROGRAMS = [
+    {'code': 'BSCS', 'name': 'Bachelor of Science in Computer Science', 'college': 'CCS'},
+    {'code': 'BSIT', 'name': 'Bachelor of Science in Information Technology', 'college': 'CCS'},
+    {'code': 'BSCE', 'name': 'Bachelor of Science in Civil Engineering', 'college': 'COE'},
+    {'code': 'BSME', 'name': 'Bachelor of Science in Mechanical Engineering', 'college': 'COE'},
+    {'code': 'BSBio', 'name': 'Bachelor of Science in Biology', 'college': 'CSM'},
+]
+
+FIRST_NAMES = ['Ana', 'Ben', 'Carla', 'Dan', 'Ella', 'Felix', 'Gina', 'Hugo']
+LAST_NAMES = ['Lim', 'Cruz', 'Santos', 'Reyes', 'Mercado', 'Tan']
+
+
+def make_students(n, programs=PROGRAMS):
+    """`n` valid student rows spread over `programs`, plus a few without one."""
+    codes = [p['code'] for p in programs] + ['']
+    return [{
+        'id': f"2024-{i:04d}",
+        'firstname': FIRST_NAMES[i % len(FIRST_NAMES)],
+        'lastname': LAST_NAMES[i % len(LAST_NAMES)],
+        'program': codes[i % len(codes)],
+        'year': str(i % 4 + 1),
+        'gender': ('Male', 'Female', 'Other')[i % 3],
+    } for i in range(n)]
+
+
+def random_changes(store, steps, seed):
+    """Apply `steps` random creates, edits, renames and deletes through `store`."""
+    rng = random.Random(seed)
+    for step in range(steps):
+        codes = [p['code'] for p in store.programs] + ['GHOST']
+        action = rng.random()
+        if action < 0.3:
+            store.create('student', dict(make_students(1)[0], id=f"2029-{step:04d}", program=rng.choice(codes),
+                                         gender=rng.choice(['Male', 'Female']), year=str(rng.randint(1, 4))))
+        elif action < 0.5 and store.students:
+            student = rng.choice(store.students)
+            store.update('student', student['id'], {'program': rng.choice(codes), 'year': str(rng.randint(1, 4))})
+        elif action < 0.55 and store.students:
+            store.update('student', rng.choice(store.students)['id'], {'id': f"2028-{step:04d}"})
+        elif action < 0.7 and store.students:
+            store.delete('student', rng.choice(store.students)['id'])
+        elif action < 0.8:
+            code = f"P{step}"
+            store.create('program', {'code': code, 'name': 'Program', 'college': rng.choice(['CCS', 'COE', 'CSM'])})
+        elif action < 0.88 and store.programs:
+            store.update('program', rng.choice(store.programs)['code'], {'college': rng.choice(['CCS', 'COE', 'CSM'])})
+        elif action < 0.94 and store.programs:
+            store.delete_program(rng.choice(store.programs)['code'])
+        elif store.colleges:
+            store.delete_college(rng.choice(store.colleges)['code'])
+        yield step
+
+
+def write_table(key, rows):
+    with open(config.FILES[key], 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=config.FIELDS[key])
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def read_table(key):
+    """The rows of table `key` as the csv module reads them, journal included."""
+    return [dict(r) for r in storage.load_csv(key)]
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Point every table, journal, manifest, cache and backup at `tmp_path`."""
+    for key, path in list(config.FILES.items()):
+        monkeypatch.setitem(config.FILES, key, str(tmp_path / os.path.basename(path)))
+    manifest = str(tmp_path / '.commit.json')
+    monkeypatch.setattr(config, 'COMMIT_MANIFEST', manifest)
+    monkeypatch.setattr(storage, 'COMMIT_MANIFEST', manifest)
+    monkeypatch.setattr(storage, 'CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setattr(storage, '_journal_counts', {})
+    monkeypatch.setattr(backups, 'BACKUP_DIR', str(tmp_path / 'backups'))
+    invalidate_search_caches()
+    yield tmp_path
+    # background backups (e.g. before a cascading delete) must finish before
+    # BACKUP_DIR points back at the real one
+    for thread in threading.enumerate():
+        if thread.name == 'backup':
+            thread.join()
+    invalidate_search_caches()
+
+
+@pytest.fixture
+def tables(data_dir):
+    """Seed the tables with a small college/program/student data set."""
+    write_table('college', COLLEGES)
+    write_table('program', PROGRAMS)
+    write_table('student', make_students(120))
+    storage.init_files()
+    return data_dir
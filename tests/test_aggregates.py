@@ -0,0 +1,40 @@
+"""
+Incrementally maintained enrollment counters against a fresh recount.
+"""
+
+import pytest
+
+from backend import DataStore
+from backend.aggregates import EnrollmentStats
+from conftest import random_changes
+
+
+COUNTERS = ('students_per_program', 'students_per_college', 'programs_per_college', 'by_year', 'by_gender')
+
+
+def counters(stats):
+    # a counter may keep a key at zero after decrements
+    return {name: {k: v for k, v in getattr(stats, name).items() if v} for name in COUNTERS}
+
+
+@pytest.mark.parametrize('seed', [1, 2])
+def test_counters_match_a_fresh_recount(tables, seed):
+    store = DataStore()
+    store.load()
+    stats = store.stats()
+    for step in random_changes(store, 150, seed):
+        if step % 25 == 0:
+            assert counters(stats) == counters(EnrollmentStats(store.students, store.programs)), step
+    assert store.stats() is stats
+    assert counters(stats) == counters(EnrollmentStats(store.students, store.programs))
+
+
+def test_queries(tables):
+    store = DataStore()
+    store.load()
+    stats = store.stats()
+    students = store.students
+    assert stats.students_in_program('BSCS') == sum(s['program'] == 'BSCS' for s in students)
+    assert stats.students_in_college('CCS') == sum(s['program'] in ('BSCS', 'BSIT') for s in students)
+    assert stats.programs_in_college('COE') == 2
+    assert stats.top_programs(2) == sorted(stats.students_per_program.items(), key=lambda kv: -kv[1])[:2]
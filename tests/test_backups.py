@@ -0,0 +1,140 @@
+"""
+Incremental snapshots, restores and the pinned pre-delete backup.
+"""
+
+import os
+import threading
+
+from backend import backups, storage, DataStore
+from conftest import read_table
+
+
+TABLES = ('college', 'program', 'student')
+
+
+def _objects():
+    return sorted(os.listdir(os.path.join(backups.BACKUP_DIR, 'objects')))
+
+
+def _join_backup_threads():
+    for worker in threading.enumerate():
+        if worker.name == 'backup':
+            worker.join()
+
+
+def test_unchanged_tables_reuse_the_last_snapshot(tables):
+    first = backups.create_backups()
+    objects = _objects()
+
+    assert backups.create_backups() == first
+    assert _objects() == objects
+    assert [b['id'] for b in backups.list_backups()] == [first]
+
+
+def test_only_changed_tables_add_objects(tables):
+    backups.create_backups()
+    objects = set(_objects())
+
+    storage.save_csv('college', read_table('college')[:1])
+    second = backups.create_backups(reason='after edit')
+
+    assert len(set(_objects()) - objects) == 1
+    assert backups.list_backups()[0]['id'] == second
+    assert backups.list_backups()[0]['reason'] == 'after edit'
+
+
+def test_snapshot_includes_pending_journal(tables):
+    row = dict(read_table('program')[0], name='Journaled Name')
+    storage.log_change('program', 'update', row)
+    snapshot = backups.create_backups()
+    expected = read_table('program')
+
+    storage.save_csv('program', [])
+    backups.restore_backup(snapshot, keys=['program'])
+
+    assert read_table('program') == expected
+
+
+def test_restore_brings_back_every_table_and_can_be_undone(tables):
+    before = {key: read_table(key) for key in TABLES}
+    snapshot = backups.create_backups()
+    storage.save_tables({'college': [], 'program': [], 'student': []})
+    emptied = {key: read_table(key) for key in TABLES}
+
+    restored = backups.restore_backup(snapshot)
+
+    assert {key: read_table(key) for key in TABLES} == before
+    assert {key: [dict(r) for r in restored[key]] for key in TABLES} == before
+    # the state before the restore was pinned and snapshotted in the background
+    _join_backup_threads()
+    assert os.listdir(os.path.join(backups.BACKUP_DIR, 'pinned')) == []
+    undo = backups.list_backups()[0]
+    assert undo['reason'] == f"before restoring {snapshot}"
+    backups.restore_backup(undo['id'])
+    assert {key: read_table(key) for key in TABLES} == emptied
+
+
+def test_rotation_keeps_the_newest_snapshots(tables, monkeypatch):
+    monkeypatch.setattr(backups, 'BACKUP_KEEP', 2)
+    ids = []
+    for i in range(4):
+        storage.save_csv('college', [{'code': f'C{i}', 'name': 'College'}])
+        ids.append(backups.create_backups())
+
+    assert [b['id'] for b in backups.list_backups()] == ids[:1:-1]
+    live = {e['hash'] for b in backups.list_backups() for e in b['tables'].values()}
+    assert {name.split('.', 1)[0] for name in _objects()} == live
+
+
+def test_pinned_tables_ignore_later_changes(tables):
+    storage.log_change('student', 'update', dict(read_table('student')[0], firstname='Pinned'))
+    before = {key: read_table(key) for key in TABLES}
+    pins = backups.pin_tables()
+
+    storage.append_csv('college', [{'code': 'NEW', 'name': 'Appended'}])
+    storage.save_tables({'program': [], 'student': []})
+    worker = backups.create_backups_async(reason='pinned', pins=pins)
+    worker.join()
+
+    assert worker.error is None
+    assert os.listdir(os.path.join(backups.BACKUP_DIR, 'pinned')) == []
+    backups.restore_backup(worker.result)
+    assert {key: read_table(key) for key in TABLES} == before
+
+
+def test_cascading_delete_backs_up_the_state_before_it(tables):
+    store = DataStore()
+    store.load()
+    before = {key: read_table(key) for key in TABLES}
+
+    store.delete_college('CCS')
+    _join_backup_threads()
+
+    latest = backups.list_backups()[0]
+    assert latest['reason'] == 'before delete'
+    backups.restore_backup(latest['id'])
+    assert {key: read_table(key) for key in TABLES} == before
+
+
+def test_objects_are_restored_in_the_encoding_they_were_written_in(tables, monkeypatch):
+    colleges = [{'code': 'PNF', 'name': 'Colegio de Peñafrancia'}, {'code': 'ZRC', 'name': 'Zürich Campus'}]
+    monkeypatch.setattr(backups, '_encoding', lambda: 'cp1252')
+    with open(storage.FILES['college'], 'w', encoding='cp1252', newline='') as f:
+        f.write('code,name\r\n' + ''.join(f"{c['code']},{c['name']}\r\n" for c in colleges))
+    snapshot = backups.create_backups()
+    assert backups.list_backups()[0]['encoding'] == 'cp1252'
+
+    restored = backups.restore_backup(snapshot, keys=['college'])
+    assert restored['college'] == colleges
+    _join_backup_threads()
+
+
+def test_replayed_tables_round_trip_non_ascii_names(tables):
+    row = dict(read_table('college')[0], name='Facultad de Ingeniería')
+    storage.log_change('college', 'update', row)
+    expected = read_table('college')
+    snapshot = backups.create_backups()
+
+    storage.save_csv('college', [])
+    backups.restore_backup(snapshot)
+    assert read_table('college') == expected
@@ -0,0 +1,48 @@
+"""
+NumPy columns against plain loops over the records.
+"""
+
+from collections import Counter
+
+import pytest
+
+from backend import aggregates
+from backend.aggregates import EnrollmentStats
+from conftest import PROGRAMS, make_students
+
+pytest.importorskip('numpy')
+
+from backend.columnar import student_columns  # noqa: E402
+
+
+STUDENTS = make_students(500) + [dict(make_students(1)[0], id='bad-id', program='GHOST')]
+
+
+def college_of(student):
+    return next((p['college'] for p in PROGRAMS if p['code'] == student['program']), None)
+
+
+@pytest.mark.parametrize('column', ['program', 'college', 'year', 'gender'])
+def test_count_by_matches_a_loop(column):
+    columns = student_columns(STUDENTS, PROGRAMS)
+    if column == 'college':
+        expected = Counter(college_of(s) for s in STUDENTS if college_of(s) is not None)
+    else:
+        expected = Counter(s[column] for s in STUDENTS)
+    assert columns.count_by(column) == dict(expected)
+    assert len(columns) == len(STUDENTS)
+
+
+def test_columns_are_built_fresh_for_each_pass():
+    a = student_columns(STUDENTS, PROGRAMS)
+    assert student_columns(STUDENTS, PROGRAMS) is not a
+
+
+def test_columnar_recount_matches_the_loop(monkeypatch):
+    names = ('students_per_program', 'students_per_college', 'programs_per_college', 'by_year', 'by_gender')
+    loop = EnrollmentStats(STUDENTS, PROGRAMS)
+    monkeypatch.setattr(aggregates, 'COLUMNAR_MIN_ROWS', 1)
+    vectorized = EnrollmentStats(STUDENTS, PROGRAMS)
+    for name in names:
+        assert {k: v for k, v in getattr(vectorized, name).items() if v} == \
+            {k: v for k, v in getattr(loop, name).items() if v}, name
@@ -0,0 +1,148 @@
+"""
+Atomic table writes and group commits.
+"""
+
+import os
+
+import pytest
+
+import config
+from backend import storage
+from conftest import COLLEGES, PROGRAMS, read_table
+
+
+def _temp_files(directory):
+    return [n for n in os.listdir(directory) if n.endswith('.tmp')]
+
+
+def test_save_tables_writes_every_table(tables):
+    programs = PROGRAMS[:2]
+    colleges = COLLEGES[:1]
+    storage.log_change('program', 'delete', PROGRAMS[4])
+
+    storage.save_tables({'program': programs, 'college': colleges})
+
+    assert read_table('program') == programs
+    assert read_table('college') == colleges
+    assert not os.path.exists(config.COMMIT_MANIFEST)
+    assert not os.path.exists(storage.journal_path('program'))
+    assert _temp_files(tables) == []
+
+
+class Unwritable(dict):
+    """A row the csv writer fails on."""
+
+    def get(self, *args):
+        raise RuntimeError("cannot serialize")
+
+
+def test_failed_write_leaves_tables_untouched(tables):
+    before = {key: read_table(key) for key in ('program', 'college')}
+
+    with pytest.raises(RuntimeError):
+        storage.save_tables({'college': [{'code': 'X', 'name': 'X'}], 'program': [Unwritable()]})
+
+    assert {key: read_table(key) for key in before} == before
+    assert _temp_files(tables) == []
+
+
+def test_recovery_rolls_an_interrupted_commit_forward(tables):
+    programs = PROGRAMS[1:]
+    colleges = COLLEGES[1:]
+    storage.log_change('program', 'insert', {'code': 'GONE', 'name': 'Gone', 'college': 'CCS'})
+    temps = {'program': storage._write_temp('program', programs),
+             'college': storage._write_temp('college', colleges)}
+    storage._write_manifest({key: [temp, config.FILES[key]] for key, temp in temps.items()})
+    # crash after the first rename
+    os.replace(temps['program'], config.FILES['program'])
+
+    storage.recover_commit()
+
+    assert read_table('program') == programs
+    assert read_table('college') == colleges
+    assert not os.path.exists(config.COMMIT_MANIFEST)
+    assert not os.path.exists(storage.journal_path('program'))
+
+
+def test_recovery_discards_uncommitted_temp_files(tables):
+    before = read_table('student')
+    temp = storage._write_temp('student', [])  # written, but never named by a manifest
+
+    storage.recover_commit()
+
+    assert not os.path.exists(temp)
+    assert read_table('student') == before
+
+
+def test_recovery_ignores_a_corrupt_manifest(tables):
+    before = read_table('college')
+    with open(config.COMMIT_MANIFEST, 'w') as f:
+        f.write('{not json')
+
+    storage.recover_commit()
+
+    assert not os.path.exists(config.COMMIT_MANIFEST)
+    assert read_table('college') == before
+
+
+def _snapshot_files(key):
+    with open(config.FILES[key], 'rb') as f:
+        return f.read(), os.stat(config.FILES[key]).st_mtime_ns
+
+
+def test_journaled_changes_commit_with_the_rewritten_tables(tables):
+    students = read_table('student')
+    storage.log_change('student', 'update', dict(students[0], firstname='Earlier'))
+    with open(storage.journal_path('student'), 'a', newline='') as f:
+        f.write('update,2024-0001,Torn')  # an append cut short by a crash
+    base = _snapshot_files('student')
+    edited = [dict(s, program='') for s in students if s['program'] == 'BSCS']
+
+    storage.save_tables({'program': PROGRAMS[1:]},
+                        {'student': [('update', s, None) for s in edited], 'program': [('delete', PROGRAMS[1], None)]})
+
+    # the students csv is not rewritten, only its journal grows
+    assert _snapshot_files('student') == base
+    expected = {s['id']: s for s in students}
+    expected[students[0]['id']] = dict(students[0], firstname='Earlier')
+    expected.update({s['id']: s for s in edited})
+    assert read_table('student') == list(expected.values())
+    # a rewritten table ignores changes listed for it
+    assert read_table('program') == PROGRAMS[1:]
+    assert not os.path.exists(config.COMMIT_MANIFEST)
+    assert _temp_files(tables) == []
+
+
+def test_recovery_rolls_a_journal_extension_forward(tables):
+    students = read_table('student')
+    edited = dict(students[2], year='4')
+    temps = {'program': storage._write_temp('program', PROGRAMS[2:])}
+    journal = storage._write_journal_temp('student', [('update', edited, None)])
+    storage._write_manifest({'program': [temps['program'], config.FILES['program']],
+                             'student.journal': [journal, storage.journal_path('student')]})
+    # crash before any rename
+
+    storage.recover_commit()
+
+    assert read_table('program') == PROGRAMS[2:]
+    assert read_table('student')[2] == edited
+    assert os.path.exists(storage.journal_path('student'))
+
+
+def test_cascade_journals_only_the_affected_students(tables):
+    from backend import DataStore
+
+    store = DataStore()
+    store.load()
+    base = _snapshot_files('student')
+    affected = [s['id'] for s in store.students if s['program'] == 'BSIT']
+
+    store.delete_program('BSIT')
+
+    assert _snapshot_files('student') == base
+    with open(storage.journal_path('student'), newline='') as f:
+        assert [line.split(',')[1] for line in f] == affected
+    reloaded = DataStore()
+    reloaded.load()
+    assert [dict(s) for s in reloaded.students] == [dict(s) for s in store.students]
+    assert 'BSIT' not in [p['code'] for p in reloaded.programs]
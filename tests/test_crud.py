@@ -0,0 +1,82 @@
+"""
+Primary-key indexes and stored positions of the CRUD layer.
+"""
+
+import random
+
+import pytest
+
+from backend import DataStore
+from backend.crud import StudentCRUD
+from conftest import make_students, random_changes
+
+
+def assert_index_consistent(crud):
+    """`index` and `position()` describe the data list exactly (first record per key)."""
+    first = {}
+    for i, record in enumerate(crud.data):
+        first.setdefault(record.get(crud.KEY, ''), i)
+    assert {key: crud.position(key) for key in crud.index} == first
+    assert all(crud.index[key] is crud.data[pos] for key, pos in first.items())
+    assert crud.index.keys() == first.keys()
+
+
+@pytest.mark.parametrize('seed', [5, 6])
+def test_indexes_follow_every_change(tables, seed):
+    store = DataStore()
+    store.load()
+    for step in random_changes(store, 200, seed):
+        if step % 20 == 0:
+            for key in store.TABLES:
+                assert_index_consistent(store.cruds[key])
+    for key in store.TABLES:
+        assert_index_consistent(store.cruds[key])
+
+
+def test_delete_keeps_the_order_of_the_other_records():
+    students = make_students(5)
+    crud = StudentCRUD(students)
+    rest = [students[0]] + students[2:]
+
+    assert crud.take('2024-0001')['id'] == '2024-0001'
+
+    assert students == rest and all(a is b for a, b in zip(students, rest))
+    assert_index_consistent(crud)
+    assert crud.take('2024-0004') is rest[-1]
+    assert crud.take('missing') is None
+    assert [s['id'] for s in students] == ['2024-0000', '2024-0002', '2024-0003']
+    assert_index_consistent(crud)
+
+
+def test_positions_survive_many_deletes_and_appends(monkeypatch):
+    monkeypatch.setattr(StudentCRUD, 'COMPACT_TOMBSTONES', 8)
+    rng = random.Random(3)
+    students = make_students(300)
+    crud = StudentCRUD(students)
+    for step in range(400):
+        if rng.random() < 0.6 and students:
+            crud.take(rng.choice(students)['id'])
+        else:
+            crud._append(dict(make_students(1)[0], id=f"2030-{step:04d}"))
+        if step % 25 == 0:
+            assert_index_consistent(crud)
+    assert_index_consistent(crud)
+
+
+def test_take_survives_a_list_changed_behind_the_index():
+    students = make_students(6)
+    crud = StudentCRUD(students)
+    students.reverse()  # changed outside the CRUD class
+
+    record = crud.take('2024-0002')
+
+    assert record['id'] == '2024-0002'
+    assert '2024-0002' not in [s['id'] for s in students]
+    assert_index_consistent(crud)
+
+
+def test_duplicate_keys_keep_the_first_record():
+    students = make_students(3) + [dict(make_students(1)[0], firstname='Duplicate')]
+    crud = StudentCRUD(students)
+    assert crud.read('2024-0000') is students[0]
+    assert_index_consistent(crud)
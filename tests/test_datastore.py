@@ -0,0 +1,128 @@
+"""
+DataStore mutations, change events and what reaches storage.
+"""
+
+import pytest
+
+from backend import DataStore, ChangeEvent, EventBus, StudentRecord
+from conftest import make_students, read_table
+
+
+@pytest.fixture
+def store(tables):
+    store = DataStore()
+    store.load()
+    return store
+
+
+@pytest.fixture
+def events(store):
+    received = []
+    store.subscribe(received.append)
+    return received
+
+
+def assert_persisted(store):
+    """The store's tables equal what a fresh load from storage returns."""
+    for key in store.TABLES:
+        assert [dict(r) for r in store.table(key)] == read_table(key), key
+
+
+def test_load_publishes_a_reload_per_table(tables):
+    store = DataStore()
+    received = []
+    store.subscribe(received.append)
+    store.load()
+    assert received == [ChangeEvent(key, 'reload') for key in DataStore.TABLES]
+    assert store.version == 3
+
+
+def test_crud_events_name_the_keys(store, events):
+    student = dict(make_students(1)[0], id='2025-0001')
+    assert store.create('student', student)[0]
+    assert store.update('student', '2025-0001', {'firstname': 'Renamed'})[0]
+    assert store.update('student', '2025-0001', {'id': '2025-0002'})[0]
+    assert store.delete('student', '2025-0002')[0]
+    assert events == [
+        ChangeEvent('student', 'insert', ('2025-0001',)),
+        ChangeEvent('student', 'update', ('2025-0001',)),
+        ChangeEvent('student', 'update', ('2025-0001', '2025-0002')),
+        ChangeEvent('student', 'delete', ('2025-0002',)),
+    ]
+    assert_persisted(store)
+
+
+def test_rejected_changes_publish_nothing(store, events):
+    version = store.version
+    taken = store.students[0]['id']
+    assert not store.create('student', dict(make_students(1)[0], id=taken))[0]
+    assert not store.update('student', 'missing', {'firstname': 'X'})[0]
+    assert not store.update('student', store.students[1]['id'], {'id': taken})[0]
+    assert not store.delete('program', 'missing')[0]
+    assert store.delete_program('missing') is None
+    assert events == [] and store.version == version
+
+
+def test_delete_program_lists_every_touched_record(store, events):
+    enrolled = {s['id'] for s in store.students if s['program'] == 'BSCS'}
+
+    assert store.delete_program('BSCS') == len(enrolled)
+
+    assert events[0].table == 'student' and set(events[0].keys) == enrolled
+    assert events[1] == ChangeEvent('program', 'delete', ('BSCS',))
+    assert all(store.student(i)['program'] == '' for i in enrolled)
+    assert store.program('BSCS') is None
+    assert_persisted(store)
+
+
+def test_delete_college_lists_every_touched_record(store, events):
+    programs = {p['code'] for p in store.programs if p['college'] == 'COE'}
+    enrolled = {s['id'] for s in store.students if s['program'] in programs}
+
+    assert store.delete_college('COE') == (len(programs), len(enrolled))
+
+    assert [(e.table, e.op) for e in events] == [('student', 'update'), ('program', 'update'), ('college', 'delete')]
+    assert set(events[0].keys) == enrolled and set(events[1].keys) == programs
+    assert all(store.program(code)['college'] == '' for code in programs)
+    assert_persisted(store)
+
+
+def test_append_and_attach_publish_inserts(store, events):
+    rows = store.append('college', [{'code': 'CBA', 'name': 'Business', 'extra': 'dropped'}])
+    assert rows == [{'code': 'CBA', 'name': 'Business'}]
+    assert events == [ChangeEvent('college', 'insert', ('CBA',))]
+    assert store.college('CBA') is rows[0]
+    assert_persisted(store)
+
+
+def test_subscribers_can_filter_tables_and_fail_safely(store, capsys):
+    programs_only = []
+
+    def broken(event):
+        raise RuntimeError("subscriber bug")
+
+    store.subscribe(broken)
+    store.subscribe(programs_only.append, tables=['program'])
+    assert store.update('college', 'CCS', {'name': 'Computing'})[0]
+    assert store.update('program', 'BSIT', {'name': 'Info Tech'})[0]
+
+    assert programs_only == [ChangeEvent('program', 'update', ('BSIT',))]
+    assert 'subscriber bug' in capsys.readouterr().err
+    assert store.college('CCS')['name'] == 'Computing'
+
+
+def test_resubscribing_replaces_the_filter():
+    bus = EventBus()
+    received = []
+    bus.subscribe(received.append, tables=['student'])
+    bus.subscribe(received.append)
+    bus.publish(ChangeEvent('college', 'delete', ('X',)))
+    bus.unsubscribe(received.append)
+    bus.publish(ChangeEvent('college', 'delete', ('Y',)))
+    assert received == [ChangeEvent('college', 'delete', ('X',))]
+
+
+def test_students_are_kept_as_compact_records(store):
+    assert store.students and all(type(s) is StudentRecord for s in store.students)
+    store.create('student', dict(make_students(1)[0], id='2025-0001'))
+    assert type(store.student('2025-0001')) is StudentRecord
@@ -0,0 +1,68 @@
+"""
+FastDictReader against csv.DictReader.
+"""
+
+import csv
+import io
+import random
+
+import pytest
+
+from backend import storage
+from backend.storage import FastDictReader
+
+
+CASES = [
+    '',
+    '\n',
+    '\n\na,b\n1,2\n',
+    'code,name\n',
+    'code,name\nA,B',
+    'code,name\r\nA,Alpha\r\nB\r\n\r\nC,Cee,extra,more\r\n"D,x","multi\r\nline ""q"""\r\n E , \r\nF,G\n',
+    'a,b\rc,d\r1,2\r',
+    'a\n1\n\n2\n',
+    'a,b\nx"y,z\n1,2\n',
+    'a,a\n1,2\n',
+    'a,b\n1,2\n3,"4\n5"\n6,7\n8,9\n',
+    'a,b\n' + '1,2\n' * 50 + '3,"x\ny"\n' + '5,6\r\n' * 50,
+]
+
+
+def assert_same_as_dictreader(text):
+    expected = csv.DictReader(io.StringIO(text, newline=''))
+    rows = list(expected)
+    reader = FastDictReader(io.StringIO(text, newline=''))
+    result = reader.read_all()
+    assert result == rows
+    # same key order too, including the None key of long rows
+    assert [list(r) for r in result] == [list(r) for r in rows]
+    assert reader.fieldnames == expected.fieldnames
+    assert reader.chars_read == len(text)
+
+
+@pytest.mark.parametrize('block', [1 << 20, 1, 3, 7, 64])
+@pytest.mark.parametrize('text', CASES)
+def test_matches_dictreader(text, block, monkeypatch):
+    monkeypatch.setattr(storage, '_PARSE_BLOCK', block)
+    assert_same_as_dictreader(text)
+
+
+@pytest.mark.parametrize('block', [1 << 20, 2, 5])
+def test_matches_dictreader_on_random_input(block, monkeypatch):
+    monkeypatch.setattr(storage, '_PARSE_BLOCK', block)
+    rng = random.Random(1)
+    pieces = ['a', 'b', ',', '\n', '\r\n', '"', '""', ' ', '\r', 'x,y']
+    for _ in range(1000):
+        text = ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 20)))
+        try:
+            list(csv.DictReader(io.StringIO(text, newline='')))
+        except csv.Error:
+            continue  # DictReader rejects it too
+        assert_same_as_dictreader(text)
+
+
+def test_iterates_lazily_in_order():
+    text = 'id,name\n' + ''.join(f'{i},n{i}\n' for i in range(100))
+    reader = FastDictReader(io.StringIO(text, newline=''))
+    assert next(iter(reader)) == {'id': '0', 'name': 'n0'}
+    assert [r['id'] for r in reader] == [str(i) for i in range(1, 100)]
@@ -0,0 +1,73 @@
+"""
+Background csv imports.
+"""
+
+import csv
+
+from backend import ImportJob, DataStore
+from conftest import make_students, read_table
+
+
+def _run(job):
+    job.start()._thread.join()
+    messages = []
+    while not job.messages.empty():
+        messages.append(job.messages.get())
+    return messages
+
+
+def _write_source(path, rows, fields):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+    return str(path)
+
+
+def test_every_chunk_is_imported(tables):
+    store = DataStore()
+    store.load()
+    rows = [dict(r, id=f"2026-{i:04d}", program=r['program'] or 'BSCS') for i, r in enumerate(make_students(250))]
+    source = _write_source(tables / 'in.csv', rows, list(rows[0]))
+
+    job = ImportJob('student', source, {s['id'] for s in store.students}, chunk_size=7)
+    messages = _run(job)
+
+    assert messages[-1] == ('done', None)
+    assert [kind for kind, _ in messages[:-1]] == ['progress'] * 36
+    assert job.rows == rows and job.error_count == 0
+    store.attach('student', job.rows)
+    assert read_table('student')[-250:] == rows
+    assert [dict(s) for s in store.students[-250:]] == rows
+
+
+def test_invalid_and_duplicate_rows_are_reported(tables):
+    store = DataStore()
+    store.load()
+    rows = [
+        {'code': 'BSN', 'name': 'Nursing', 'college': 'CSM'},
+        {'code': 'BSCS', 'name': 'Taken', 'college': 'CCS'},
+        {'code': 'BAD', 'name': 'Name 2', 'college': 'CCS'},
+        {'code': 'BSN', 'name': 'Nursing Again', 'college': 'CSM'},
+    ]
+    source = _write_source(tables / 'in.csv', rows, ['code', 'name', 'college'])
+
+    job = ImportJob('program', source, {p['code'] for p in store.programs}, chunk_size=2)
+    assert _run(job)[-1] == ('done', None)
+
+    assert job.rows == rows[:1]
+    assert job.errors == [
+        "Row 3: Program code BSCS already exists",
+        "Row 4: Program name cannot contain numbers",
+        "Row 5: Program code BSN already exists",
+    ]
+    assert read_table('program')[-1] == rows[0]
+
+
+def test_cancelled_import_writes_nothing(tables):
+    before = read_table('college')
+    source = _write_source(tables / 'in.csv', [{'code': 'NEW', 'name': 'New'}], ['code', 'name'])
+    job = ImportJob('college', source, set())
+    job.cancel()
+    assert _run(job)[-1] == ('cancelled', None)
+    assert read_table('college') == before
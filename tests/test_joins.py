@@ -0,0 +1,46 @@
+"""
+Cached program lookups against scans of the programs list.
+"""
+
+from backend import DataStore
+from backend.joins import ProgramLookup, invalidate_program_lookup, program_lookup
+from conftest import PROGRAMS, random_changes
+
+
+def _scan(programs, code):
+    return next((p for p in programs if p.get('code', '') == code), None)
+
+
+def test_lookup_matches_a_scan():
+    programs = PROGRAMS + [dict(PROGRAMS[0], name='Duplicate'), {'name': 'No code'}]
+    lookup = ProgramLookup(programs)
+    for code in [p.get('code', '') for p in programs] + ['GHOST']:
+        assert lookup.get(code) is _scan(programs, code)
+    assert lookup.get('BSCS')['name'] != 'Duplicate'
+    assert lookup.college_of('GHOST') == 'N/A'
+    assert lookup.name_of('GHOST', default='') == ''
+    assert lookup.college_of('BSCS') == _scan(programs, 'BSCS')['college']
+
+
+def test_shared_lookup_is_reused_until_invalidated():
+    programs = [dict(p) for p in PROGRAMS]
+    lookup = program_lookup(programs)
+    assert program_lookup(programs) is lookup
+    programs[0]['college'] = 'CSM'  # in-place edits show through
+    assert lookup.college_of(programs[0]['code']) == 'CSM'
+    programs.append({'code': 'NEW', 'name': 'New', 'college': 'CCS'})
+    invalidate_program_lookup()
+    assert program_lookup(programs).get('NEW') is programs[-1]
+    assert program_lookup(list(programs)) is not program_lookup(programs)
+
+
+def test_store_changes_keep_the_lookup_current(tables):
+    store = DataStore()
+    store.load()
+    for step in random_changes(store, 150, seed=4):
+        if step % 10 == 0 and store.programs:
+            store.update('program', store.programs[0]['code'], {'code': f"R{step}"})
+        lookup = program_lookup(store.programs)
+        assert lookup.by_code.keys() == {p['code'] for p in store.programs}, step
+        for program in store.programs:
+            assert lookup.get(program['code']) is program
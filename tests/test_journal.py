@@ -0,0 +1,119 @@
+"""
+Change journal: replay on load and compaction into the base csv.
+"""
+
+import os
+
+from backend import storage
+from conftest import PROGRAMS, make_students, read_table, write_table
+
+
+def _by_id(rows):
+    return {r['id']: r for r in rows}
+
+
+def test_replay_applies_insert_update_delete(tables):
+    base = read_table('student')
+    new = dict(make_students(1)[0], id='2025-0001', firstname='New')
+    changed = dict(base[3], firstname='Changed')
+    storage.log_change('student', 'insert', new)
+    storage.log_change('student', 'update', changed)
+    storage.log_change('student', 'delete', base[5])
+
+    expected = [r for r in base if r['id'] != base[5]['id']]
+    expected[3] = changed
+    expected.append(new)
+    assert read_table('student') == expected
+
+
+def test_replay_follows_renamed_key(tables):
+    base = read_table('student')
+    renamed = dict(base[0], id='2029-0001')
+    storage.log_change('student', 'update', renamed, old_key=base[0]['id'])
+    storage.log_change('student', 'update', dict(renamed, lastname='Again'))
+
+    rows = read_table('student')
+    assert rows[0] == dict(renamed, lastname='Again')
+    assert base[0]['id'] not in _by_id(rows)
+    assert len(rows) == len(base)
+
+
+def test_replay_skips_torn_last_line(tables):
+    base = read_table('student')
+    storage.log_change('student', 'update', dict(base[1], firstname='Kept'))
+    with open(storage.journal_path('student'), 'a', newline='') as f:
+        f.write('update,2024-0002,Torn')  # an append cut short by a crash
+
+    rows = read_table('student')
+    assert rows[1]['firstname'] == 'Kept'
+    assert rows[2] == base[2]
+
+
+def test_compaction_folds_journal_into_base(tables):
+    storage.log_change('program', 'insert', {'code': 'BSN', 'name': 'Nursing', 'college': 'CSM'})
+    storage.log_change('program', 'delete', PROGRAMS[0])
+    expected = read_table('program')
+
+    storage.compact_journal('program')
+
+    assert not os.path.exists(storage.journal_path('program'))
+    assert read_table('program') == expected
+    assert expected == PROGRAMS[1:] + [{'code': 'BSN', 'name': 'Nursing', 'college': 'CSM'}]
+
+
+def test_full_save_supersedes_journal(tables):
+    storage.log_change('college', 'delete', {'code': 'CCS'})
+    rows = [{'code': 'CCS', 'name': 'Computer Studies'}]
+    storage.save_csv('college', rows)
+
+    assert not os.path.exists(storage.journal_path('college'))
+    assert read_table('college') == rows
+
+
+def test_threshold_triggers_background_compaction(tables, monkeypatch):
+    monkeypatch.setattr(storage, 'JOURNAL_COMPACT_THRESHOLD', 3)
+    threads = []
+    real = storage.compact_journals_async
+    monkeypatch.setattr(storage, 'compact_journals_async', lambda keys=None: threads.append(real(keys)) or threads[-1])
+    base = read_table('student')
+    for i in range(3):
+        storage.log_change('student', 'update', dict(base[i], firstname=f'Name{"abc"[i]}'))
+    for t in threads:
+        t.join()
+
+    assert threads
+    assert not os.path.exists(storage.journal_path('student'))
+    assert [r['firstname'] for r in read_table('student')[:3]] == ['Namea', 'Nameb', 'Namec']
+
+
+def test_append_adds_rows_without_rewriting(tables):
+    write_table('college', [])
+    storage.append_csv('college', [{'code': 'A', 'name': 'Alpha'}])
+    storage.append_csv('college', [{'code': 'B', 'name': 'Beta', 'extra': 'ignored'}])
+    assert read_table('college') == [{'code': 'A', 'name': 'Alpha'}, {'code': 'B', 'name': 'Beta'}]
+
+
+def test_append_behind_a_journal_keeps_the_order_of_events(tables):
+    student = dict(make_students(1)[0], id='2029-0001', firstname='Imported')
+    storage.log_change('student', 'insert', student)
+    storage.log_change('student', 'delete', student)
+    storage.append_csv('student', [student])
+
+    assert not os.path.exists(storage.journal_path('student'))
+    assert _by_id(read_table('student'))['2029-0001'] == student
+
+
+def test_store_delete_then_import_survives_a_reload(tables):
+    from backend import DataStore
+
+    store = DataStore()
+    store.load()
+    student = dict(make_students(1)[0], id='2029-0002', firstname='Imported')
+    assert store.create('student', student)[0]
+    assert store.delete('student', '2029-0002')[0]
+    store.append('student', [dict(student, firstname='Again')])
+
+    reloaded = DataStore()
+    reloaded.load()
+    assert reloaded.student('2029-0002')['firstname'] == 'Again'
+    assert [dict(s) for s in reloaded.students] == [dict(s) for s in store.students]
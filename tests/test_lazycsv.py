@@ -0,0 +1,158 @@
+"""
+Lazily decoded csv tables against csv.DictReader and plain lists.
+"""
+
+import csv
+import io
+import random
+
+import pytest
+
+from backend import DataStore, LazyRows, storage
+from backend.lazycsv import release_files
+from backend.records import StudentRecord
+from conftest import make_students, random_changes, write_table
+
+
+CASES = [
+    '',
+    'id,name\n',
+    'id,name\nA,B',
+    'id,name\r\nA,Alpha\r\nB\r\n\r\nC,Cee,extra,more\r\n"D,x","multi\r\nline ""q"""\r\n E , \r\nF,G\n',
+    'name,id\n1,2\n\n3,"4\n5"\n6,7\n',
+    'other\n1\n2\n',
+]
+
+
+def _write(tmp_path, text):
+    path = tmp_path / 'table.csv'
+    path.write_bytes(text.encode('utf-8'))
+    return str(path)
+
+
+def _dictreader(text):
+    return list(csv.DictReader(io.StringIO(text, newline='')))
+
+
+@pytest.mark.parametrize('block', [1 << 20, 1, 5])
+@pytest.mark.parametrize('text', CASES)
+def test_matches_dictreader(tmp_path, monkeypatch, text, block):
+    monkeypatch.setattr('backend.lazycsv._INDEX_BLOCK', block)
+    expected = _dictreader(text)
+    rows = LazyRows(_write(tmp_path, text), 'id', 'utf-8')
+    assert rows.keys() == [r.get('id', '') for r in expected]
+    fields = ('id', 'name', 'missing')
+    assert list(rows.scan(fields)) == [tuple(r.get(f) for f in fields) for r in expected]
+    assert rows.decoded == 0
+    assert rows[:] == expected
+    assert [list(r) for r in rows] == [list(r) for r in expected]
+
+
+def test_rows_are_decoded_only_when_read(tmp_path):
+    students = make_students(300)
+    text = 'id,firstname,lastname,program,year,gender\n' + ''.join(
+        ','.join(s.values()) + '\n' for s in students)
+    rows = LazyRows(_write(tmp_path, text), 'id', 'utf-8')
+    rows.row_type = StudentRecord
+    assert len(rows) == 300 and rows.decoded == 0
+    assert rows.keys() == [s['id'] for s in students]
+    assert rows[150] == students[150] and rows[-1] == students[-1]
+    assert rows[10:13] == students[10:13]
+    assert rows.decoded == 5
+    # decoded rows are kept, so edits to them stick
+    assert isinstance(rows[150], StudentRecord) and rows[150] is rows[150]
+    rows[150]['id'] = '2029-0001'
+    assert rows.key_at(150) == '2029-0001'
+    assert rows.index(rows[150]) == 150
+
+
+def test_edits_behave_like_a_list(tmp_path):
+    students = make_students(200)
+    text = 'id,firstname,lastname,program,year,gender\n' + ''.join(
+        ','.join(s.values()) + '\n' for s in students)
+    rows = LazyRows(_write(tmp_path, text), 'id', 'utf-8')
+    model = [dict(s) for s in students]
+    rng = random.Random(3)
+    for step in range(300):
+        if not model:
+            break
+        action = rng.random()
+        i = rng.randrange(len(model))
+        if action < 0.3:
+            del rows[i], model[i]
+        elif action < 0.4:
+            j = rng.randrange(len(model))
+            del rows[min(i, j):max(i, j)], model[min(i, j):max(i, j)]
+        elif action < 0.6:
+            rows.append({'id': f"new-{step}"})
+            model.append({'id': f"new-{step}"})
+        elif action < 0.7:
+            rows.insert(i, {'id': f"ins-{step}"})
+            model.insert(i, {'id': f"ins-{step}"})
+        elif action < 0.8:
+            rows[i] = model[i] = {'id': f"set-{step}"}
+        else:
+            assert rows[i] == model[i]
+        assert len(rows) == len(model)
+        assert rows.keys() == [r['id'] for r in model]
+    assert rows == model
+    assert rows.decoded == len(rows)
+
+
+def test_release_decodes_and_unmaps(tmp_path):
+    path = _write(tmp_path, 'id,name\nA,1\nB,2\n')
+    rows = LazyRows(path, 'id', 'utf-8')
+    release_files([path])
+    assert rows.decoded == 2 and rows._file is None
+    assert rows == [{'id': 'A', 'name': '1'}, {'id': 'B', 'name': '2'}]
+
+
+@pytest.fixture
+def lazy_tables(tables, monkeypatch):
+    monkeypatch.setattr(storage, 'LAZY_LOAD_MIN_BYTES', 0)
+    return tables
+
+
+def test_store_maps_large_student_tables(lazy_tables):
+    store = DataStore()
+    store.load()
+    students = store.students
+    assert isinstance(students, LazyRows) and students.row_type is StudentRecord
+    assert store.stats().students_in_program('BSCS') == 20
+    assert store.student('2024-0007') == make_students(8)[7]
+    assert store.student('GHOST') is None
+    assert students.decoded == 1
+
+    store.update('student', '2024-0007', {'id': '2029-0007'})
+    assert store.student('2029-0007')['firstname'] == make_students(8)[7]['firstname']
+    assert store.delete('student', '2024-0003')[0]
+    assert store.create('student', dict(make_students(1)[0], id='2029-0100'))[0]
+    assert students.decoded == 2
+    assert [s['id'] for s in store.students[:4]] == ['2024-0000', '2024-0001', '2024-0002', '2024-0004']
+
+
+def test_lazy_store_changes_reach_storage(lazy_tables):
+    store = DataStore()
+    store.load()
+    for _ in random_changes(store, 150, seed=11):
+        pass
+    eager = [dict(s) for s in store.students]
+    reloaded = DataStore()
+    reloaded.load()
+    # a journal is pending now, so the reload reads the table in full
+    assert not isinstance(reloaded.students, LazyRows)
+    assert [dict(s) for s in reloaded.students] == eager
+    storage.compact_journals()
+    lazy = DataStore()
+    lazy.load()
+    assert isinstance(lazy.students, LazyRows)
+    assert [dict(s) for s in lazy.students] == eager
+
+
+def test_small_tables_load_in_full(tables):
+    store = DataStore()
+    store.load()
+    assert isinstance(store.students, list)
+    write_table('student', make_students(3))
+    assert not isinstance(storage.load_csv('student', lazy=True), LazyRows)
+    assert storage.load_csv('student', lazy=True) == make_students(3)
@@ -0,0 +1,95 @@
+"""
+read_csv_parallel against csv.DictReader.
+"""
+
+import csv
+
+import pytest
+
+from backend import storage, workers
+
+
+@pytest.fixture(scope='module', autouse=True)
+def _shutdown_pool():
+    yield
+    workers.shutdown_pool()
+
+
+@pytest.fixture
+def forced(monkeypatch):
+    """Take the process-pool path for files of any size."""
+    monkeypatch.setattr(storage, 'PARALLEL_LOAD_MIN_BYTES', 0)
+
+
+def _write(path, text):
+    with open(path, 'w', newline='') as f:
+        f.write(text)
+    return str(path)
+
+
+def _dictreader(path):
+    with open(path, 'r', newline='') as f:
+        return list(csv.DictReader(f))
+
+
+ROWS = ''.join(f'2024-{i:04d},Name{i},Last,BSCS,{i % 4 + 1},Male\n' for i in range(2000))
+HEADER = 'id,firstname,lastname,program,year,gender\n'
+
+CASES = {
+    'plain': HEADER + ROWS,
+    'crlf': (HEADER + ROWS).replace('\n', '\r\n'),
+    'ragged': HEADER + ROWS + '\n\nshort,row\nlong,' + ','.join('x' * 8) + '\nlast,row,no,newline',
+    'quoted': HEADER + ROWS + '2025-0001,"Multi\nLine",Last,BSCS,1,Male\n' + ROWS,
+    'quoted header': '"id",name\n1,2\n3,4\n',
+    'header only': HEADER,
+    'empty': '',
+}
+
+
+@pytest.mark.parametrize('workers_', [2, 3, 7])
+@pytest.mark.parametrize('name', sorted(CASES))
+def test_matches_dictreader(tmp_path, forced, name, workers_):
+    path = _write(tmp_path / 'table.csv', CASES[name])
+    rows = storage.read_csv_parallel(path, workers=workers_)
+    expected = _dictreader(path)
+    assert rows == expected
+    assert [list(r) for r in rows] == [list(r) for r in expected]
+
+
+def test_quoted_range_falls_back_to_one_parse(tmp_path, forced, monkeypatch):
+    path = _write(tmp_path / 'table.csv', CASES['quoted'])
+    calls = []
+    real = storage._read_ranges
+    monkeypatch.setattr(storage, '_read_ranges', lambda *a: calls.append(real(*a)) or calls[-1])
+    assert storage.read_csv_parallel(path, workers=4) == _dictreader(path)
+    assert calls == [None]
+
+
+def test_small_files_stay_in_process(tmp_path, monkeypatch):
+    path = _write(tmp_path / 'table.csv', CASES['plain'])
+    monkeypatch.setattr(storage, '_read_ranges', lambda *a: pytest.fail("used the pool"))
+    assert storage.read_csv_parallel(path, workers=4) == _dictreader(path)
+
+
+def test_ranges_cover_the_file_on_line_boundaries(tmp_path):
+    path = _write(tmp_path / 'table.csv', CASES['plain'])
+    with open(path, 'rb') as f:
+        data = f.read()
+        start = data.index(b'\n') + 1
+        ranges = storage._line_ranges(f, start, len(data), 5)
+    assert ranges[0][0] == start and ranges[-1][1] == len(data)
+    assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+    assert all(data[end - 1:end] == b'\n' for _, end in ranges)
+
+
+def test_plain_file_is_parsed_by_the_pool(tmp_path, forced, monkeypatch):
+    path = _write(tmp_path / 'table.csv', CASES['plain'])
+    monkeypatch.setattr(storage, 'FastDictReader', lambda f: pytest.fail("fell back to one parse"))
+    assert storage.read_csv_parallel(path, workers=3) == _dictreader(path)
+
+
+def test_the_pool_is_shared_and_restartable():
+    pool = workers.get_pool()
+    assert workers.get_pool() is pool
+    workers.shutdown_pool()
+    assert workers.get_pool() is not pool
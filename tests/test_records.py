@@ -0,0 +1,92 @@
+"""
+StudentRecord as a stand-in for the csv row dict.
+"""
+
+import csv
+import io
+import pickle
+
+import pytest
+
+import config
+from backend import StudentRecord, compact_students
+from conftest import make_students
+
+
+ROW = make_students(1)[0]
+
+
+def test_reads_like_the_row_dict():
+    record = StudentRecord(ROW)
+    assert dict(record) == ROW
+    assert list(record) == config.FIELDS['student']
+    assert len(record) == len(ROW)
+    assert record['id'] == ROW['id'] and record.get('year') == ROW['year']
+    assert record.get('college') is None and record.get('college', '') == ''
+    assert 'program' in record and 'college' not in record
+    with pytest.raises(KeyError):
+        record['college']
+
+
+def test_missing_fields_default_to_empty_and_extras_are_dropped():
+    record = StudentRecord({'id': '2024-0001', 'extra': 'x'})
+    assert dict(record) == dict.fromkeys(config.FIELDS['student'], '') | {'id': '2024-0001'}
+    assert StudentRecord(id='2024-0002', year='2')['year'] == '2'
+
+
+def test_updates_in_place_but_only_student_fields():
+    record = StudentRecord(ROW)
+    record.update({'firstname': 'New'}, year='4')
+    record['lastname'] = 'Other'
+    assert dict(record) == dict(ROW, firstname='New', lastname='Other', year='4')
+    with pytest.raises(KeyError):
+        record['college'] = 'CCS'
+    with pytest.raises(TypeError):
+        del record['id']
+
+
+def test_categories_are_stored_as_shared_codes():
+    a = StudentRecord(dict(ROW, program=''.join(['BS', 'CS'])))
+    b = StudentRecord(dict(ROW, program=''.join(['BS', 'CS'])))
+    assert a._program == b._program and type(a._program) is int
+    assert a['program'] is b['program']
+    b['program'] = 'BSIT'
+    assert b['program'] == 'BSIT' and a['program'] == 'BSCS'
+
+
+def test_unusual_values_round_trip():
+    row = dict(ROW, firstname='Has\x1fseparator', lastname=None, year=None)
+    record = StudentRecord(row)
+    assert dict(record) == row
+    record['firstname'] = 'Plain'
+    record['lastname'] = 'Again'
+    assert dict(record) == dict(row, firstname='Plain', lastname='Again')
+
+
+def test_compares_by_value_like_the_row_dict():
+    a, b = StudentRecord(ROW), StudentRecord(ROW)
+    assert a == b and a == ROW and ROW == a and a == dict(a)
+    assert a != StudentRecord(dict(ROW, year='4')) and a != dict(ROW, year='4')
+    assert [b, a].index(a) == 0
+    with pytest.raises(TypeError):
+        hash(a)
+
+
+def test_copy_pickle_and_csv_round_trip():
+    record = StudentRecord(ROW)
+    copy = record.copy()
+    assert copy == ROW and type(copy) is dict
+    assert dict(pickle.loads(pickle.dumps(record))) == ROW
+
+    buf = io.StringIO(newline='')
+    writer = csv.DictWriter(buf, fieldnames=config.FIELDS['student'])
+    writer.writeheader()
+    writer.writerow(record)
+    assert next(csv.DictReader(io.StringIO(buf.getvalue(), newline=''))) == ROW
+
+
+def test_compact_students_keeps_existing_records():
+    record = StudentRecord(ROW)
+    rows = compact_students([record, dict(ROW, id='2024-0999')])
+    assert rows[0] is record
+    assert type(rows[1]) is StudentRecord and rows[1]['id'] == '2024-0999'
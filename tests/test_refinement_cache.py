@@ -0,0 +1,58 @@
+"""
+Search-as-you-type refinement cache.
+"""
+
+from backend.search import RefinementCache
+
+
+WORDS = ['maria', 'mario', 'marco', 'anna', 'mar', 'amari', 'Maribel']
+
+
+def _search(cache, items, query, calls):
+    def full(q):
+        calls.append(q)
+        return [w for w in items if q in w.lower()]
+
+    return cache.search((items,), query, lambda w, q: q in w.lower(), full)
+
+
+def test_refined_results_match_full_searches():
+    cache = RefinementCache()
+    calls = []
+    for query in ['m', 'ma', 'mar', 'mari', 'maria', 'mari', 'ar', 'ari']:
+        assert _search(cache, WORDS, query, calls) == [w for w in WORDS if query in w.lower()], query
+    # only queries with no cached prefix were computed from scratch
+    assert calls == ['m', 'ar']
+
+
+def test_changed_sources_and_invalidate_start_over():
+    cache = RefinementCache()
+    calls = []
+    items = list(WORDS)
+    _search(cache, items, 'ma', calls)
+    items.append('mango')
+    assert _search(cache, items, 'man', calls) == ['mango']
+    cache.invalidate()
+    assert _search(cache, items, 'man', calls) == ['mango']
+    assert calls == ['ma', 'man', 'man']
+
+
+def test_result_computed_across_an_invalidate_is_not_kept():
+    cache = RefinementCache()
+
+    def full(q):
+        cache.invalidate()  # e.g. a store change while the search ran
+        return ['stale']
+
+    assert cache.search((WORDS,), 'x', None, full) == ['stale']
+    calls = []
+    assert _search(cache, WORDS, 'x', calls) == []
+    assert calls == ['x']
+
+
+def test_least_recent_queries_are_dropped():
+    cache = RefinementCache(size=2)
+    calls = []
+    for query in ['a', 'b', 'c', 'a']:
+        _search(cache, WORDS, query, calls)
+    assert calls == ['a', 'b', 'c', 'a']
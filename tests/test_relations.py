@@ -0,0 +1,46 @@
+"""
+Maintained foreign-key indexes against a fresh rebuild.
+"""
+
+import pytest
+
+from backend import DataStore
+from backend.relations import Relations
+from conftest import random_changes
+
+
+def snapshot(rel, students, programs):
+    """Every query answer of `rel`, with record identities."""
+    program_codes = {p['code'] for p in programs} | {s['program'] for s in students}
+    college_codes = {p['college'] for p in programs}
+    return {
+        'students': {code: (rel.student_ids_in_program(code), {id(s) for s in rel.students_in_program(code)})
+                     for code in program_codes},
+        'programs': {code: (rel.program_codes_in_college(code), {id(p) for p in rel.programs_in_college(code)},
+                            {id(s) for s in rel.students_in_college(code)})
+                     for code in college_codes},
+    }
+
+
+@pytest.mark.parametrize('seed', [3, 4])
+def test_indexes_match_a_fresh_rebuild(tables, seed):
+    store = DataStore()
+    store.load()
+    rel = store.relations()
+    for step in random_changes(store, 150, seed):
+        if step % 25 == 0:
+            fresh = Relations(store.students, store.programs)
+            assert snapshot(rel, store.students, store.programs) == snapshot(fresh, store.students, store.programs), step
+    assert store.relations() is rel
+
+
+def test_queries_match_a_scan(tables):
+    store = DataStore()
+    store.load()
+    rel = store.relations()
+    assert rel.student_ids_in_program('BSIT') == {s['id'] for s in store.students if s['program'] == 'BSIT'}
+    assert rel.program_codes_in_college('CCS') == {'BSCS', 'BSIT'}
+    assert {s['id'] for s in rel.students_in_programs(['BSCE', 'BSME'])} == \
+        {s['id'] for s in store.students if s['program'] in ('BSCE', 'BSME')}
+    assert rel.students_in_college('CSM') == [s for s in store.students if s['program'] == 'BSBio']
+    assert rel.student_ids_in_program('missing') == set()
@@ -0,0 +1,94 @@
+"""
+Trigram index and search bar results against a brute-force scan.
+"""
+
+import random
+
+from backend import DataStore
+from backend.joins import program_lookup
+from backend.search import TrigramIndex, StudentSearch
+from backend.search.index import STUDENT_SEARCH_FIELDS
+from conftest import make_students
+
+
+QUERIES = ['', 'a', 'LI', 'lim', 'ana', '2024-00', '-01', 'bscs', 'male', 'fem', '3', 'zzz', 'ar']
+
+
+def brute_force(records, fields, query):
+    query = query.lower()
+    return [r for r in records if any(query in str(r.get(f, '')).lower() for f in fields)]
+
+
+def brute_force_global(students, programs, query):
+    query = query.lower()
+    lookup = program_lookup(programs)
+    return [s for s in students
+            if any(query in str(s.get(f, '')).lower() for f in STUDENT_SEARCH_FIELDS)
+            or query in lookup.college_of(s.get('program', '')).lower()]
+
+
+def assert_matches(index, records):
+    for query in QUERIES:
+        assert index.search(query) == brute_force(records, STUDENT_SEARCH_FIELDS, query), query
+
+
+def test_search_matches_a_full_scan():
+    students = make_students(300)
+    index = TrigramIndex(students, STUDENT_SEARCH_FIELDS, group_fields=('program',))
+    assert_matches(index, students)
+
+
+def test_index_follows_adds_edits_and_removes():
+    rng = random.Random(7)
+    students = make_students(200)
+    index = TrigramIndex(students, STUDENT_SEARCH_FIELDS, group_fields=('program',))
+    for step in range(300):
+        action = rng.random()
+        if action < 0.3:
+            record = dict(make_students(1)[0], id=f"2030-{step:04d}", firstname=rng.choice(['Lia', 'Arlo', 'Zed']))
+            students.append(record)
+            index.add(record)
+        elif action < 0.6 and students:
+            record = students.pop(rng.randrange(len(students)))
+            index.remove(record)
+        elif students:
+            record = rng.choice(students)
+            record['lastname'] = rng.choice(['Lim', 'Ocampo', 'Dela Cruz'])
+            record['program'] = rng.choice(['BSCS', 'BSBio', ''])
+            index.update(record)
+        if step % 50 == 0:
+            assert_matches(index, students)
+    assert_matches(index, students)
+    assert len(index) == len(students)
+
+
+def test_joined_groups_add_their_records():
+    students = make_students(60)
+    index = TrigramIndex(students, STUDENT_SEARCH_FIELDS, group_fields=('program',))
+    result = index.search('no such text', joined={'program': ['BSIT']})
+    assert result == [s for s in students if s['program'] == 'BSIT']
+
+
+def test_global_search_and_refinement_match_a_full_scan(tables):
+    store = DataStore()
+    store.load()
+    # each query extends the previous one, so results are refined from the cache
+    for query in ['c', 'co', 'col', 'coll', 'colleg', 'ccs', 'b', 'bs', 'bsc', 'bscs']:
+        assert StudentSearch.global_search(store.students, store.programs, query) == \
+            brute_force_global(store.students, store.programs, query), query
+
+
+def test_global_search_sees_store_changes(tables):
+    store = DataStore()
+    store.load()
+    StudentSearch.global_search(store.students, store.programs, 'santos')
+
+    store.update('student', store.students[0]['id'], {'lastname': 'Santos'})
+    store.delete('student', store.students[1]['id'])
+    store.create('student', dict(make_students(1)[0], id='2031-0001', lastname='Santosa'))
+    store.delete_program('BSCS')
+    store.update('program', 'BSIT', {'college': 'CSM'})
+
+    for query in ['santos', 'ccs', 'csm', 'bscs', 'ana']:
+        assert StudentSearch.global_search(store.students, store.programs, query) == \
+            brute_force_global(store.students, store.programs, query), query
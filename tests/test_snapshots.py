@@ -0,0 +1,78 @@
+"""
+Binary snapshots of parsed tables.
+"""
+
+import csv
+import os
+
+import pytest
+
+import config
+from backend import storage
+from conftest import write_table
+
+
+def _dictreader(key):
+    with open(config.FILES[key], 'r', newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def _load(key):
+    return storage._load_csv_file(key)
+
+
+def test_first_load_writes_a_snapshot_the_next_load_uses(tables, monkeypatch):
+    rows = _load('student')
+    assert os.path.exists(storage.snapshot_path('student'))
+
+    monkeypatch.setattr(storage, 'read_csv_parallel', lambda path: pytest.fail("parsed the csv again"))
+    assert _load('student') == rows == _dictreader('student')
+
+
+def test_snapshot_of_a_saved_table_matches_the_csv(tables, monkeypatch):
+    rows = [{'code': 'A', 'name': 'Alpha'}, {'code': 'B', 'name': None}, {'code': 3, 'name': 'Three'}]
+    storage.save_csv('college', rows)
+
+    monkeypatch.setattr(storage, 'read_csv_parallel', lambda path: pytest.fail("parsed the csv again"))
+    assert _load('college') == _dictreader('college')
+
+
+def test_a_changed_csv_invalidates_the_snapshot(tables):
+    _load('program')
+    write_table('program', [{'code': 'NEW', 'name': 'New', 'college': 'CCS'}])
+    assert _load('program') == _dictreader('program')
+
+
+def test_same_size_and_time_but_other_content_is_detected(tables):
+    _load('college')
+    path = config.FILES['college']
+    st = os.stat(path)
+    with open(path, 'r+b') as f:
+        data = f.read()
+        f.seek(0)
+        f.write(data.replace(b'CCS', b'XYZ'))
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    assert _load('college') == _dictreader('college')
+    assert _load('college')[0]['code'] == 'XYZ'
+
+
+def test_irregular_rows_round_trip(tables):
+    with open(config.FILES['college'], 'w', newline='') as f:
+        f.write('code,name\nA\nB,Beta,extra\n\nC,"Quoted, name"\n')
+    expected = _dictreader('college')
+    assert _load('college') == expected
+    assert _load('college') == expected  # from the snapshot
+
+
+def test_a_corrupt_snapshot_is_ignored(tables):
+    _load('student')
+    with open(storage.snapshot_path('student'), 'wb') as f:
+        f.write(b'\x05\x00\x00\x00garbage')
+    assert _load('student') == _dictreader('student')
+
+
+def test_journal_is_replayed_on_top_of_the_snapshot(tables):
+    rows = _load('college')
+    storage.log_change('college', 'update', dict(rows[0], name='Journaled'))
+    assert _load('college')[0]['name'] == 'Journaled'
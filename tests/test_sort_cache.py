@@ -0,0 +1,65 @@
+"""
+Cached sort orders against plain stable sorts.
+"""
+
+import random
+
+from backend.sort import sort_key, sort_records, RowSortCache, TableSorter
+
+
+def _rows(n, seed=3):
+    rng = random.Random(seed)
+    return [(f"2024-{rng.randrange(40):04d}", rng.choice(['ana', 'Ben', 'carla', 'Ben']),
+             str(rng.randrange(1, 5)), rng.choice(['10', '9', '2.5', 'x', '']))
+            for _ in range(n)]
+
+
+def stable_sort(rows, spec):
+    result = list(rows)
+    for col, reverse in reversed(spec):
+        result.sort(key=lambda row: sort_key(row[col]), reverse=reverse)
+    return result
+
+
+def test_sort_key_orders_numbers_before_text():
+    values = ['b', '10', 'A', '2024-0002', '9', '2.5', '-1']
+    assert sorted(values, key=sort_key) == ['-1', '2.5', '9', '10', '2024-0002', 'A', 'b']
+
+
+def test_sort_records_is_a_stable_multi_column_sort():
+    records = [{'a': r[1], 'b': r[2]} for r in _rows(50)]
+    spec = [('a', False), ('b', True)]
+    expected = stable_sort([(r['a'], r['b']) for r in records], [(0, False), (1, True)])
+    assert [(r['a'], r['b']) for r in sort_records(records, spec)] == expected
+
+
+def test_cached_orders_match_stable_sorts():
+    rows = _rows(200)
+    cache = RowSortCache(rows, max_orders=4)
+    specs = [[(1, False)], [(1, True)], [(3, True), (0, False)], [(2, False), (1, True), (3, False)],
+             [(1, True)], [(0, True), (2, True)], [(3, True), (0, False)]]
+    for spec in specs:
+        assert cache.sorted_rows(spec) == stable_sort(rows, spec), spec
+
+
+def test_descending_keeps_ties_in_original_order():
+    rows = [('b', 1), ('a', 2), ('b', 3), ('a', 4)]
+    cache = RowSortCache(rows)
+    assert cache.sorted_rows([(0, True)]) == [('b', 1), ('b', 3), ('a', 2), ('a', 4)]
+
+
+def test_table_sorter_stacks_clicks_like_repeated_stable_sorts():
+    rows = expected = _rows(120)
+    sorter = TableSorter()
+    for col, reverse in [(1, False), (2, True), (1, True), (0, False)]:
+        # the view passes back the rows it got from the previous click
+        rows = sorter.sort(rows, col, reverse)
+        expected = sorted(expected, key=lambda row: sort_key(row[col]), reverse=reverse)
+        assert rows == expected
+
+
+def test_table_sorter_starts_over_on_new_rows():
+    sorter = TableSorter()
+    sorter.sort(_rows(30), 1)
+    rows = _rows(30, seed=4)
+    assert sorter.sort(rows, 2) == stable_sort(rows, [(2, False)])
@@ -0,0 +1,65 @@
+"""
+The SQLite storage engine behind the storage functions.
+"""
+
+import pytest
+
+from backend import DataStore, backups, storage
+from backend.sqlite_storage import SQLiteEngine
+from conftest import PROGRAMS, random_changes, read_table
+
+
+@pytest.fixture
+def engine(tables, monkeypatch):
+    csv_tables = {key: read_table(key) for key in ('college', 'program', 'student')}
+    engine = SQLiteEngine(str(tables / 'test.db'))
+    assert engine.migrate_from_csv()
+    monkeypatch.setattr(storage, '_engine', engine)
+    engine.csv_tables = csv_tables
+    yield engine
+    engine.close()
+
+
+def _rows(records):
+    return [dict(r) for r in records]
+
+
+def test_migration_copies_every_table_once(engine):
+    for key, rows in engine.csv_tables.items():
+        assert storage.load_csv(key) == rows
+    assert not engine.migrate_from_csv()
+
+
+@pytest.mark.parametrize('csv_engine', [False, True])
+def test_store_changes_reach_storage(tables, request, csv_engine):
+    if not csv_engine:
+        request.getfixturevalue('engine')
+    store = DataStore()
+    store.load()
+    for _ in random_changes(store, 120, seed=8):
+        pass
+    for key in store.TABLES:
+        assert _rows(store.table(key)) == _rows(storage.load_csv(key)), key
+    reloaded = DataStore()
+    reloaded.load()
+    for key in store.TABLES:
+        assert _rows(reloaded.table(key)) == _rows(store.table(key)), key
+
+
+def test_single_changes_and_renames(engine):
+    storage.log_change('program', 'update', dict(PROGRAMS[0], code='BSCS2'), old_key='BSCS')
+    storage.log_change('program', 'delete', PROGRAMS[1])
+    storage.log_change('program', 'insert', {'code': 'NEW', 'name': 'New', 'college': 'CSM'})
+    storage.append_csv('program', [{'code': 'NEW', 'name': 'Ignored', 'college': 'CCS'}])
+    assert storage.load_csv('program') == [dict(PROGRAMS[0], code='BSCS2')] + PROGRAMS[2:] + [
+        {'code': 'NEW', 'name': 'New', 'college': 'CSM'}]
+
+
+def test_backups_snapshot_the_engine_tables(engine):
+    before = {key: storage.load_csv(key) for key in ('college', 'program', 'student')}
+    pins = backups.pin_tables()
+    storage.save_tables({'college': [], 'program': []})
+    worker = backups.create_backups_async(pins=pins)
+    worker.join()
+    backups.restore_backup(worker.result)
+    assert {key: storage.load_csv(key) for key in before} == before
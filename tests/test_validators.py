@@ -0,0 +1,36 @@
+"""
+Batch validation against one-by-one validation.
+"""
+
+from backend.validators import validate_batch, validate_student
+from conftest import make_students
+
+
+def _records():
+    records = make_students(400)
+    records[3]['id'] = '1999-0001'
+    records[150]['firstname'] = 'R2D2'
+    records[399]['year'] = ''
+    return records
+
+
+def serial(records, start=2):
+    errors = []
+    for row_num, record in enumerate(records, start):
+        ok, msg = validate_student(record)
+        if not ok:
+            errors.append((row_num, msg))
+    return errors
+
+
+def test_small_batches_match_one_by_one_validation():
+    records = _records()
+    assert validate_batch('student', records) == serial(records)
+    assert validate_batch('student', records, start=10) == serial(records, 10)
+
+
+def test_batches_accept_any_iterable_and_keep_row_order():
+    records = _records()
+    errors = validate_batch('student', iter(records), start=5)
+    assert errors == serial(records, 5)
+    assert [row for row, _ in errors] == sorted(row for row, _ in errors)